@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Candidate deduplication cost on a large urlset, list membership vs
+src.fetcher.CandidateSet.
+
+  legacy : `if u not in out: out.append(u)` (list scan per URL), as the
+           sitemap / listing parsers and push_url used to do
+  current: CandidateSet.add (dict-backed, insertion-ordered)
+
+The dedupe is timed alone; parse_sitemap_urls (streaming parse + CandidateSet)
+is timed end to end for scale.
+
+The urlset repeats ~10% of its URLs, like sitemaps that list a story in
+several sections.
+
+Usage:
+  python benchmarks/bench_discovery_dedup.py [--urls N] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import fetcher as f  # noqa: E402
+
+
+def _locs(n: int) -> List[str]:
+    out: List[str] = []
+    for i in range(n):
+        j = i if i % 10 else i // 2  # ~10% duplicates
+        out.append(f"https://news.example.org/2026/{j % 12 + 1:02d}/story-{j}.html")
+    return out
+
+
+def _urlset(locs: List[str]) -> bytes:
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for u in locs:
+        parts.append(f"<url><loc>{u}</loc><lastmod>2026-01-01</lastmod></url>")
+    parts.append("</urlset>")
+    return "".join(parts).encode("utf-8")
+
+
+def legacy_dedupe(urls: List[str]) -> List[str]:
+    out: List[str] = []
+    for u in urls:
+        if u not in out:
+            out.append(u)
+    return out
+
+
+def current_dedupe(urls: List[str]) -> List[str]:
+    out: f.CandidateSet[str] = f.CandidateSet()
+    for u in urls:
+        out.add(u)
+    return out.values()
+
+
+def _wall(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--urls", type=int, default=50_000)
+    ap.add_argument("--repeat", type=int, default=1)
+    args = ap.parse_args()
+
+    raw = _locs(args.urls)
+    data = _urlset(raw)
+    base = "https://news.example.org/"
+
+    assert legacy_dedupe(raw[:5000]) == current_dedupe(raw[:5000])
+
+    print(f"urlset: {args.urls} <loc> entries, {len(data) / 1e6:.1f} MB")
+    ct = _wall(lambda: current_dedupe(raw), args.repeat)
+    print(f"dedupe  current (CandidateSet): {ct * 1000:10.1f} ms")
+    lt = _wall(lambda: legacy_dedupe(raw), args.repeat)
+    print(f"dedupe  legacy  (list scan)   : {lt * 1000:10.1f} ms   ({lt / ct:.0f}x slower)")
+
+    et = _wall(lambda: f.parse_sitemap_urls(data, base), args.repeat)
+    print(f"parse_sitemap_urls end to end         : {et * 1000:10.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
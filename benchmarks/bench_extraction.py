@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Per-article CPU time of the extraction core, before vs after the single-parse
+rewrite.
+
+  legacy : trafilatura.extract + trafilatura extract_metadata + BeautifulSoup
+           tree walked separately for <meta>, JSON-LD and __NEXT_DATA__
+  current: src.extractor.extract_from_html (one lxml tree, one scan)
+
+Usage:
+  python benchmarks/bench_extraction.py [--fixtures DIR] [--repeat N]
+
+DIR defaults to benchmarks/fixtures; any folder of saved .html pages works
+(e.g. pages saved from a browser or a run's snapshots).
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+import re
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import trafilatura  # noqa: E402
+from bs4 import BeautifulSoup  # noqa: E402
+
+from src import extractor as ex  # noqa: E402
+
+
+# -----------------------
+# Legacy path (pre single-parse), kept verbatim for comparison
+# -----------------------
+def _legacy_meta(soup) -> Dict[str, str]:
+    meta: Dict[str, str] = {}
+    for m in soup.find_all("meta"):
+        k = (m.get("property") or m.get("name") or "").strip()
+        v = (m.get("content") or "").strip()
+        if k and v and k not in meta:
+            meta[k] = v
+    return meta
+
+
+def _legacy_jsonld(soup) -> List[dict]:
+    import json
+    objs: List[dict] = []
+    for tag in soup.find_all("script", type=re.compile(r"ld\+json", re.I)):
+        txt = tag.get_text(strip=True) or ""
+        if not txt:
+            continue
+        try:
+            j = json.loads(txt)
+            if isinstance(j, dict):
+                objs.append(j)
+            elif isinstance(j, list):
+                objs.extend([x for x in j if isinstance(x, dict)])
+        except Exception:
+            continue
+    return objs
+
+
+def _legacy_next_data(soup) -> Optional[dict]:
+    import json
+    tag = soup.find("script", id="__NEXT_DATA__")
+    if not tag:
+        return None
+    try:
+        j = json.loads(tag.get_text(strip=True) or "")
+        return j if isinstance(j, dict) else None
+    except Exception:
+        return None
+
+
+def _legacy_dom_fallback(soup) -> str:
+    art = soup.find("article")
+    if art:
+        txt = ex._clean_text(art.get_text(" ", strip=True))
+        if len(txt) > 200:
+            return txt
+    for sel in ["div.article-body", "div.story-body", "div.story", "div#story", "div#article",
+                "div[itemprop='articleBody']", "section.article", "main"]:
+        node = soup.select_one(sel)
+        if node:
+            txt = ex._clean_text(node.get_text(" ", strip=True))
+            if len(txt) > 200:
+                return txt
+    paras = []
+    for p in soup.find_all("p"):
+        t = ex._clean_text(p.get_text(" ", strip=True))
+        if len(t) >= 40:
+            paras.append(t)
+    return ex._clean_text(" ".join(paras))
+
+
+def legacy_extract(html: str) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+    title = author = published_iso = text = None
+    try:
+        t = trafilatura.extract(html, include_comments=False, include_tables=False, no_fallback=False)
+        if t and t.strip():
+            text = t.strip()
+        try:
+            m = trafilatura.metadata.extract_metadata(html)
+            if m:
+                if m.title:
+                    title = ex._clean_title(str(m.title))
+                if m.author:
+                    author = ex._clean_author(str(m.author))
+                if m.date:
+                    published_iso = ex._normalize_any_date_to_iso(str(m.date))
+        except Exception:
+            pass
+    except Exception:
+        pass
+
+    soup = BeautifulSoup(html, "lxml")
+    if soup.title and soup.title.text:
+        title = ex._clean_title(soup.title.text) or title
+    og = soup.find("meta", property="og:title")
+    if og and og.get("content"):
+        title = ex._clean_title(og.get("content", "")) or title
+    meta = _legacy_meta(soup)
+    if not published_iso:
+        raw = next((meta[k] for k in ex.DATE_META_KEYS if k in meta), None)
+        published_iso = ex._normalize_any_date_to_iso(raw)
+    if not author:
+        raw = next((meta[k] for k in ex.AUTHOR_META_KEYS if k in meta), None)
+        if raw:
+            author = ex._clean_author(raw)
+    objs = _legacy_jsonld(soup)
+    if objs:
+        if not published_iso:
+            for o in objs:
+                v = o.get("datePublished") or o.get("dateModified")
+                if isinstance(v, str) and v.strip():
+                    published_iso = ex._normalize_any_date_to_iso(v.strip())
+                    break
+        if not author:
+            for o in objs:
+                a = o.get("author")
+                if isinstance(a, dict) and isinstance(a.get("name"), str):
+                    author = ex._clean_author(a["name"])
+                    break
+                if isinstance(a, list):
+                    names = [i["name"] for i in a if isinstance(i, dict) and isinstance(i.get("name"), str)]
+                    if names:
+                        author = ex._clean_author(names[0])
+                        break
+        if not text or len(text) < 200:
+            for o in objs:
+                ab = o.get("articleBody")
+                if isinstance(ab, str) and len(ab.strip()) > 200:
+                    text = ex._maybe_text_from_htmlish(ab)
+                    break
+    if not text or len(text) < 200:
+        nd = _legacy_next_data(soup)
+        if nd:
+            cands = ex._deep_find_text_fields(
+                nd,
+                keys=["articlebody", "body", "content", "text", "description", "html",
+                      "longdescription", "story", "storybody", "maincontent"],
+                max_hits=6,
+            )
+            best = max(cands, key=len) if cands else ""
+            if len(best) >= 250:
+                text = best
+    if not text or len(text) < 200:
+        fb = _legacy_dom_fallback(soup)
+        if fb and len(fb) > 120:
+            text = fb
+    return title, author, published_iso, text
+
+
+def current_extract(html: str) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+    title, author, published_iso, text, _note = ex.extract_from_html(html)
+    return title, author, published_iso, text
+
+
+# -----------------------
+# Runner
+# -----------------------
+def _load_fixtures(folder: str) -> List[Tuple[str, str]]:
+    out: List[Tuple[str, str]] = []
+    for root, _dirs, files in os.walk(folder):
+        for fn in sorted(files):
+            path = os.path.join(root, fn)
+            try:
+                if fn.endswith((".html", ".htm")):
+                    with open(path, "r", encoding="utf-8", errors="replace") as f:
+                        out.append((fn, f.read()))
+                elif fn.endswith((".html.gz", ".gz")):
+                    with gzip.open(path, "rt", encoding="utf-8", errors="replace") as f:
+                        out.append((fn, f.read()))
+            except Exception:
+                continue
+    return out
+
+
+def _cpu_time(fn, html: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.process_time()
+        fn(html)
+        best = min(best, time.process_time() - t0)
+    return best
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fixtures", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures"))
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    fixtures = _load_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"No .html fixtures under {args.fixtures}")
+        return 1
+
+    # warm up imports / trafilatura caches
+    legacy_extract(fixtures[0][1])
+    current_extract(fixtures[0][1])
+
+    print(f"{'fixture':32} {'KB':>6} {'legacy ms':>10} {'current ms':>11} {'speedup':>8}  same-output")
+    legacy_all: List[float] = []
+    current_all: List[float] = []
+    for name, html in fixtures:
+        lt = _cpu_time(legacy_extract, html, args.repeat)
+        ct = _cpu_time(current_extract, html, args.repeat)
+        legacy_all.append(lt)
+        current_all.append(ct)
+
+        lo, co = legacy_extract(html), current_extract(html)
+        same = ["title", "author", "date", "text"]
+        diffs = [k for k, a, b in zip(same, lo, co) if (a or None) != (b or None)]
+        print(
+            f"{name[:32]:32} {len(html) / 1024:6.1f} {lt * 1000:10.2f} {ct * 1000:11.2f} "
+            f"{(lt / ct if ct else 0):7.2f}x  {'yes' if not diffs else 'differs: ' + ','.join(diffs)}"
+        )
+
+    lm, cm = statistics.mean(legacy_all), statistics.mean(current_all)
+    print(f"\nmean per article: legacy {lm * 1000:.2f} ms | current {cm * 1000:.2f} ms | {lm / cm:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
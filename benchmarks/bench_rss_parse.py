@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+CPU time of feed parsing, feedparser vs the streaming (lxml iterparse) path
+used by src.fetcher.parse_rss_items.
+
+  feedparser: src.fetcher._parse_rss_items_lenient (whole document, then dedupe)
+  streaming : src.fetcher.parse_rss_items (all items, and capped at --cap the
+              way discovery calls it with max_candidates)
+
+Usage:
+  python benchmarks/bench_rss_parse.py [--feeds DIR] [--repeat N] [--cap N]
+
+Without --feeds, synthetic RSS 2.0 and Atom feeds of 100 / 1000 / 10000
+items are generated. DIR can hold saved .xml / .rss / .atom feeds.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import fetcher as f  # noqa: E402
+
+
+# -----------------------
+# Synthetic feeds
+# -----------------------
+_SUMMARY = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 6
+
+
+def _rss(n: int) -> bytes:
+    t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/" '
+        'xmlns:content="http://purl.org/rss/1.0/modules/content/" '
+        'xmlns:media="http://search.yahoo.com/mrss/"><channel>'
+        "<title>Bench</title><link>https://news.example.org/</link>"
+    ]
+    for i in range(n):
+        pub = format_datetime(t0 - timedelta(minutes=17 * i))
+        # every third item carries only content:encoded
+        body = "content:encoded" if i % 3 == 2 else "description"
+        parts.append(
+            f"<item><title>Story number {i} &amp; more</title>"
+            f"<link>https://news.example.org/2026/01/story-{i}.html</link>"
+            f'<guid isPermaLink="false">id-{i}</guid>'
+            f"<{body}><![CDATA[<p>{_SUMMARY}</p>]]></{body}>"
+            f"<dc:creator>Reporter {i % 7}</dc:creator><pubDate>{pub}</pubDate>"
+            f'<media:content url="https://img.example.org/{i}.jpg"><media:title>img {i}</media:title></media:content>'
+            "</item>"
+        )
+    parts.append("</channel></rss>")
+    return "".join(parts).encode("utf-8")
+
+
+def _atom(n: int) -> bytes:
+    t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom"><title>Bench</title>'
+        '<link rel="self" href="https://news.example.org/atom.xml"/>'
+    ]
+    for i in range(n):
+        ts = (t0 - timedelta(minutes=17 * i)).isoformat()
+        # every third entry carries only <content>
+        body = "content" if i % 3 == 2 else "summary"
+        parts.append(
+            f"<entry><title>Story number {i}</title>"
+            f'<link rel="alternate" href="https://news.example.org/2026/01/story-{i}.html"/>'
+            f"<id>tag:news.example.org,2026:{i}</id>"
+            f"<published>{ts}</published><updated>{ts}</updated>"
+            f"<author><name>Reporter {i % 7}</name></author>"
+            f'<{body} type="html">&lt;p&gt;{_SUMMARY}&lt;/p&gt;</{body}>'
+            "</entry>"
+        )
+    parts.append("</feed>")
+    return "".join(parts).encode("utf-8")
+
+
+def _synthetic() -> List[Tuple[str, bytes]]:
+    out: List[Tuple[str, bytes]] = []
+    for n in (100, 1000, 10000):
+        out.append((f"rss2-{n}", _rss(n)))
+        out.append((f"atom-{n}", _atom(n)))
+    return out
+
+
+def _load_feeds(folder: str) -> List[Tuple[str, bytes]]:
+    out: List[Tuple[str, bytes]] = []
+    for root, _dirs, files in os.walk(folder):
+        for fn in sorted(files):
+            if fn.endswith((".xml", ".rss", ".atom")):
+                with open(os.path.join(root, fn), "rb") as fh:
+                    out.append((fn, fh.read()))
+    return out
+
+
+# -----------------------
+# Runner
+# -----------------------
+def _cpu_time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.process_time()
+        fn()
+        best = min(best, time.process_time() - t0)
+    return best
+
+
+def _key(it: "f.RSSItem") -> Tuple[str, str, str, str, str]:
+    # summary: feedparser sanitizes its HTML, so saved feeds with scripts or
+    # inline styles in descriptions can differ there
+    return (it.url, it.title, it.author, it.published_at or "", it.summary)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--feeds", default="")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--cap", type=int, default=60, help="max_items for the capped run (discovery: target x 6)")
+    args = ap.parse_args()
+
+    feeds = _load_feeds(args.feeds) if args.feeds else _synthetic()
+    if not feeds:
+        print(f"No feeds under {args.feeds}")
+        return 1
+
+    base = "https://news.example.org/"
+    print(f"{'feed':16} {'KB':>8} {'items':>6} {'feedparser ms':>14} {'stream ms':>10} {'capped ms':>10} {'speedup':>8}  same-output")
+    ratios: List[float] = []
+    for name, data in feeds:
+        legacy = f._parse_rss_items_lenient(data, base)
+        fast = f.parse_rss_items(data, base)
+        streamed = f._parse_feed_streaming(data, base) is not None
+
+        lt = _cpu_time(lambda: f._parse_rss_items_lenient(data, base), args.repeat)
+        st = _cpu_time(lambda: f.parse_rss_items(data, base), args.repeat)
+        ct = _cpu_time(lambda: f.parse_rss_items(data, base, max_items=args.cap), args.repeat)
+        ratios.append(lt / st if st else 0.0)
+
+        diffs = sum(1 for a, b in zip(legacy, fast) if _key(a) != _key(b)) + abs(len(legacy) - len(fast))
+        same = "yes" if not diffs else f"differs on {diffs}"
+        if not streamed:
+            same += " (fell back to feedparser)"
+        print(
+            f"{name[:16]:16} {len(data) / 1024:8.1f} {len(fast):6d} {lt * 1000:14.2f} {st * 1000:10.2f} "
+            f"{ct * 1000:10.2f} {ratios[-1]:7.1f}x  {same}"
+        )
+
+    print(f"\nmedian speedup (full parse): {statistics.median(ratios):.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -75,4 +75,7 @@ def main(argv: list[str] | None = None) -> int:
 
 
 if __name__ == "__main__":
+    # extraction worker processes use "spawn"; needed for frozen builds
+    import multiprocessing
+    multiprocessing.freeze_support()
     raise SystemExit(main())
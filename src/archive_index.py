@@ -0,0 +1,615 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .models import Article
+
+
+# =============================================================================
+# Cross-run archive index
+# =============================================================================
+#
+# A single SQLite file indexes every article JSON under data/runs/<run>/:
+#   data/archive_index.sqlite3
+#
+# Each stage file (fetched/<COUNTRY>/<slug>.json, shortlisted/..., raw/...)
+# is tracked by (mtime_ns, size). Updating the index only re-reads files whose
+# signature changed, so calling update_archive_index() after every run / save
+# is cheap. Queries never touch the JSON files; loading full Article objects
+# for a result set reads each matching file once.
+# =============================================================================
+
+INDEX_FILENAME = "archive_index.sqlite3"
+SCHEMA_VERSION = 1
+
+_STAGE_DIRS = ("fetched", "shortlisted", "raw")
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+    """
+    CREATE TABLE IF NOT EXISTS files (
+        path TEXT PRIMARY KEY,
+        run_id TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS articles (
+        rowid INTEGER PRIMARY KEY,
+        file_path TEXT NOT NULL,
+        run_id TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        article_id TEXT NOT NULL,
+        country TEXT,
+        source_name TEXT,
+        url TEXT,
+        title TEXT,
+        published_at TEXT,
+        published_date TEXT,
+        bucket TEXT,
+        threat_level TEXT,
+        threat_vector TEXT,
+        prepriority_score REAL,
+        risk_index REAL,
+        shortlisted INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS kw_hits (
+        article_rowid INTEGER NOT NULL,
+        kind TEXT NOT NULL,
+        keyword TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_articles_file ON articles(file_path)",
+    "CREATE INDEX IF NOT EXISTS ix_articles_date ON articles(published_date)",
+    "CREATE INDEX IF NOT EXISTS ix_articles_country ON articles(country, published_date)",
+    "CREATE INDEX IF NOT EXISTS ix_articles_source ON articles(source_name, published_date)",
+    "CREATE INDEX IF NOT EXISTS ix_articles_bucket ON articles(bucket, published_date)",
+    "CREATE INDEX IF NOT EXISTS ix_articles_level ON articles(threat_level, published_date)",
+    "CREATE INDEX IF NOT EXISTS ix_articles_vector ON articles(threat_vector, published_date)",
+    "CREATE INDEX IF NOT EXISTS ix_articles_run ON articles(run_id)",
+    "CREATE INDEX IF NOT EXISTS ix_articles_run_stage ON articles(run_id, stage, file_path)",
+    "CREATE INDEX IF NOT EXISTS ix_kw_keyword ON kw_hits(keyword, article_rowid)",
+    "CREATE INDEX IF NOT EXISTS ix_kw_article ON kw_hits(article_rowid)",
+]
+
+
+# -----------------------
+# Helpers
+# -----------------------
+def archive_index_path(base_dir: str) -> str:
+    data_dir = os.path.join(base_dir, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    return os.path.join(data_dir, INDEX_FILENAME)
+
+
+def _connect(base_dir: str) -> sqlite3.Connection:
+    con = sqlite3.connect(archive_index_path(base_dir), timeout=30)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    for stmt in _SCHEMA:
+        con.execute(stmt)
+    con.execute(
+        "INSERT OR IGNORE INTO meta(key, value) VALUES('schema_version', ?)",
+        (str(SCHEMA_VERSION),),
+    )
+    return con
+
+
+def _published_date(iso_s: Optional[str]) -> Optional[str]:
+    if not iso_s:
+        return None
+    t = str(iso_s).strip()
+    if not t:
+        return None
+    try:
+        d = datetime.fromisoformat(t.replace("Z", "+00:00"))
+        if d.tzinfo is not None:
+            d = d.astimezone(timezone.utc)
+        return d.date().isoformat()
+    except Exception:
+        m = re.match(r"^(\d{4}-\d{2}-\d{2})", t)
+        return m.group(1) if m else None
+
+
+def _bucket_for(d: Dict) -> Optional[str]:
+    b = (d.get("prepriority_bucket") or "").strip().upper()
+    if b:
+        return b
+    v = d.get("prepriority_score")
+    if v is None:
+        return None
+    try:
+        x = float(v)
+    except Exception:
+        return None
+    if x >= 80:
+        return "CRITICAL"
+    if x >= 60:
+        return "HIGH"
+    if x >= 40:
+        return "MEDIUM"
+    return "LOW"
+
+
+def _kw_list(d: Dict, spec_key: str, legacy_key: str) -> List[str]:
+    raw = d.get("raw") or {}
+    vals = d.get(spec_key) or d.get(legacy_key) or raw.get(spec_key) or []
+    out: List[str] = []
+    seen = set()
+    for k in vals:
+        if not isinstance(k, str):
+            continue
+        kk = k.strip().casefold()
+        if kk and kk not in seen:
+            seen.add(kk)
+            out.append(kk)
+    return out
+
+
+def _is_shortlisted_dict(d: Dict) -> bool:
+    if d.get("shortlisted") is True:
+        return True
+    return (d.get("raw") or {}).get("kw_shortlisted") is True
+
+
+def _to_float(v) -> Optional[float]:
+    if v is None:
+        return None
+    try:
+        return float(v)
+    except Exception:
+        return None
+
+
+def _iter_stage_files(run_path: str) -> Iterable[Tuple[str, str]]:
+    for stage in _STAGE_DIRS:
+        sdir = os.path.join(run_path, stage)
+        if not os.path.isdir(sdir):
+            continue
+        for country in os.listdir(sdir):
+            cdir = os.path.join(sdir, country)
+            if not os.path.isdir(cdir):
+                continue
+            for fn in os.listdir(cdir):
+                if fn.lower().endswith(".json"):
+                    yield stage, os.path.join(cdir, fn)
+
+
+def _list_run_paths(base_dir: str) -> List[str]:
+    root = os.path.join(base_dir, "data", "runs")
+    if not os.path.isdir(root):
+        return []
+    out: List[str] = []
+    for name in sorted(os.listdir(root)):
+        p = os.path.join(root, name)
+        if os.path.isdir(p):
+            out.append(p)
+    return out
+
+
+# -----------------------
+# Index maintenance
+# -----------------------
+@dataclass
+class ArchiveUpdateStats:
+    runs_scanned: int = 0
+    files_scanned: int = 0
+    files_indexed: int = 0
+    files_removed: int = 0
+    articles_indexed: int = 0
+
+
+def _index_file(con: sqlite3.Connection, path: str, run_id: str, stage: str, *, replace: bool) -> int:
+    if replace:
+        _drop_file(con, path)
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return 0
+    if not isinstance(data, list):
+        return 0
+
+    # Explicit rowids let both tables be bulk-inserted with executemany.
+    next_rowid = int(con.execute("SELECT COALESCE(MAX(rowid), 0) FROM articles").fetchone()[0]) + 1
+
+    rows: List[Tuple] = []
+    hits: List[Tuple[int, str, str]] = []
+    for d in data:
+        if not isinstance(d, dict):
+            continue
+        aid = str(d.get("id", "") or "")
+        if not aid:
+            continue
+        rowid = next_rowid
+        next_rowid += 1
+        rows.append((
+            rowid,
+            path,
+            run_id,
+            stage,
+            aid,
+            str(d.get("country", "") or ""),
+            str(d.get("source_name", "") or ""),
+            str(d.get("url", "") or ""),
+            str(d.get("title", "") or ""),
+            d.get("published_at"),
+            _published_date(d.get("published_at")),
+            _bucket_for(d),
+            (d.get("threat_level") or None),
+            (d.get("threat_vector") or None),
+            _to_float(d.get("prepriority_score")),
+            _to_float(d.get("risk_index")),
+            1 if _is_shortlisted_dict(d) else 0,
+        ))
+        hits.extend((rowid, "national", k) for k in _kw_list(d, "kw_national_hits", "keywords_national_matched"))
+        hits.extend((rowid, "threat", k) for k in _kw_list(d, "kw_threat_hits", "keywords_threat_matched"))
+
+    con.executemany(
+        """
+        INSERT INTO articles(
+            rowid, file_path, run_id, stage, article_id, country, source_name, url, title,
+            published_at, published_date, bucket, threat_level, threat_vector,
+            prepriority_score, risk_index, shortlisted
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    if hits:
+        con.executemany("INSERT INTO kw_hits(article_rowid, kind, keyword) VALUES (?, ?, ?)", hits)
+    return len(rows)
+
+
+def update_archive_index(base_dir: str, run_dirs: Optional[List[str]] = None) -> ArchiveUpdateStats:
+    """
+    Incrementally (re)index run directories.
+
+    run_dirs=None scans every run under data/runs and also drops index rows for
+    runs/files that no longer exist. Passing explicit run_dirs only touches
+    those runs (use after a fetch / shortlisting / scoring save).
+    """
+    stats = ArchiveUpdateStats()
+    full_scan = run_dirs is None
+    paths = _list_run_paths(base_dir) if full_scan else [os.path.abspath(p) for p in run_dirs or []]
+
+    con = _connect(base_dir)
+    try:
+        for run_path in paths:
+            if not os.path.isdir(run_path):
+                continue
+            run_id = os.path.basename(os.path.normpath(run_path))
+            stats.runs_scanned += 1
+
+            known: Dict[str, Tuple[int, int]] = {
+                p: (m, s)
+                for p, m, s in con.execute("SELECT path, mtime_ns, size FROM files WHERE run_id=?", (run_id,))
+            }
+            present = set()
+
+            with con:
+                for stage, fpath in _iter_stage_files(run_path):
+                    stats.files_scanned += 1
+                    present.add(fpath)
+                    try:
+                        st = os.stat(fpath)
+                    except OSError:
+                        continue
+                    sig = (int(st.st_mtime_ns), int(st.st_size))
+                    if known.get(fpath) == sig:
+                        continue
+                    stats.articles_indexed += _index_file(con, fpath, run_id, stage, replace=fpath in known)
+                    con.execute(
+                        "INSERT OR REPLACE INTO files(path, run_id, stage, mtime_ns, size) VALUES (?, ?, ?, ?, ?)",
+                        (fpath, run_id, stage, sig[0], sig[1]),
+                    )
+                    stats.files_indexed += 1
+
+                for fpath in set(known) - present:
+                    _drop_file(con, fpath)
+                    stats.files_removed += 1
+
+        if full_scan:
+            live = {os.path.basename(os.path.normpath(p)) for p in paths}
+            stale = [r for (r,) in con.execute("SELECT DISTINCT run_id FROM files") if r not in live]
+            with con:
+                for rid in stale:
+                    for (fpath,) in con.execute("SELECT path FROM files WHERE run_id=?", (rid,)).fetchall():
+                        _drop_file(con, fpath)
+                        stats.files_removed += 1
+    finally:
+        con.close()
+
+    return stats
+
+
+def _drop_file(con: sqlite3.Connection, path: str) -> None:
+    con.execute("DELETE FROM kw_hits WHERE article_rowid IN (SELECT rowid FROM articles WHERE file_path=?)", (path,))
+    con.execute("DELETE FROM articles WHERE file_path=?", (path,))
+    con.execute("DELETE FROM files WHERE path=?", (path,))
+
+
+# -----------------------
+# Query API
+# -----------------------
+@dataclass
+class ArchiveQuery:
+    countries: List[str] = field(default_factory=list)
+    sources: List[str] = field(default_factory=list)
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    buckets: List[str] = field(default_factory=list)          # PrePriority bucket
+    threat_levels: List[str] = field(default_factory=list)    # Layer 3 level
+    threat_vectors: List[str] = field(default_factory=list)
+    keywords: List[str] = field(default_factory=list)         # national or threat hits
+    keywords_match_all: bool = False
+    shortlisted_only: bool = False
+    run_ids: List[str] = field(default_factory=list)
+    limit: int = 5000
+
+
+@dataclass
+class ArchiveHit:
+    run_id: str
+    stage: str
+    file_path: str
+    article_id: str
+    country: str
+    source_name: str
+    url: str
+    title: str
+    published_at: Optional[str]
+    bucket: Optional[str]
+    threat_level: Optional[str]
+    threat_vector: Optional[str]
+    prepriority_score: Optional[float]
+    risk_index: Optional[float]
+    shortlisted: bool
+
+
+def _in_clause(col: str, values: List[str], where: List[str], params: List) -> None:
+    vals = [v for v in values if v]
+    if not vals:
+        return
+    where.append(f"{col} IN ({','.join('?' for _ in vals)})")
+    params.extend(vals)
+
+
+def _where_for(q: ArchiveQuery) -> Tuple[List[str], List]:
+    where: List[str] = []
+    params: List = []
+
+    _in_clause("a.country", q.countries, where, params)
+    _in_clause("a.source_name", q.sources, where, params)
+    _in_clause("a.bucket", [b.upper() for b in q.buckets], where, params)
+    _in_clause("a.threat_level", [t.upper() for t in q.threat_levels], where, params)
+    _in_clause("a.threat_vector", [v.upper() for v in q.threat_vectors], where, params)
+    _in_clause("a.run_id", q.run_ids, where, params)
+
+    if q.date_from:
+        where.append("a.published_date >= ?")
+        params.append(q.date_from.isoformat())
+    if q.date_to:
+        where.append("a.published_date <= ?")
+        params.append(q.date_to.isoformat())
+    if q.shortlisted_only:
+        where.append("a.shortlisted = 1")
+
+    kws = list(dict.fromkeys(k.strip().casefold() for k in q.keywords if k and k.strip()))
+    if kws:
+        marks = ",".join("?" for _ in kws)
+        if q.keywords_match_all:
+            where.append(
+                f"a.rowid IN (SELECT article_rowid FROM kw_hits WHERE keyword IN ({marks}) "
+                f"GROUP BY article_rowid HAVING COUNT(DISTINCT keyword) = ?)"
+            )
+            params.extend(kws)
+            params.append(len(kws))
+        else:
+            where.append(f"a.rowid IN (SELECT article_rowid FROM kw_hits WHERE keyword IN ({marks}))")
+            params.extend(kws)
+    return where, params
+
+
+def query_archive(base_dir: str, q: ArchiveQuery) -> List[ArchiveHit]:
+    """
+    Query the archive index. Results are newest first and deduplicated per
+    (run_id, article_id): an article present in both fetched/ and shortlisted/
+    is returned once, preferring the shortlisted copy.
+    """
+    where, params = _where_for(q)
+
+    sql = (
+        "SELECT a.run_id, a.stage, a.file_path, a.article_id, a.country, a.source_name, a.url, a.title, "
+        "a.published_at, a.bucket, a.threat_level, a.threat_vector, a.prepriority_score, a.risk_index, a.shortlisted "
+        "FROM articles a"
+    )
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY a.published_date DESC, (a.stage = 'shortlisted') DESC"
+
+    limit = max(1, int(q.limit or 0))
+    out: List[ArchiveHit] = []
+    seen = set()
+
+    con = _connect(base_dir)
+    try:
+        cur = con.execute(sql, params)
+        while len(out) < limit:
+            rows = cur.fetchmany(1000)
+            if not rows:
+                break
+            for r in rows:
+                key = (r[0], r[3])
+                if key in seen:
+                    continue
+                seen.add(key)
+                out.append(ArchiveHit(
+                    run_id=r[0],
+                    stage=r[1],
+                    file_path=r[2],
+                    article_id=r[3],
+                    country=r[4] or "",
+                    source_name=r[5] or "",
+                    url=r[6] or "",
+                    title=r[7] or "",
+                    published_at=r[8],
+                    bucket=r[9],
+                    threat_level=r[10],
+                    threat_vector=r[11],
+                    prepriority_score=r[12],
+                    risk_index=r[13],
+                    shortlisted=bool(r[14]),
+                ))
+                if len(out) >= limit:
+                    break
+    finally:
+        con.close()
+
+    return out
+
+
+def archive_facets(base_dir: str) -> Dict[str, List[str]]:
+    """
+    Distinct values for populating filter widgets.
+    """
+    con = _connect(base_dir)
+    try:
+        def distinct(col: str) -> List[str]:
+            return [r[0] for r in con.execute(
+                f"SELECT DISTINCT {col} FROM articles WHERE {col} IS NOT NULL AND {col} != '' ORDER BY {col}"
+            )]
+
+        return {
+            "countries": distinct("country"),
+            "sources": distinct("source_name"),
+            "buckets": distinct("bucket"),
+            "threat_levels": distinct("threat_level"),
+            "threat_vectors": distinct("threat_vector"),
+            "runs": distinct("run_id"),
+        }
+    finally:
+        con.close()
+
+
+def count_archive_articles(base_dir: str, q: ArchiveQuery) -> int:
+    """
+    Number of distinct (run_id, article_id) pairs matching q (ignores q.limit).
+    """
+    where, params = _where_for(q)
+    sql = "SELECT COUNT(*) FROM (SELECT DISTINCT a.run_id, a.article_id FROM articles a"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += ")"
+    con = _connect(base_dir)
+    try:
+        return int(con.execute(sql, params).fetchone()[0])
+    finally:
+        con.close()
+
+
+def iter_archive_articles(base_dir: str, q: ArchiveQuery) -> Iterator[Article]:
+    """
+    Stream full Article objects for every match of q, ignoring q.limit.
+
+    Rows are walked per run (shortlisted stage first, then file by file), so
+    only one JSON file and one run's seen-ids set are held at a time. Same
+    dedup rule as query_archive(); output order is by run, not by date.
+    """
+    where, params = _where_for(q)
+    sql = "SELECT a.run_id, a.stage, a.file_path, a.article_id FROM articles a"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY a.run_id, (a.stage = 'shortlisted') DESC, a.stage, a.file_path"
+
+    con = _connect(base_dir)
+    try:
+        cur = con.execute(sql, params)
+        run_id: Optional[str] = None
+        seen: Set[str] = set()
+        path: Optional[str] = None
+        wanted: Set[str] = set()
+
+        while True:
+            rows = cur.fetchmany(2000)
+            for r in rows:
+                if r[2] != path:
+                    if path is not None and wanted:
+                        yield from _read_file_articles(path, wanted, run_id or "")
+                    path, wanted = r[2], set()
+                if r[0] != run_id:
+                    run_id, seen = r[0], set()
+                if r[3] in seen:
+                    continue
+                seen.add(r[3])
+                wanted.add(r[3])
+            if not rows:
+                break
+        if path is not None and wanted:
+            yield from _read_file_articles(path, wanted, run_id or "")
+    finally:
+        con.close()
+
+
+def _read_file_articles(path: str, ids: Set[str], run_id: str) -> Iterator[Article]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return
+    if not isinstance(data, list):
+        return
+    for d in data:
+        if not isinstance(d, dict) or str(d.get("id", "") or "") not in ids:
+            continue
+        try:
+            a = Article.from_dict(d)
+        except Exception:
+            continue
+        if not a.run_id:
+            a.run_id = run_id
+        yield a
+
+
+def load_archive_articles(hits: List[ArchiveHit]) -> List[Article]:
+    """
+    Materialize full Article objects for query hits. Each JSON file is read once.
+    """
+    wanted: Dict[str, Dict[str, int]] = {}
+    for i, h in enumerate(hits):
+        wanted.setdefault(h.file_path, {})[h.article_id] = i
+
+    slots: List[Optional[Article]] = [None] * len(hits)
+    for path, ids in wanted.items():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            continue
+        if not isinstance(data, list):
+            continue
+        for d in data:
+            if not isinstance(d, dict):
+                continue
+            idx = ids.get(str(d.get("id", "") or ""))
+            if idx is None:
+                continue
+            try:
+                a = Article.from_dict(d)
+            except Exception:
+                continue
+            if not a.run_id:
+                a.run_id = hits[idx].run_id
+            slots[idx] = a
+
+    return [a for a in slots if a is not None]
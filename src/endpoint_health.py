@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from .models import Endpoint, Source
+
+
+# =============================================================================
+# Endpoint health memory (persisted across runs)
+# =============================================================================
+#
+# data/endpoint_health.json keeps, per endpoint (type + URL):
+#   attempts / successes / consecutive failures, latency (EWMA, successes
+#   only), last status + error, items found, and for FEED_DIRECTORY the feed
+#   URL that last worked (so later runs skip the candidate probing). A
+#   resolved feed is trusted for FEED_CACHE_TTL_HOURS; after that the
+#   directory is probed again (the old feed remains a fallback).
+#
+# Discovery uses it to:
+#   - try healthy, fast endpoints first (configured order breaks ties)
+#   - skip endpoints that failed DEAD_AFTER times in a row, until
+#     DEAD_RETRY_HOURS have passed (unless every endpoint is dead)
+#
+# Statuses follow Endpoint.last_status: WORKING / PARTIAL / FAILING / UNKNOWN
+# =============================================================================
+
+STATUS_WORKING = "WORKING"     # fetched and produced candidates
+STATUS_PARTIAL = "PARTIAL"     # fetched, but no candidates
+STATUS_FAILING = "FAILING"     # fetch/validation failed
+STATUS_UNKNOWN = "UNKNOWN"
+
+DEAD_AFTER = 3
+DEAD_RETRY_HOURS = 12
+FEED_CACHE_TTL_HOURS = 72
+LATENCY_ALPHA = 0.3
+
+HEALTH_FILE = "endpoint_health.json"
+
+
+def endpoint_key(ep: Endpoint) -> str:
+    return f"{(ep.type or '').strip().upper()}|{(ep.url or '').strip()}"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def _parse_iso(s: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(s) if s else None
+    except Exception:
+        return None
+
+
+@dataclass
+class EndpointStats:
+    attempts: int = 0
+    successes: int = 0
+    consecutive_failures: int = 0
+    latency_ms: float = 0.0
+    last_status: str = STATUS_UNKNOWN
+    last_error: str = ""
+    last_items: int = 0
+    last_attempt_at: str = ""
+    last_ok_at: str = ""
+    resolved_feed: str = ""
+    resolved_feed_at: str = ""
+
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.attempts if self.attempts else 1.0
+
+    @property
+    def is_dead(self) -> bool:
+        return self.consecutive_failures >= DEAD_AFTER
+
+    def describe(self) -> str:
+        if not self.attempts:
+            return "never tried"
+        parts = [
+            self.last_status,
+            f"ok {self.successes}/{self.attempts}",
+            f"{self.latency_ms:.0f} ms" if self.latency_ms else "",
+            f"feed={self.resolved_feed}" if self.resolved_feed else "",
+            f"error={self.last_error}" if self.last_error and self.last_status != STATUS_WORKING else "",
+        ]
+        return " | ".join(p for p in parts if p)
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "EndpointStats":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in (d or {}).items() if k in known})
+
+
+@dataclass
+class EndpointPlan:
+    ordered: List[Endpoint]
+    skipped: List[Endpoint]
+
+
+class EndpointHealthStore:
+    def __init__(self, path: str, stats: Optional[Dict[str, EndpointStats]] = None) -> None:
+        self.path = path
+        self._stats: Dict[str, EndpointStats] = stats or {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, base_dir: str) -> "EndpointHealthStore":
+        path = os.path.join(base_dir, "data", HEALTH_FILE)
+        stats: Dict[str, EndpointStats] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for k, v in (data.get("endpoints") or {}).items():
+                stats[k] = EndpointStats.from_dict(v)
+        except Exception:
+            stats = {}
+        return cls(path, stats)
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"version": 1, "endpoints": {k: asdict(v) for k, v in sorted(self._stats.items())}}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+    # -----------------------
+    # Read
+    # -----------------------
+    def get(self, ep: Endpoint) -> EndpointStats:
+        with self._lock:
+            return self._stats.get(endpoint_key(ep)) or EndpointStats()
+
+    def resolved_feed(self, ep: Endpoint) -> str:
+        """
+        Last validated feed, regardless of age.
+        """
+        return self.get(ep).resolved_feed
+
+    def cached_feed(self, ep: Endpoint) -> str:
+        """
+        Last validated feed if it is younger than FEED_CACHE_TTL_HOURS, else "".
+        """
+        st = self.get(ep)
+        at = _parse_iso(st.resolved_feed_at)
+        if st.resolved_feed and at and _now() - at < timedelta(hours=FEED_CACHE_TTL_HOURS):
+            return st.resolved_feed
+        return ""
+
+    def _skippable(self, st: EndpointStats, now: datetime) -> bool:
+        if not st.is_dead:
+            return False
+        last = _parse_iso(st.last_attempt_at)
+        return bool(last and now - last < timedelta(hours=DEAD_RETRY_HOURS))
+
+    def plan(self, endpoints: List[Endpoint]) -> "EndpointPlan":
+        """
+        Order endpoints for discovery: healthy and fast first, recently dead
+        ones skipped (all kept if every endpoint is dead).
+        """
+        now = _now()
+        indexed = [(i, ep, self.get(ep)) for i, ep in enumerate(endpoints)]
+        live = [x for x in indexed if not self._skippable(x[2], now)]
+        skipped = [x[1] for x in indexed if self._skippable(x[2], now)]
+        if not live:
+            live, skipped = indexed, []
+
+        def key(x):
+            i, _ep, st = x
+            # success-rate buckets of 25% so small differences keep the configured order
+            return (
+                st.is_dead,
+                -round(st.success_rate * 4),
+                st.latency_ms if st.latency_ms else float("inf"),
+                i,
+            )
+
+        ordered = [ep for _i, ep, _st in sorted(live, key=key)]
+        return EndpointPlan(ordered=ordered, skipped=skipped)
+
+    # -----------------------
+    # Write
+    # -----------------------
+    def record(
+        self,
+        ep: Endpoint,
+        *,
+        status: str,
+        latency_s: float,
+        items: int = 0,
+        error: str = "",
+        resolved_feed: Optional[str] = None,
+    ) -> EndpointStats:
+        """
+        Record one discovery attempt and mirror status/error onto the Endpoint
+        (runtime fields). resolved_feed=None leaves the cached feed unchanged;
+        a URL (freshly validated) restarts its TTL; "" clears it.
+        """
+        now = _now().isoformat()
+        with self._lock:
+            st = self._stats.setdefault(endpoint_key(ep), EndpointStats())
+            st.attempts += 1
+            st.last_attempt_at = now
+            st.last_status = status
+            st.last_items = int(items)
+            st.last_error = error if status != STATUS_WORKING else ""
+            if status == STATUS_FAILING:
+                st.consecutive_failures += 1
+            else:
+                st.successes += 1
+                st.consecutive_failures = 0
+                st.last_ok_at = now
+                ms = max(0.0, latency_s * 1000.0)
+                st.latency_ms = ms if not st.latency_ms else (
+                    LATENCY_ALPHA * ms + (1.0 - LATENCY_ALPHA) * st.latency_ms
+                )
+            if resolved_feed is not None:
+                st.resolved_feed = resolved_feed
+                st.resolved_feed_at = now if resolved_feed else ""
+
+        ep.last_status = status
+        ep.last_error = st.last_error
+        return st
+
+    def apply_to(self, sources: List[Source]) -> None:
+        """
+        Fill Endpoint.last_status / last_error from the store (for display).
+        """
+        for s in sources:
+            for ep in s.endpoints:
+                st = self.get(ep)
+                ep.last_status = st.last_status
+                ep.last_error = st.last_error
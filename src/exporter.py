@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from .keywords import is_shortlisted, national_hits, threat_hits
+from .models import Article
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except Exception:
+    pa = None
+    pq = None
+    HAS_PYARROW = False
+
+
+# =============================================================================
+# Streaming export (CSV / JSONL / Parquet)
+# =============================================================================
+#
+# Articles are consumed from an iterator and written in chunks, so memory use
+# depends on chunk_size, not on the number of exported rows. Sources:
+#   - any in-memory list (e.g. the Browse view)
+#   - iter_run_articles(): a run folder on disk, one JSON file at a time
+#   - archive_index.iter_archive_articles(): an archive query
+#
+# Output is written to "<path>.part" and renamed when complete.
+# Parquet requires pyarrow (optional dependency).
+# =============================================================================
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+FORMAT_PARQUET = "parquet"
+
+EXPORT_FORMATS = (FORMAT_CSV, FORMAT_JSONL, FORMAT_PARQUET)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# (column, kind) - kind drives Parquet typing; CSV keeps the legacy text format
+EXPORT_COLUMNS = [
+    ("title", "str"),
+    ("country", "str"),
+    ("source", "str"),
+    ("published_at", "str"),
+    ("url", "str"),
+    ("shortlisted", "bool"),
+    ("national_hits", "str"),
+    ("threat_hits", "str"),
+    ("content_length", "int"),
+    ("relevance_score", "float"),
+    ("evidence_strength", "str"),
+    ("evidence_numeric", "float"),
+    ("urgency_score", "float"),
+    ("keyword_intensity", "float"),
+    ("prepriority_score", "float"),
+    ("prepriority_bucket", "str"),
+    ("threat_score", "float"),
+    ("threat_level", "str"),
+    ("threat_vector", "str"),
+    ("one_liner_threat", "str"),
+    ("reasons", "str"),
+    ("risk_index", "float"),
+]
+
+
+# -----------------------
+# Row building
+# -----------------------
+def article_export_row(a: Article) -> Dict[str, Any]:
+    reasons = getattr(a, "reasons", None) or []
+    return {
+        "title": a.title or "",
+        "country": a.country or "",
+        "source": a.source_name or "",
+        "published_at": a.published_at or "",
+        "url": a.url or "",
+        "shortlisted": is_shortlisted(a),
+        "national_hits": ";".join(national_hits(a)),
+        "threat_hits": ";".join(threat_hits(a)),
+        "content_length": len(a.content_text or ""),
+        "relevance_score": getattr(a, "relevance_score", None),
+        "evidence_strength": getattr(a, "evidence_strength", None),
+        "evidence_numeric": getattr(a, "evidence_numeric", None),
+        "urgency_score": getattr(a, "urgency_score", None),
+        "keyword_intensity": getattr(a, "keyword_intensity", None),
+        "prepriority_score": getattr(a, "prepriority_score", None),
+        "prepriority_bucket": getattr(a, "prepriority_bucket", None),
+        "threat_score": getattr(a, "threat_score", None),
+        "threat_level": getattr(a, "threat_level", None),
+        "threat_vector": getattr(a, "threat_vector", None),
+        "one_liner_threat": getattr(a, "one_liner_threat", None),
+        "reasons": " | ".join([str(x) for x in reasons]),
+        "risk_index": getattr(a, "risk_index", None),
+    }
+
+
+def _csv_value(col: str, v: Any) -> Any:
+    if col == "shortlisted":
+        return "YES" if v else "NO"
+    if v is None:
+        return ""
+    return v
+
+
+def _coerce(kind: str, v: Any) -> Any:
+    if v is None:
+        return None
+    if kind == "str":
+        return str(v)
+    if v == "":
+        return None
+    try:
+        if kind == "float":
+            return float(v)
+        if kind == "int":
+            return int(v)
+        if kind == "bool":
+            return bool(v)
+    except Exception:
+        return None
+    return v
+
+
+# -----------------------
+# Sources
+# -----------------------
+def iter_run_articles(run_dir: str, subfolder: str = "fetched") -> Iterator[Article]:
+    """
+    Stream articles from <run_dir>/<subfolder>/<COUNTRY>/<slug>.json without
+    loading the whole run.
+    """
+    base = os.path.join(run_dir, subfolder)
+    if not os.path.isdir(base):
+        return
+    for country in sorted(os.listdir(base)):
+        cdir = os.path.join(base, country)
+        if not os.path.isdir(cdir):
+            continue
+        for fn in sorted(os.listdir(cdir)):
+            if not fn.lower().endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(cdir, fn), "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception:
+                continue
+            if not isinstance(data, list):
+                continue
+            for d in data:
+                try:
+                    yield Article.from_dict(d)
+                except Exception:
+                    continue
+
+
+def _chunks(items: Iterable[Article], size: int) -> Iterator[List[Article]]:
+    buf: List[Article] = []
+    for a in items:
+        buf.append(a)
+        if len(buf) >= size:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+
+# -----------------------
+# Writers
+# -----------------------
+@dataclass
+class ExportStats:
+    path: str
+    fmt: str
+    rows: int
+    elapsed_s: float
+    stopped: bool = False
+
+
+def format_for_path(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext in ("jsonl", "ndjson"):
+        return FORMAT_JSONL
+    if ext in ("parquet", "pq"):
+        return FORMAT_PARQUET
+    return FORMAT_CSV
+
+
+def _parquet_schema():
+    types = {"str": pa.string(), "float": pa.float64(), "int": pa.int64(), "bool": pa.bool_()}
+    return pa.schema([(name, types[kind]) for name, kind in EXPORT_COLUMNS])
+
+
+def export_articles(
+    articles: Iterable[Article],
+    path: str,
+    fmt: Optional[str] = None,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[Callable[[int], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> ExportStats:
+    """
+    Write articles to path in chunks. progress(rows_written) is called after
+    each chunk. If should_stop() turns true the partial file is discarded.
+    """
+    fmt = fmt or format_for_path(path)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == FORMAT_PARQUET and not HAS_PYARROW:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    t0 = time.time()
+    tmp = path + ".part"
+    rows = 0
+    stopped = False
+    cols = [c for c, _ in EXPORT_COLUMNS]
+
+    try:
+        if fmt == FORMAT_PARQUET:
+            schema = _parquet_schema()
+            writer = pq.ParquetWriter(tmp, schema, compression="zstd")
+            try:
+                for chunk in _chunks(articles, chunk_size):
+                    if should_stop and should_stop():
+                        stopped = True
+                        break
+                    recs = [article_export_row(a) for a in chunk]
+                    arrays = {
+                        name: [_coerce(kind, r[name]) for r in recs]
+                        for name, kind in EXPORT_COLUMNS
+                    }
+                    writer.write_table(pa.table(arrays, schema=schema))
+                    rows += len(chunk)
+                    if progress:
+                        progress(rows)
+            finally:
+                writer.close()
+        else:
+            with open(tmp, "w", encoding="utf-8", newline="") as f:
+                w = csv.writer(f) if fmt == FORMAT_CSV else None
+                if w is not None:
+                    w.writerow(cols)
+                for chunk in _chunks(articles, chunk_size):
+                    if should_stop and should_stop():
+                        stopped = True
+                        break
+                    if w is not None:
+                        for a in chunk:
+                            r = article_export_row(a)
+                            w.writerow([_csv_value(c, r[c]) for c in cols])
+                    else:
+                        f.writelines(json.dumps(a.to_dict(), ensure_ascii=False) + "\n" for a in chunk)
+                    rows += len(chunk)
+                    if progress:
+                        progress(rows)
+
+        if stopped:
+            os.remove(tmp)
+        else:
+            os.replace(tmp, path)
+    except Exception:
+        try:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        except Exception:
+            pass
+        raise
+
+    return ExportStats(path=path, fmt=fmt, rows=rows, elapsed_s=time.time() - t0, stopped=stopped)
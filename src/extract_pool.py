@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from datetime import datetime, timezone
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .extractor import TIMEOUT_DEFAULT, PrefetchedPage, extract_from_html, fetch_article_html
+from .models import Article
+from .snapshot_store import SnapshotStore
+
+
+# =============================================================================
+# Parallel article extraction
+# =============================================================================
+#
+# Network and CPU work are sized independently:
+#   - fetch_workers threads download article HTML (I/O bound)
+#   - parse_workers processes run extract_from_html (trafilatura + soup, CPU
+#     bound, so threads would serialize on the GIL)
+#
+# A fetch thread submits its HTML to the process pool and moves on to the
+# next download without waiting for the parse; the calling thread collects
+# the parse results. Download concurrency is therefore not limited by parse
+# speed, and parsing of early pages overlaps with downloading of later ones.
+#
+# parse_workers=0 parses inside the fetch threads (no child processes). The
+# same happens automatically if the process pool cannot be started.
+#
+# Pages already downloaded during discovery (date sniffing) can be passed as
+# prefetched={url: PrefetchedPage}; those articles skip the network fetch.
+#
+# With a SnapshotStore, every downloaded page is saved before parsing and the
+# reference is kept in raw["snapshot"]; reextract() later runs the same
+# parsing against those snapshots with no network access.
+# =============================================================================
+
+DEFAULT_FETCH_WORKERS = 8
+DEFAULT_PARSE_WORKERS = max(1, min(8, (os.cpu_count() or 2) - 1))
+
+ExtractionTuple = Tuple[Optional[str], Optional[str], Optional[str], Optional[str], str]
+SnapshotRef = Dict[str, Any]
+# (parse future, html, fetch method, fetch status); html is kept for an in-process retry
+ParseJob = Tuple[Future, Optional[str], str, int]
+
+
+def _done_job(result: ExtractionTuple) -> ParseJob:
+    fut: Future = Future()
+    fut.set_result(result)
+    return fut, None, "", 0
+
+
+_EXTRACTED_FIELDS = ("title", "author", "published_at")
+
+
+def apply_extraction(a: Article, result: ExtractionTuple, *, overwrite: bool = False) -> None:
+    """
+    Merge (title, author, published_iso, text, note) into an article without
+    overwriting better discovery data.
+
+    What extraction filled in (and its note) is remembered in
+    raw["extracted"]. With overwrite=True (re-extraction) those fields are
+    replaced by the new result, as long as they were not changed since, and
+    the previous extraction note is replaced instead of piling up.
+    """
+    title, author, published_iso, text, note = result
+    if not isinstance(a.raw, dict):
+        a.raw = {}
+    prev = a.raw.get("extracted") if isinstance(a.raw.get("extracted"), dict) else {}
+    # fields still holding the value a previous extraction put there
+    owned = {f: prev[f] for f in _EXTRACTED_FIELDS if prev.get(f) and getattr(a, f) == prev[f]}
+
+    def replaceable(field: str) -> bool:
+        current = getattr(a, field)
+        return not current or (overwrite and field in owned)
+
+    for field, value in (("title", title), ("author", author), ("published_at", published_iso)):
+        if value and (replaceable(field) or (field == "title" and a.title == a.url)):
+            setattr(a, field, value)
+            owned[field] = value
+    if text:
+        a.content_text = text
+        a.content_length = len(text)
+
+    prev_note = prev.get("note") or ""
+    if overwrite and prev_note and prev_note in a.extraction_notes:
+        a.extraction_notes.remove(prev_note)
+    if note:
+        a.extraction_notes.append(note)
+    a.raw["extracted"] = dict(owned, note=note or "")
+
+
+class ExtractionPool:
+    def __init__(
+        self,
+        session,
+        *,
+        fetch_workers: int = DEFAULT_FETCH_WORKERS,
+        parse_workers: int = DEFAULT_PARSE_WORKERS,
+        timeout: int = TIMEOUT_DEFAULT,
+        snapshots: Optional[SnapshotStore] = None,
+    ) -> None:
+        self.session = session
+        self.timeout = timeout
+        self.snapshots = snapshots
+        self.fetch_workers = max(1, int(fetch_workers))
+        self.parse_workers = max(0, int(parse_workers))
+        self._fetch_pool = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix="extract-fetch")
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._parse_lock = threading.Lock()
+        if self.parse_workers > 0:
+            try:
+                # spawn: never fork a process that is running Qt / network threads
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=self.parse_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            except Exception:
+                self._parse_pool = None
+
+    @property
+    def uses_processes(self) -> bool:
+        return self._parse_pool is not None
+
+    def close(self) -> None:
+        self._fetch_pool.shutdown(wait=True, cancel_futures=True)
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=True, cancel_futures=True)
+            self._parse_pool = None
+
+    def __enter__(self) -> "ExtractionPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -----------------------
+    # Work
+    # -----------------------
+    def _drop_parse_pool(self, pool: ProcessPoolExecutor) -> None:
+        # worker crashed (or could not spawn): finish the run in-process
+        with self._parse_lock:
+            if self._parse_pool is pool:
+                self._parse_pool = None
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    def _submit_parse(self, html: str, method: str, status: int) -> ParseJob:
+        """
+        Queue html for parsing without waiting for it. Without a process pool
+        the page is parsed right here (in the fetch thread).
+        """
+        pool = self._parse_pool
+        if pool is not None:
+            try:
+                return pool.submit(extract_from_html, html, fetch_method=method, fetch_status=status), html, method, status
+            except BrokenProcessPool:
+                self._drop_parse_pool(pool)
+            except RuntimeError:
+                pass  # pool shut down meanwhile
+        return _done_job(extract_from_html(html, fetch_method=method, fetch_status=status))
+
+    def _await_parse(self, job: ParseJob) -> ExtractionTuple:
+        fut, html, method, status = job
+        try:
+            return fut.result()
+        except BrokenProcessPool:
+            pool = self._parse_pool
+            if pool is not None:
+                self._drop_parse_pool(pool)
+            if html is None:
+                raise
+            return extract_from_html(html, fetch_method=method, fetch_status=status)
+
+    def _one(
+        self,
+        url: str,
+        should_stop: Optional[Callable[[], bool]],
+        page: Optional[PrefetchedPage] = None,
+        session=None,
+        source: str = "",
+    ) -> Optional[Tuple[ParseJob, Optional[SnapshotRef]]]:
+        if should_stop and should_stop():
+            return None
+        if page is not None:
+            html, method, status = page.text(), page.method, page.status
+        else:
+            outcome, html = fetch_article_html(session or self.session, url, timeout=self.timeout, source=source)
+            if not (outcome.ok and html):
+                return _done_job((None, None, None, None, f"fetch failed: {outcome.error or 'unknown'}")), None
+            method, status = outcome.method, outcome.status
+        ref: Optional[SnapshotRef] = None
+        if self.snapshots is not None:
+            try:
+                ref = self.snapshots.put(html, fetch_method=method, fetch_status=status)
+            except Exception:
+                ref = None  # a full disk must not fail the extraction itself
+        if should_stop and should_stop():
+            return None
+        return self._submit_parse(html, method, status), ref
+
+    def _one_snapshot(
+        self, store: SnapshotStore, ref: SnapshotRef, should_stop: Optional[Callable[[], bool]]
+    ) -> Optional[ParseJob]:
+        if should_stop and should_stop():
+            return None
+        html = store.get_ref(ref)
+        if not html:
+            return _done_job((None, None, None, None, f"snapshot missing: {ref.get('sha256', '')[:12]}"))
+        return self._submit_parse(html, str(ref.get("fetch_method") or "snapshot"), int(ref.get("fetch_status") or 0))
+
+    def extract(
+        self,
+        articles: List[Article],
+        *,
+        should_stop: Optional[Callable[[], bool]] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+        prefetched: Optional[Dict[str, PrefetchedPage]] = None,
+        session=None,
+        source: str = "",
+    ) -> int:
+        """
+        Fetch + extract every article in place. progress(done, total) is called
+        from the calling thread. Returns number of articles processed.
+
+        Pages found in prefetched are used instead of fetching (and removed
+        from it, so the caller's cache drains as extraction goes). session
+        overrides the pool's session for this batch (per-source routes);
+        source labels its requests in the fetch telemetry.
+        """
+        total = len(articles)
+        if total == 0:
+            return 0
+
+        futures: List[Tuple[Article, Future]] = [
+            (a, self._fetch_pool.submit(
+                self._one, a.url, should_stop, prefetched.pop(a.url, None) if prefetched else None, session, source
+            ))
+            for a in articles
+        ]
+
+        done = 0
+        for a, fut in futures:
+            try:
+                res = fut.result()
+                if res is not None:
+                    job, ref = res
+                    res = self._await_parse(job), ref
+            except Exception as ex:
+                res = ((None, None, None, None, f"extract failed: {type(ex).__name__}: {ex}"), None)
+            if res is not None:
+                result, ref = res
+                apply_extraction(a, result)
+                if ref is not None:
+                    if not isinstance(a.raw, dict):
+                        a.raw = {}
+                    a.raw["snapshot"] = ref
+                done += 1
+            if progress:
+                progress(done, total)
+        return done
+
+    def reextract(
+        self,
+        articles: List[Article],
+        store: SnapshotStore,
+        *,
+        should_stop: Optional[Callable[[], bool]] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+        overwrite: bool = True,
+    ) -> Tuple[int, int]:
+        """
+        Offline extraction from stored snapshots (no session needed). Articles
+        without raw["snapshot"] are left untouched. With overwrite (default)
+        title / author / published_at that came from the previous extraction
+        are replaced by the new result (see apply_extraction).
+
+        Returns (re-extracted, without_snapshot).
+        """
+        jobs: List[Tuple[Article, Future]] = []
+        missing = 0
+        for a in articles:
+            ref = (a.raw or {}).get("snapshot") if isinstance(a.raw, dict) else None
+            if not isinstance(ref, dict) or not ref.get("sha256"):
+                missing += 1
+                continue
+            jobs.append((a, self._fetch_pool.submit(self._one_snapshot, store, ref, should_stop)))
+
+        total = len(jobs)
+        done = 0
+        for a, fut in jobs:
+            try:
+                job = fut.result()
+                res = self._await_parse(job) if job is not None else None
+            except Exception as ex:
+                res = (None, None, None, None, f"re-extract failed: {type(ex).__name__}: {ex}")
+            if res is not None:
+                apply_extraction(a, res, overwrite=overwrite)
+                a.raw["snapshot"]["reextracted_at"] = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+                done += 1
+            if progress:
+                progress(done, total)
+        return done, missing
@@ -4,14 +4,22 @@ import json
 import random
 import re
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
 import trafilatura
 
+from .host_limiter import HOST_LIMITER, HostUnavailable, host_of
+from .http_pool import DRAIN_MAX_BYTES, curl_session, release
+from .http_stream import ACCEPT_ENCODING, read_body
+from .telemetry import FETCH_TELEMETRY, KIND_ARTICLE, FetchEvent
+
+_UTF8_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
 
 # -----------------------
 # Robust fetch config
@@ -28,21 +36,14 @@ USER_AGENTS = [
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
 ]
 
-try:
-    from curl_cffi import requests as curl_requests  # type: ignore
-    HAS_CURL_CFFI = True
-except Exception:
-    curl_requests = None  # type: ignore
-    HAS_CURL_CFFI = False
-
 
 # -----------------------
 # Fetch primitives
 # -----------------------
 def _rand_headers(url: str) -> Dict[str, str]:
     """
-    Browser-like headers.
-    IMPORTANT: Accept-Encoding=identity helps avoid compressed junk in raw stream.
+    Browser-like headers. Compressed transfer is negotiated (see
+    http_stream.ACCEPT_ENCODING) and decoded while streaming.
     """
     parsed = urlparse(url)
     host = parsed.hostname or ""
@@ -52,7 +53,7 @@ def _rand_headers(url: str) -> Dict[str, str]:
         "User-Agent": random.choice(USER_AGENTS),
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "identity",
+        "Accept-Encoding": ACCEPT_ENCODING,
         "Cache-Control": "no-cache",
         "Pragma": "no-cache",
         "Connection": "keep-alive",
@@ -71,6 +72,26 @@ class FetchOutcome:
     method: str = "requests"  # requests / requests_insecure_tls / curl_cffi
     content_type: str = ""
     content_encoding: str = ""
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+    attempts: int = 0
+    ttfb_ms: float = 0.0      # request sent -> headers of the final response
+    route: str = ""
+
+
+@dataclass
+class PrefetchedPage:
+    """
+    Page body already downloaded elsewhere (e.g. while sniffing its date during
+    discovery), handed to extraction so it is not fetched twice.
+    """
+    data: bytes
+    content_type: str = ""
+    method: str = "requests"
+    status: int = 200
+
+    def text(self) -> str:
+        return _decode_html_bytes(self.data, self.content_type)
 
 
 _TEXTLIKE_CT_RE = re.compile(
@@ -148,112 +169,147 @@ def _looks_like_block_page(html: str) -> bool:
     return any(x in h for x in signals)
 
 
-def _fetch_html(session, url: str, timeout: int) -> Tuple[FetchOutcome, Optional[str]]:
+def _html_inspector(content_type: str):
+    def inspect(head: bytes) -> Optional[str]:
+        if not _content_type_is_textlike(content_type) and _looks_binary(head):
+            return f"non-text response: Content-Type={content_type}"
+        return None
+    return inspect
+
+
+def _read_html_response(r, *, url: str, method: str) -> Tuple[FetchOutcome, Optional[str]]:
+    """
+    Stream the body of an OK response: abort after the first chunk on binary
+    payloads, stop at </html>, never hold more than MAX_FETCH_BYTES.
+    """
+    status = r.status_code
+    ctype = (r.headers.get("Content-Type") or "").strip()
+    cenc = (r.headers.get("Content-Encoding") or "").strip()
+    final_url = str(getattr(r, "url", url) or url)
+
+    body = read_body(r, max_bytes=MAX_FETCH_BYTES, inspect=_html_inspector(ctype), stop_at_html_end=True)
+    outcome = FetchOutcome(
+        ok=False,
+        status=status,
+        final_url=final_url,
+        method=method,
+        content_type=ctype,
+        content_encoding=cenc,
+        wire_bytes=body.wire_bytes,
+        decoded_bytes=body.decoded_bytes,
+        ttfb_ms=body.latency_s * 1000.0,
+        route=body.route,
+    )
+    if body.aborted:
+        outcome.error = body.aborted
+        return outcome, None
+    if not body.data:
+        outcome.error = "empty response body"
+        return outcome, None
+
+    outcome.ok = True
+    return outcome, _decode_html_bytes(body.data, ctype)
+
+
+def _fetch_html(session, url: str, timeout: int, source: str = "") -> Tuple[FetchOutcome, Optional[str]]:
+    """
+    Retrying article fetch, recorded in FETCH_TELEMETRY while a run is active.
+    """
+    t0 = time.perf_counter()
+    outcome, html = _fetch_html_retrying(session, url, timeout)
+    if FETCH_TELEMETRY.active:
+        FETCH_TELEMETRY.record(FetchEvent(
+            kind=KIND_ARTICLE,
+            source=source,
+            host=host_of(url),
+            url=url,
+            method=outcome.method,
+            ok=outcome.ok,
+            status=outcome.status,
+            error=outcome.error or "",
+            attempts=outcome.attempts,
+            ttfb_ms=outcome.ttfb_ms,
+            total_ms=(time.perf_counter() - t0) * 1000.0,
+            wire_bytes=outcome.wire_bytes,
+            decoded_bytes=outcome.decoded_bytes,
+            route=outcome.route,
+        ))
+    return outcome, html
+
+
+def _fetch_html_retrying(session, url: str, timeout: int) -> Tuple[FetchOutcome, Optional[str]]:
     last_err: Optional[str] = None
     insecure_tls_used = False
+    host = host_of(url)
+    attempt = 0
+
+    def done(outcome: FetchOutcome, html: Optional[str]):
+        outcome.attempts = attempt
+        return outcome, html
 
     for attempt in range(1, RETRIES + 1):
+        try:
+            HOST_LIMITER.acquire(host)
+        except HostUnavailable as ex:
+            # shared per-host circuit is open / throttled: fail fast
+            return done(FetchOutcome(ok=False, error=str(ex), method="requests"), None)
+
         try:
             headers = _rand_headers(url)
-            r = session.get(
-                url,
-                headers=headers,
-                timeout=timeout,
-                allow_redirects=True,
-                stream=True,
-            )
+            try:
+                r = session.get(
+                    url,
+                    headers=headers,
+                    timeout=timeout,
+                    allow_redirects=True,
+                    stream=True,
+                )
+            except Exception as ex:
+                if not ("SSLError" in type(ex).__name__ or "CERTIFICATE" in str(ex).upper()):
+                    HOST_LIMITER.record(host, error=f"{type(ex).__name__}: {ex}")
+                raise
             status = r.status_code
-            ctype = (r.headers.get("Content-Type") or "").strip()
-            cenc = (r.headers.get("Content-Encoding") or "").strip()
-            final_url = getattr(r, "url", url)
+            HOST_LIMITER.record(host, status=status, retry_after=r.headers.get("Retry-After"), url=url)
 
-            if status in (403, 429) and HAS_CURL_CFFI and curl_requests is not None:
+            # 403: retry with a browser TLS fingerprint (429 is a rate limit: back off instead)
+            cs = curl_session(getattr(session, "proxies", None) or None) if status == 403 else None
+            if cs is not None:
+                release(r, drain_limit=DRAIN_MAX_BYTES)
                 try:
-                    rr = curl_requests.get(
+                    HOST_LIMITER.acquire(host)
+                    rr = cs.get(
                         url,
-                        headers=headers,
+                        # let the impersonated browser negotiate encodings (curl decodes them)
+                        headers={k: v for k, v in headers.items() if k != "Accept-Encoding"},
                         timeout=timeout,
                         allow_redirects=True,
-                        impersonate="chrome",
-                        proxies=session.proxies if getattr(session, "proxies", None) else None,
+                        stream=True,
                     )
-                    ctype2 = (rr.headers.get("Content-Type") or "").strip()
-                    cenc2 = (rr.headers.get("Content-Encoding") or "").strip()
-                    raw2 = rr.content[:MAX_FETCH_BYTES]
-
-                    if not _content_type_is_textlike(ctype2) and _looks_binary(raw2):
-                        return (
-                            FetchOutcome(
-                                ok=False,
-                                status=rr.status_code,
-                                final_url=str(getattr(rr, "url", url)),
-                                method="curl_cffi",
-                                content_type=ctype2,
-                                content_encoding=cenc2,
-                                error=f"non-text response: Content-Type={ctype2}",
-                            ),
-                            None,
-                        )
-
-                    html2 = _decode_html_bytes(raw2, ctype2)
-                    if 200 <= rr.status_code < 400 and html2:
-                        return (
-                            FetchOutcome(
-                                ok=True,
-                                status=rr.status_code,
-                                final_url=str(getattr(rr, "url", url)),
-                                method="curl_cffi",
-                                content_type=ctype2,
-                                content_encoding=cenc2,
-                            ),
-                            html2,
-                        )
-                    last_err = f"curl_cffi HTTP {rr.status_code}"
+                    HOST_LIMITER.record(host, status=rr.status_code, retry_after=rr.headers.get("Retry-After"), url=url)
+                    if 200 <= rr.status_code < 400:
+                        outcome2, html2 = _read_html_response(rr, url=url, method="curl_cffi")
+                        if outcome2.ok or outcome2.error != "empty response body":
+                            return done(outcome2, html2)
+                        last_err = "curl_cffi empty response body"
+                    else:
+                        release(rr, drain_limit=DRAIN_MAX_BYTES)
+                        last_err = f"curl_cffi HTTP {rr.status_code}"
                 except Exception as ex2:
                     last_err = f"curl_cffi failed: {type(ex2).__name__}: {ex2}"
 
             if not (200 <= status < 400):
+                release(r, drain_limit=DRAIN_MAX_BYTES)
+                if status == 403:
+                    # forbidden stays forbidden: retrying only adds failures for the host
+                    return done(FetchOutcome(ok=False, status=status, error=last_err or f"HTTP {status}"), None)
                 last_err = f"HTTP {status}"
                 raise RuntimeError(last_err)
 
-            # CRITICAL FIX: decode compressed payload when reading raw
-            if getattr(r, "raw", None) is not None:
-                try:
-                    r.raw.decode_content = True  # type: ignore[attr-defined]
-                except Exception:
-                    pass
-
-            raw = r.raw.read(MAX_FETCH_BYTES) if getattr(r, "raw", None) else (r.content[:MAX_FETCH_BYTES])
-            if not raw:
-                last_err = "empty response body"
-                raise RuntimeError(last_err)
-
-            if not _content_type_is_textlike(ctype) and _looks_binary(raw):
-                return (
-                    FetchOutcome(
-                        ok=False,
-                        status=status,
-                        final_url=final_url,
-                        method="requests",
-                        content_type=ctype,
-                        content_encoding=cenc,
-                        error=f"non-text response: Content-Type={ctype}",
-                    ),
-                    None,
-                )
-
-            html = _decode_html_bytes(raw, ctype)
-            return (
-                FetchOutcome(
-                    ok=True,
-                    status=status,
-                    final_url=final_url,
-                    method="requests",
-                    content_type=ctype,
-                    content_encoding=cenc,
-                ),
-                html,
-            )
+            outcome, html = _read_html_response(r, url=url, method="requests")
+            if outcome.ok or outcome.error != "empty response body":
+                return done(outcome, html)
+            last_err = outcome.error
+            raise RuntimeError(last_err)
 
         except Exception as ex:
             if ("SSLError" in type(ex).__name__ or "CERTIFICATE" in str(ex).upper()) and not insecure_tls_used:
@@ -269,51 +325,17 @@ def _fetch_html(session, url: str, timeout: int) -> Tuple[FetchOutcome, Optional
                         stream=True,
                     )
                     status = r.status_code
-                    ctype = (r.headers.get("Content-Type") or "").strip()
-                    cenc = (r.headers.get("Content-Encoding") or "").strip()
-                    final_url = getattr(r, "url", url)
-
+                    HOST_LIMITER.record(host, status=status, retry_after=r.headers.get("Retry-After"), url=url)
                     if not (200 <= status < 400):
+                        release(r, drain_limit=DRAIN_MAX_BYTES)
                         last_err = f"HTTP {status}"
                         raise RuntimeError(last_err)
 
-                    if getattr(r, "raw", None) is not None:
-                        try:
-                            r.raw.decode_content = True  # type: ignore[attr-defined]
-                        except Exception:
-                            pass
-
-                    raw = r.raw.read(MAX_FETCH_BYTES) if getattr(r, "raw", None) else (r.content[:MAX_FETCH_BYTES])
-                    if not raw:
-                        last_err = "empty response body"
-                        raise RuntimeError(last_err)
-
-                    if not _content_type_is_textlike(ctype) and _looks_binary(raw):
-                        return (
-                            FetchOutcome(
-                                ok=False,
-                                status=status,
-                                final_url=final_url,
-                                method="requests_insecure_tls",
-                                content_type=ctype,
-                                content_encoding=cenc,
-                                error=f"non-text response: Content-Type={ctype}",
-                            ),
-                            None,
-                        )
-
-                    html = _decode_html_bytes(raw, ctype)
-                    return (
-                        FetchOutcome(
-                            ok=True,
-                            status=status,
-                            final_url=final_url,
-                            method="requests_insecure_tls",
-                            content_type=ctype,
-                            content_encoding=cenc,
-                        ),
-                        html,
-                    )
+                    outcome, html = _read_html_response(r, url=url, method="requests_insecure_tls")
+                    if outcome.ok or outcome.error != "empty response body":
+                        return done(outcome, html)
+                    last_err = outcome.error
+                    raise RuntimeError(last_err)
                 except Exception as ex2:
                     last_err = f"insecure TLS fetch failed: {type(ex2).__name__}: {ex2}"
             else:
@@ -321,7 +343,7 @@ def _fetch_html(session, url: str, timeout: int) -> Tuple[FetchOutcome, Optional
 
         time.sleep((BACKOFF_BASE ** attempt) + random.random() * 0.25)
 
-    return FetchOutcome(ok=False, error=last_err, method="requests"), None
+    return done(FetchOutcome(ok=False, error=last_err, method="requests"), None)
 
 
 # -----------------------
@@ -364,33 +386,98 @@ def _clean_author(s: str) -> str:
     return s
 
 
-def _extract_meta(soup: BeautifulSoup) -> Dict[str, str]:
-    meta: Dict[str, str] = {}
-    for m in soup.find_all("meta"):
-        k = m.get("property") or m.get("name") or ""
-        v = m.get("content") or ""
-        k = (k or "").strip()
-        v = (v or "").strip()
-        if k and v and k not in meta:
-            meta[k] = v
-    return meta
+@dataclass
+class HeadScan:
+    """
+    Everything the metadata fallbacks need, collected in one tree walk.
+    """
+    title: str = ""
+    og_title: str = ""
+    meta: Dict[str, str] = field(default_factory=dict)
+    jsonld: List[Dict[str, Any]] = field(default_factory=list)
+    next_data: Optional[Dict[str, Any]] = None
 
 
-def _extract_jsonld_objects(soup: BeautifulSoup) -> List[Dict[str, Any]]:
-    objs: List[Dict[str, Any]] = []
-    for tag in soup.find_all("script", type=re.compile(r"ld\+json", re.I)):
-        txt = tag.get_text(strip=True) or ""
-        if not txt:
-            continue
+_LDJSON_RE = re.compile(r"ld\+json", re.I)
+
+
+def _parse_html_tree(html: str):
+    """
+    Parse once with lxml. Returns None if the document cannot be parsed.
+    """
+    try:
+        return lxml_html.document_fromstring(html)
+    except ValueError:
+        # str input with an XML encoding declaration
         try:
-            j = json.loads(txt)
-            if isinstance(j, dict):
-                objs.append(j)
-            elif isinstance(j, list):
-                objs.extend([x for x in j if isinstance(x, dict)])
+            return lxml_html.document_fromstring(html.encode("utf-8", errors="ignore"), parser=_UTF8_PARSER)
         except Exception:
-            continue
-    return objs
+            return None
+    except Exception:
+        return None
+
+
+def _scan_tree(tree) -> HeadScan:
+    """
+    Single pass over <title>, <meta> and <script> elements.
+    """
+    scan = HeadScan()
+    for el in tree.iter("title", "meta", "script"):
+        tag = el.tag
+        if tag == "meta":
+            k = (el.get("property") or el.get("name") or "").strip()
+            v = (el.get("content") or "").strip()
+            if k and v and k not in scan.meta:
+                scan.meta[k] = v
+            if k == "og:title" and el.get("property") == "og:title" and not scan.og_title:
+                scan.og_title = v
+        elif tag == "title":
+            if not scan.title:
+                scan.title = el.text_content() or ""
+        else:
+            if _LDJSON_RE.search(el.get("type") or ""):
+                txt = (el.text or "").strip()
+                if not txt:
+                    continue
+                try:
+                    j = json.loads(txt)
+                except Exception:
+                    continue
+                if isinstance(j, dict):
+                    scan.jsonld.append(j)
+                elif isinstance(j, list):
+                    scan.jsonld.extend([x for x in j if isinstance(x, dict)])
+            elif el.get("id") == "__NEXT_DATA__" and scan.next_data is None:
+                txt = (el.text or "").strip()
+                if not txt:
+                    continue
+                try:
+                    j = json.loads(txt)
+                except Exception:
+                    continue
+                if isinstance(j, dict):
+                    scan.next_data = j
+    return scan
+
+
+def _doc_field(doc: Any, name: str) -> Any:
+    """
+    trafilatura 2.x returns a Document, 1.x a dict.
+    """
+    if doc is None:
+        return None
+    if isinstance(doc, dict):
+        return doc.get(name)
+    return getattr(doc, name, None)
+
+
+def _trafilatura_bare(tree) -> Any:
+    kwargs = dict(include_comments=False, include_tables=False, with_metadata=True)
+    try:
+        return trafilatura.bare_extraction(tree, **kwargs)
+    except TypeError:
+        kwargs.pop("with_metadata")
+        return trafilatura.bare_extraction(tree, **kwargs)
 
 
 def _normalize_any_date_to_iso(s: Optional[str]) -> Optional[str]:
@@ -479,51 +566,58 @@ def _deep_find_text_fields(obj: Any, keys: List[str], max_hits: int = 8) -> List
     return out
 
 
-def _extract_next_data(soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
+_FALLBACK_XPATHS = [
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' article-body ')]",
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' story-body ')]",
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' story ')]",
+    "//div[@id='story']",
+    "//div[@id='article']",
+    "//div[@itemprop='articleBody']",
+    "//section[contains(concat(' ', normalize-space(@class), ' '), ' article ')]",
+    "//main",
+]
+
+
+# Elements whose text is code or markup rather than prose.
+_NON_TEXT_TAGS = frozenset(("script", "style", "noscript", "template"))
+
+
+def _iter_visible_text(node):
     """
-    Parse Next.js __NEXT_DATA__ if present.
+    node.itertext() minus the bodies of _NON_TEXT_TAGS (their tails are kept).
     """
-    tag = soup.find("script", id="__NEXT_DATA__")
-    if not tag:
-        return None
-    txt = tag.get_text(strip=True) or ""
-    if not txt:
-        return None
-    try:
-        j = json.loads(txt)
-        if isinstance(j, dict):
-            return j
-    except Exception:
-        return None
-    return None
+    walker = etree.iterwalk(node, events=("start", "end", "comment", "pi"))
+    for event, el in walker:
+        if event == "start":
+            if el.tag in _NON_TEXT_TAGS:
+                walker.skip_subtree()
+            elif el.text:
+                yield el.text
+        elif el is not node and el.tail:
+            yield el.tail
+
+
+def _node_text(node) -> str:
+    return _clean_text(" ".join(t.strip() for t in _iter_visible_text(node) if t and t.strip()))
 
 
-def _extract_article_text_fallback(soup: BeautifulSoup) -> str:
-    art = soup.find("article")
-    if art:
-        txt = _clean_text(art.get_text(" ", strip=True))
+def _extract_article_text_fallback(tree) -> str:
+    for art in tree.iter("article"):
+        txt = _node_text(art)
         if len(txt) > 200:
             return txt
+        break
 
-    for sel in [
-        "div.article-body",
-        "div.story-body",
-        "div.story",
-        "div#story",
-        "div#article",
-        "div[itemprop='articleBody']",
-        "section.article",
-        "main",
-    ]:
-        node = soup.select_one(sel)
-        if node:
-            txt = _clean_text(node.get_text(" ", strip=True))
+    for xp in _FALLBACK_XPATHS:
+        nodes = tree.xpath(xp)
+        if nodes:
+            txt = _node_text(nodes[0])
             if len(txt) > 200:
                 return txt
 
     paras = []
-    for p in soup.find_all("p"):
-        t = _clean_text(p.get_text(" ", strip=True))
+    for p in tree.iter("p"):
+        t = _node_text(p)
         if len(t) >= 40:
             paras.append(t)
     return _clean_text(" ".join(paras))
@@ -532,6 +626,16 @@ def _extract_article_text_fallback(soup: BeautifulSoup) -> str:
 # -----------------------
 # Public API
 # -----------------------
+def fetch_article_html(
+    session, url: str, timeout: int = TIMEOUT_DEFAULT, source: str = ""
+) -> Tuple[FetchOutcome, Optional[str]]:
+    """
+    Network half of extraction: fetch and decode the article page. source
+    labels the request in the run's fetch telemetry.
+    """
+    return _fetch_html(session, url, timeout=timeout, source=source)
+
+
 def extract_article_metadata_and_text(
     session,
     url: str,
@@ -540,58 +644,67 @@ def extract_article_metadata_and_text(
     """
     Returns: (title, author, published_date_iso, text, note)
     """
-    outcome, html = _fetch_html(session, url, timeout=timeout)
+    outcome, html = fetch_article_html(session, url, timeout=timeout)
     if not (outcome.ok and html):
         return None, None, None, None, f"fetch failed: {outcome.error or 'unknown'}"
+    return extract_from_html(html, fetch_method=outcome.method, fetch_status=outcome.status)
+
+
+def extract_from_html(
+    html: str,
+    *,
+    fetch_method: str = "",
+    fetch_status: int = 0,
+) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str], str]:
+    """
+    CPU half of extraction (trafilatura + meta/JSON-LD/DOM fallbacks). No network access and
+    only picklable arguments, so it can run in a worker process.
 
+    Returns: (title, author, published_date_iso, text, note)
+    """
     notes: List[str] = []
     if _looks_like_block_page(html):
         # IMPORTANT CHANGE: no early return — keep a warning but still extract.
-        notes.append(f"possible botwall content (fetch={outcome.method}, status={outcome.status})")
+        notes.append(f"possible botwall content (fetch={fetch_method}, status={fetch_status})")
 
     title: Optional[str] = None
     author: Optional[str] = None
     published_iso: Optional[str] = None
     text: Optional[str] = None
 
-    # 1) trafilatura text + metadata
+    # Parse once; every step below reads this tree.
+    tree = _parse_html_tree(html)
+    if tree is None:
+        return None, None, None, None, "html parse failed"
+
+    # 1) title/meta/JSON-LD/__NEXT_DATA__ in one walk, before trafilatura
+    #    prunes anything
+    scan = _scan_tree(tree)
+
+    # 2) trafilatura text + metadata (one call on the shared tree)
     try:
-        t = trafilatura.extract(
-            html,
-            include_comments=False,
-            include_tables=False,
-            no_fallback=False,
-        )
+        doc = _trafilatura_bare(tree)
+        t = _doc_field(doc, "text")
         if t and t.strip():
             text = t.strip()
-
-        try:
-            meta_obj = trafilatura.metadata.extract_metadata(html)
-            if meta_obj:
-                if meta_obj.title and not title:
-                    title = _clean_title(str(meta_obj.title))
-                if meta_obj.author and not author:
-                    author = _clean_author(str(meta_obj.author))
-                if meta_obj.date and not published_iso:
-                    published_iso = _normalize_any_date_to_iso(str(meta_obj.date))
-        except Exception:
-            pass
-
+        mt, ma, md = _doc_field(doc, "title"), _doc_field(doc, "author"), _doc_field(doc, "date")
+        if mt:
+            title = _clean_title(str(mt))
+        if ma:
+            author = _clean_author(str(ma))
+        if md:
+            published_iso = _normalize_any_date_to_iso(str(md))
     except Exception:
         pass
 
-    # 2) soup + JSON-LD + Next.js fallback
+    # 3) meta / JSON-LD / Next.js fallbacks from the scan
     try:
-        soup = BeautifulSoup(html, "lxml")
-
-        if soup.title and soup.title.text:
-            title = _clean_title(soup.title.text) or title
+        if scan.title:
+            title = _clean_title(scan.title) or title
+        if scan.og_title:
+            title = _clean_title(scan.og_title) or title
 
-        og_title = soup.find("meta", property="og:title")
-        if og_title and og_title.get("content"):
-            title = _clean_title(og_title.get("content", "")) or title
-
-        meta = _extract_meta(soup)
+        meta = scan.meta
 
         # published date
         if not published_iso:
@@ -613,7 +726,7 @@ def extract_article_metadata_and_text(
                 author = _clean_author(raw_author)
 
         # JSON-LD Article / NewsArticle
-        jsonld_objs = _extract_jsonld_objects(soup)
+        jsonld_objs = scan.jsonld
         if jsonld_objs:
             if not published_iso:
                 for obj in jsonld_objs:
@@ -649,45 +762,43 @@ def extract_article_metadata_and_text(
                         break
 
         # Next.js __NEXT_DATA__
-        if (not text) or len(text) < 200:
-            next_data = _extract_next_data(soup)
-            if next_data:
-                # Search for likely content fields
-                candidates = _deep_find_text_fields(
-                    next_data,
-                    keys=[
-                        "articlebody",
-                        "body",
-                        "content",
-                        "text",
-                        "description",
-                        "html",
-                        "longdescription",
-                        "story",
-                        "storybody",
-                        "maincontent",
-                    ],
-                    max_hits=6,
-                )
-                best = ""
-                for c in candidates:
-                    if len(c) > len(best):
-                        best = c
-                if best and len(best) >= 250:
-                    text = best
-                    notes.append("text from __NEXT_DATA__ (deep search)")
-
-        # As a last resort: visible DOM scrape
+        if ((not text) or len(text) < 200) and scan.next_data:
+            # Search for likely content fields
+            candidates = _deep_find_text_fields(
+                scan.next_data,
+                keys=[
+                    "articlebody",
+                    "body",
+                    "content",
+                    "text",
+                    "description",
+                    "html",
+                    "longdescription",
+                    "story",
+                    "storybody",
+                    "maincontent",
+                ],
+                max_hits=6,
+            )
+            best = ""
+            for c in candidates:
+                if len(c) > len(best):
+                    best = c
+            if best and len(best) >= 250:
+                text = best
+                notes.append("text from __NEXT_DATA__ (deep search)")
+
+        # As a last resort: visible DOM scrape (only walks the tree when needed)
         if not text or len(text) < 200:
-            fallback = _extract_article_text_fallback(soup)
+            fallback = _extract_article_text_fallback(tree)
             if fallback and len(fallback) > 120:
                 text = fallback
                 notes.append("text from DOM fallback")
 
     except Exception as ex:
         if text:
-            return title, author, published_iso, text, "; ".join(notes + [f"ok (trafilatura only; fetch={outcome.method})"])
-        return None, None, None, None, f"soup parse failed: {type(ex).__name__}: {ex}"
+            return title, author, published_iso, text, "; ".join(notes + [f"ok (trafilatura only; fetch={fetch_method})"])
+        return None, None, None, None, f"html parse failed: {type(ex).__name__}: {ex}"
 
     if title:
         title = _clean_title(title)
@@ -696,7 +807,7 @@ def extract_article_metadata_and_text(
 
     # Final note
     if text and len(text) > 80:
-        return title, author, published_iso, text, "; ".join(notes + [f"ok (fetch={outcome.method}, status={outcome.status})"])
+        return title, author, published_iso, text, "; ".join(notes + [f"ok (fetch={fetch_method}, status={fetch_status})"])
 
     # If we got here: no usable text
     sniff = _sniff_text(html)
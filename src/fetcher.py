@@ -1,18 +1,33 @@
 from __future__ import annotations
 
 import hashlib
+import html as html_lib
+import io
 import random
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, nullcontext
 from dataclasses import dataclass
-from datetime import date, datetime, timezone
-from typing import Dict, List, Optional, Set, Tuple
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Generic, Iterator, List, Optional, Set, Tuple, TypeVar
 from urllib.parse import urljoin, urlparse
 
 import requests
 from bs4 import BeautifulSoup
+from lxml import etree
 
+from .endpoint_health import STATUS_FAILING, STATUS_PARTIAL, STATUS_WORKING, EndpointHealthStore
+from .host_limiter import HOST_LIMITER, HostUnavailable, host_of
+from .extractor import PrefetchedPage
+from .http_pool import DRAIN_MAX_BYTES, HAS_CURL_CFFI, curl_session, release
+from .http_stream import ACCEPT_ENCODING, SNIFF_BYTES, BodyRead, Inspector, read_body
 from .models import Article, Source
+from .profiling import STAGE_DATE_SNIFF, RunProfiler, StageTimer
+from .routing import RouteSessions, route_for
+from .telemetry import FETCH_TELEMETRY, KIND_DISCOVERY, FetchEvent
+from .url_dates import UrlDatePatternStore
 
 
 # -----------------------
@@ -66,17 +81,6 @@ FETCH_MODE_ON_DATE = "ON_DATE"
 FETCH_MODE_DATE_RANGE = "DATE_RANGE"
 
 
-# -----------------------
-# Optional: better WAF bypass
-# -----------------------
-try:
-    from curl_cffi import requests as curl_requests  # type: ignore
-    HAS_CURL_CFFI = True
-except Exception:
-    curl_requests = None  # type: ignore
-    HAS_CURL_CFFI = False
-
-
 # -----------------------
 # Utilities
 # -----------------------
@@ -154,13 +158,15 @@ def _article_id(source_slug: str, url: str, published_at: Optional[str]) -> str:
 
 def rand_headers(referer: Optional[str] = None) -> Dict[str, str]:
     """
-    CRITICAL: Accept-Encoding identity to reduce compressed payload surprises.
+    Browser-like headers. Accept-Encoding lists only codecs urllib3 can decode
+    here (gzip/deflate, plus br/zstd if installed); bodies are decoded while
+    streaming in http_stream.read_body.
     """
     h = {
         "User-Agent": random.choice(USER_AGENTS),
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "identity",
+        "Accept-Encoding": ACCEPT_ENCODING,
         "Cache-Control": "no-cache",
         "Pragma": "no-cache",
         "Connection": "keep-alive",
@@ -219,6 +225,47 @@ def _ctype_is_xmlish(ctype: str) -> bool:
     return ("xml" in cl) or ("rss" in cl) or ("atom" in cl)
 
 
+_BINARY_CTYPES = {
+    "application/pdf",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/octet-stream",
+    "application/msword",
+}
+
+
+def _ctype_is_binary(ctype: str) -> bool:
+    ct = (ctype or "").split(";", 1)[0].strip().lower()
+    return ct.startswith(("image/", "audio/", "video/", "font/")) or ct in _BINARY_CTYPES
+
+
+_FEED_ROOT_RE = re.compile(rb"<(rss|feed|urlset|sitemapindex|rdf:RDF)[\s>]", re.I)
+
+
+# extra head inspectors (date sniffing) look at most this far, or up to </head>
+HEAD_SNIFF_BYTES = 64 * 1024
+_HEAD_END = b"</head"
+
+
+def _head_inspector(ctype: str, expect: str):
+    """
+    Decide from the first chunk whether the rest of the body is worth pulling.
+    """
+    def inspect(head: bytes) -> Optional[str]:
+        markup = _looks_like_xml(head) or _looks_like_html(head)
+        if not markup and (b"\x00" in head[:2000] or _ctype_is_binary(ctype)):
+            return f"non-text response: Content-Type={ctype or '-'}"
+        if (
+            expect == "xml"
+            and not (_ctype_is_xmlish(ctype) or _looks_like_xml(head) or _FEED_ROOT_RE.search(head))
+            and _looks_like_html(head)
+        ):
+            return "Expected XML but received HTML/blocked page"
+        return None
+    return inspect
+
+
 # -----------------------
 # Smart HTTP client
 # -----------------------
@@ -230,6 +277,13 @@ class FetchResult:
     content_type: str = ""
     insecure_tls_used: bool = False
     sniff: str = ""
+    content_encoding: str = ""
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+    method: str = "requests"  # requests / requests_insecure_tls / curl_cffi
+    attempts: int = 0
+    ttfb_ms: float = 0.0      # request sent -> headers of the final response
+    route: str = ""
 
 
 class SmartHTTP:
@@ -239,122 +293,212 @@ class SmartHTTP:
     - rotating headers
     - optional curl_cffi fallback
     - uses provided requests.Session (already Tor-proxied in your app)
-
-    CRITICAL FIX:
-    - when stream=True, set r.raw.decode_content=True before reading.
+    - streamed body: aborts after the first chunk on binary / wrong-type
+      payloads and stops HTML pages at </html> (see http_stream.read_body)
+    - every request goes through the shared per-host limiter / circuit
+      breaker (host_limiter.HOST_LIMITER); open hosts fail fast
+    - every get() is recorded in FETCH_TELEMETRY under `source` while a run
+      is active (see telemetry.py)
     """
-    def __init__(self, sess: requests.Session) -> None:
+    def __init__(self, sess: requests.Session, source: str = "") -> None:
         self.sess = sess
+        self.source = source
+
+    def _read(self, r, expect: str, inspect: Optional[Inspector] = None) -> Tuple[BodyRead, Dict[str, str]]:
+        """
+        Stream the body; returns (body, headers). On abort, body.data is only
+        the sniffed head. An extra inspect() sees the document head (up to
+        </head>, at most HEAD_SNIFF_BYTES) after the standard checks.
+        """
+        ctype = (r.headers.get("Content-Type") or "").strip()
+        hdr = {k.lower(): v for k, v in r.headers.items()}
+        check = _head_inspector(ctype, expect)
+        if inspect is not None:
+            base = check
+
+            def check(head: bytes) -> Optional[str]:
+                return base(head) or inspect(head)
+
+        body = read_body(
+            r,
+            max_bytes=MAX_FETCH_BYTES,
+            inspect=check,
+            sniff_bytes=HEAD_SNIFF_BYTES if inspect is not None else SNIFF_BYTES,
+            sniff_until=_HEAD_END if inspect is not None else None,
+            # feeds may carry literal </html> inside CDATA: only cut real HTML pages
+            stop_at_html_end=(expect != "xml" and "html" in ctype.lower()),
+        )
+        return body, hdr
+
+    @staticmethod
+    def _result(
+        status: int,
+        ctype: str,
+        body: BodyRead,
+        *,
+        ok: bool = True,
+        insecure_tls_used: bool = False,
+        method: str = "requests",
+    ) -> FetchResult:
+        return FetchResult(
+            ok=ok and not body.aborted,
+            status=status,
+            error=body.aborted or None,
+            content_type=ctype,
+            insecure_tls_used=insecure_tls_used,
+            sniff=_sniff_text(body.data),
+            content_encoding=body.content_encoding,
+            wire_bytes=body.wire_bytes,
+            decoded_bytes=body.decoded_bytes,
+            method="requests_insecure_tls" if insecure_tls_used else method,
+            ttfb_ms=body.latency_s * 1000.0,
+            route=body.route,
+        )
 
     def _curl_cffi_get(
         self,
         url: str,
         allow_redirects: bool,
         referer: Optional[str],
+        expect: str = "any",
+        inspect: Optional[Inspector] = None,
     ) -> Tuple[FetchResult, Optional[bytes], Dict[str, str]]:
-        if not (HAS_CURL_CFFI and curl_requests is not None):
+        cs = curl_session(self.sess.proxies or None)
+        if cs is None:
             return FetchResult(ok=False, error="curl_cffi not available"), None, {}
 
+        host = host_of(url)
+        try:
+            HOST_LIMITER.acquire(host)
+        except HostUnavailable as ex:
+            return FetchResult(ok=False, error=str(ex)), None, {}
+
         hdrs = rand_headers(referer=referer)
-        rr = curl_requests.get(
-            url,
-            headers=hdrs,
-            timeout=TIMEOUT,
-            allow_redirects=allow_redirects,
-            impersonate="chrome",
-            proxies=self.sess.proxies if self.sess.proxies else None,
-        )
+        hdrs.pop("Accept-Encoding", None)  # let the impersonated browser negotiate (curl decodes)
+        try:
+            rr = cs.get(
+                url,
+                headers=hdrs,
+                timeout=TIMEOUT,
+                allow_redirects=allow_redirects,
+                stream=True,
+            )
+        except Exception as ex:
+            HOST_LIMITER.record(host, error=f"{type(ex).__name__}: {ex}")
+            raise
+        HOST_LIMITER.record(host, status=rr.status_code, retry_after=rr.headers.get("Retry-After"), url=url)
         ctype2 = (rr.headers.get("Content-Type") or "").strip()
-        data2 = rr.content[:MAX_FETCH_BYTES]
-        fr2 = FetchResult(
-            ok=(200 <= rr.status_code < 400),
-            status=rr.status_code,
-            content_type=ctype2,
-            sniff=_sniff_text(data2),
-        )
-        hdr2 = {k.lower(): v for k, v in rr.headers.items()}
-        return fr2, data2, hdr2
+        body, hdr2 = self._read(rr, expect, inspect)
+        fr2 = self._result(rr.status_code, ctype2, body, ok=(200 <= rr.status_code < 400), method="curl_cffi")
+        return fr2, body.data, hdr2
 
     def get(
         self,
         url: str,
         allow_redirects: bool = True,
         expect: str = "any",  # "any" | "xml"
+        inspect: Optional[Inspector] = None,  # extra head check, may abort (see _read)
     ) -> Tuple[FetchResult, Optional[bytes], Dict[str, str]]:
         url = normalize_url(url)
+        t0 = time.perf_counter()
+        fr, data, hdr = self._get(url, allow_redirects, expect, inspect)
+        if FETCH_TELEMETRY.active:
+            FETCH_TELEMETRY.record(FetchEvent(
+                kind=KIND_DISCOVERY,
+                source=self.source,
+                host=host_of(url),
+                url=url,
+                method=fr.method,
+                ok=fr.ok,
+                status=fr.status,
+                error=fr.error or "",
+                attempts=fr.attempts,
+                ttfb_ms=fr.ttfb_ms,
+                total_ms=(time.perf_counter() - t0) * 1000.0,
+                wire_bytes=fr.wire_bytes,
+                decoded_bytes=fr.decoded_bytes,
+                route=fr.route,
+            ))
+        return fr, data, hdr
+
+    def _get(
+        self,
+        url: str,
+        allow_redirects: bool,
+        expect: str,
+        inspect: Optional[Inspector],
+    ) -> Tuple[FetchResult, Optional[bytes], Dict[str, str]]:
         parsed = urlparse(url)
         host = parsed.hostname or ""
         referer = f"{parsed.scheme}://{host}/" if host else None
+        limiter_host = host.lower()
 
         last_err: Optional[str] = None
         insecure_used = False
+        attempt = 0
+
+        def done(fr: FetchResult, data: Optional[bytes], hdr: Dict[str, str]):
+            fr.attempts = attempt
+            return fr, data, hdr
 
         for attempt in range(1, RETRIES + 1):
+            try:
+                HOST_LIMITER.acquire(limiter_host)
+            except HostUnavailable as ex:
+                # open circuit / long Retry-After: fail fast, no retries
+                return done(FetchResult(ok=False, error=str(ex), insecure_tls_used=insecure_used), None, {})
+
             try:
                 h = rand_headers(referer=referer)
-                r = self.sess.get(
-                    url,
-                    headers=h,
-                    timeout=TIMEOUT,
-                    allow_redirects=allow_redirects,
-                    stream=True
-                )
+                try:
+                    r = self.sess.get(
+                        url,
+                        headers=h,
+                        timeout=TIMEOUT,
+                        allow_redirects=allow_redirects,
+                        stream=True
+                    )
+                except requests.exceptions.SSLError:
+                    raise
+                except Exception as ex:
+                    HOST_LIMITER.record(limiter_host, error=f"{type(ex).__name__}: {ex}")
+                    raise
                 status = r.status_code
                 ctype = (r.headers.get("Content-Type") or "").strip()
+                HOST_LIMITER.record(limiter_host, status=status, retry_after=r.headers.get("Retry-After"), url=url)
 
-                # Blocked: try curl_cffi for 403/429
+                # Blocked: try curl_cffi for 403 (429 is a rate limit: back off instead)
                 if not (200 <= status < 400):
-                    if status in (403, 429) and HAS_CURL_CFFI:
-                        fr2, data2, hdr2 = self._curl_cffi_get(url, allow_redirects, referer)
+                    release(r, drain_limit=DRAIN_MAX_BYTES)  # keep the connection for the next try
+                    if status == 403 and HAS_CURL_CFFI:
+                        fr2, data2, hdr2 = self._curl_cffi_get(url, allow_redirects, referer, expect, inspect)
                         if fr2.ok and data2:
-                            return fr2, data2, hdr2
+                            return done(fr2, data2, hdr2)
                     last_err = f"HTTP {status}"
+                    if status == 403:
+                        # forbidden stays forbidden: retrying only adds failures for the host
+                        return done(FetchResult(ok=False, status=status, error=last_err), None, {})
                     raise RuntimeError(last_err)
 
-                # IMPORTANT: enable transparent decompression when reading raw stream
-                if getattr(r, "raw", None) is not None:
-                    try:
-                        r.raw.decode_content = True  # type: ignore[attr-defined]
-                    except Exception:
-                        pass
-
-                data = r.raw.read(MAX_FETCH_BYTES) if r.raw else r.content[:MAX_FETCH_BYTES]
-                hdr = {k.lower(): v for k, v in r.headers.items()}
-                sniff = _sniff_text(data)
-                fr = FetchResult(
-                    ok=True,
-                    status=status,
-                    content_type=ctype,
-                    insecure_tls_used=insecure_used,
-                    sniff=sniff
-                )
+                body, hdr = self._read(r, expect, inspect)
 
                 # If we expected XML but got HTML, try curl_cffi even if HTTP=200.
-                if expect == "xml":
-                    xmlish = _ctype_is_xmlish(ctype) or _looks_like_xml(data)
-                    if (not xmlish) and _looks_like_html(data) and HAS_CURL_CFFI:
-                        fr2, data2, hdr2 = self._curl_cffi_get(url, allow_redirects, referer)
-                        if fr2.ok and data2 and (_ctype_is_xmlish(fr2.content_type) or _looks_like_xml(data2)):
-                            return fr2, data2, hdr2
-                        return FetchResult(
-                            ok=False,
-                            status=status,
-                            content_type=ctype,
-                            error="Expected XML but received HTML/blocked page",
-                            sniff=sniff,
-                        ), data, hdr
+                if body.aborted and expect == "xml" and _looks_like_html(body.data) and HAS_CURL_CFFI:
+                    fr2, data2, hdr2 = self._curl_cffi_get(url, allow_redirects, referer, expect, inspect)
+                    if fr2.ok and data2 and (_ctype_is_xmlish(fr2.content_type) or _looks_like_xml(data2)):
+                        return done(fr2, data2, hdr2)
 
-                return fr, data, hdr
+                return done(self._result(status, ctype, body, insecure_tls_used=insecure_used), body.data, hdr)
 
             except requests.exceptions.SSLError as e:
                 last_err = str(e)
 
                 if HAS_CURL_CFFI:
                     try:
-                        fr2, data2, hdr2 = self._curl_cffi_get(url, allow_redirects, referer)
+                        fr2, data2, hdr2 = self._curl_cffi_get(url, allow_redirects, referer, expect, inspect)
                         if fr2.ok and data2:
                             if expect != "xml" or _ctype_is_xmlish(fr2.content_type) or _looks_like_xml(data2):
-                                return fr2, data2, hdr2
+                                return done(fr2, data2, hdr2)
                     except Exception:
                         pass
 
@@ -372,34 +516,25 @@ class SmartHTTP:
                         )
                         status = r.status_code
                         ctype = (r.headers.get("Content-Type") or "").strip()
+                        HOST_LIMITER.record(limiter_host, status=status, retry_after=r.headers.get("Retry-After"), url=url)
 
-                        if getattr(r, "raw", None) is not None:
-                            try:
-                                r.raw.decode_content = True  # type: ignore[attr-defined]
-                            except Exception:
-                                pass
-
-                        data = r.raw.read(MAX_FETCH_BYTES) if r.raw else r.content[:MAX_FETCH_BYTES]
-                        hdr = {k.lower(): v for k, v in r.headers.items()}
-                        sniff = _sniff_text(data)
-                        return FetchResult(
-                            ok=(200 <= status < 400),
-                            status=status,
-                            content_type=ctype,
-                            insecure_tls_used=True,
-                            sniff=sniff
-                        ), data, hdr
+                        body, hdr = self._read(r, expect, inspect)
+                        fr = self._result(status, ctype, body, ok=(200 <= status < 400), insecure_tls_used=True)
+                        return done(fr, body.data, hdr)
                     except Exception as e2:
+                        HOST_LIMITER.record(limiter_host, error=f"{type(e2).__name__}: {e2}")
                         last_err = f"TLS verify failed then insecure failed: {e2}"
+                else:
+                    HOST_LIMITER.record(limiter_host, error=last_err)
 
             except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
                 last_err = str(e)
 
                 if HAS_CURL_CFFI and expect == "xml":
                     try:
-                        fr2, data2, hdr2 = self._curl_cffi_get(url, allow_redirects, referer)
+                        fr2, data2, hdr2 = self._curl_cffi_get(url, allow_redirects, referer, expect, inspect)
                         if fr2.ok and data2 and (_ctype_is_xmlish(fr2.content_type) or _looks_like_xml(data2)):
-                            return fr2, data2, hdr2
+                            return done(fr2, data2, hdr2)
                     except Exception:
                         pass
 
@@ -408,40 +543,129 @@ class SmartHTTP:
 
             time.sleep((BACKOFF_BASE ** attempt) + random.random() * 0.25)
 
-        return FetchResult(ok=False, error=last_err, insecure_tls_used=insecure_used), None, {}
+        return done(FetchResult(ok=False, error=last_err, insecure_tls_used=insecure_used), None, {})
+
+
+# -----------------------
+# Candidate collection
+# -----------------------
+T = TypeVar("T")
+
+
+class CandidateSet(Generic[T]):
+    """
+    Insertion-ordered, URL-keyed candidate collector with O(1) membership
+    (dict-backed). Holds plain URLs or objects keyed by their URL (RSSItem,
+    SitemapEntry); the first value added for a URL wins. With limit set, adds
+    beyond it are refused.
+    """
+    def __init__(self, limit: Optional[int] = None) -> None:
+        self.limit = limit
+        self._items: Dict[str, T] = {}
+
+    def add(self, url: str, value: Optional[T] = None) -> bool:
+        if not url or url in self._items or self.full:
+            return False
+        self._items[url] = value if value is not None else url  # type: ignore[assignment]
+        return True
+
+    @property
+    def full(self) -> bool:
+        return self.limit is not None and len(self._items) >= self.limit
+
+    def values(self) -> List[T]:
+        return list(self._items.values())
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items.values())
 
 
 # -----------------------
 # XML parsing helpers
 # -----------------------
-def parse_sitemap_urls(xml_bytes: bytes, base_url: str) -> List[str]:
-    soup = BeautifulSoup(xml_bytes, "xml")
-    urls = [loc.text.strip() for loc in soup.find_all("loc") if loc and loc.text]
-    out: List[str] = []
-    for u in urls:
+@dataclass
+class SitemapEntry:
+    loc: str
+    lastmod: Optional[date] = None
+
+
+_SITEMAP_ENTRY_TAGS = ("url", "sitemap")
+_LOC_RE = re.compile(rb"<loc>\s*([^<]+?)\s*</loc>", re.I)
+
+
+def _xml_local_name(tag) -> str:
+    if not isinstance(tag, str):
+        return ""  # comments / processing instructions
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def parse_sitemap(xml_bytes: bytes, base_url: str) -> Tuple[str, List[SitemapEntry]]:
+    """
+    Stream-parse a sitemap with lxml iterparse -> (root kind, entries).
+    kind is "sitemapindex" or "urlset"; entries carry <loc> and <lastmod> of
+    each <sitemap>/<url>. Processed elements are freed as parsing goes, so a
+    multi-MB urlset is never held as a full tree.
+    """
+    kind = ""
+    out: CandidateSet[SitemapEntry] = CandidateSet()
+    loc = ""
+    lastmod: Optional[date] = None
+
+    def add(u: str, lm: Optional[date]) -> None:
         u = normalize_url(u)
-        if not u:
-            continue
         if u.startswith("/"):
             u = urljoin(base_url, u)
-        if u not in out:
-            out.append(u)
-    return out
+        out.add(u, SitemapEntry(loc=u, lastmod=lm))
+
+    try:
+        for event, el in etree.iterparse(
+            io.BytesIO(xml_bytes),
+            events=("start", "end"),
+            recover=True,
+            huge_tree=True,
+            resolve_entities=False,
+            no_network=True,
+        ):
+            name = _xml_local_name(el.tag)
+            if event == "start":
+                kind = kind or name
+                continue
+            parent = el.getparent()
+            # only direct children of <url>/<sitemap> (not image:loc, video:loc, ...)
+            direct = parent is not None and _xml_local_name(parent.tag) in _SITEMAP_ENTRY_TAGS
+            if name == "loc" and direct:
+                loc = (el.text or "").strip()
+            elif name == "lastmod" and direct:
+                lastmod = _iso_to_date(el.text)
+            elif name in _SITEMAP_ENTRY_TAGS:
+                if loc:
+                    add(loc, lastmod)
+                loc, lastmod = "", None
+                el.clear(keep_tail=True)
+                while el.getprevious() is not None:
+                    del parent[0]
+    except (etree.LxmlError, ValueError):
+        pass
+
+    if not out:
+        # not parseable as XML at all: plain <loc> scan
+        for m in _LOC_RE.finditer(xml_bytes or b""):
+            add(m.group(1).decode("utf-8", errors="ignore"), None)
+    return kind, out.values()
+
+
+def parse_sitemap_urls(xml_bytes: bytes, base_url: str) -> List[str]:
+    return [e.loc for e in parse_sitemap(xml_bytes, base_url)[1]]
 
 
 def parse_sitemap_index_urls(xml_bytes: bytes, base_url: str) -> List[str]:
-    soup = BeautifulSoup(xml_bytes, "xml")
-    urls = [loc.text.strip() for loc in soup.find_all("loc") if loc and loc.text]
-    out: List[str] = []
-    for u in urls:
-        u = normalize_url(u)
-        if not u:
-            continue
-        if u.startswith("/"):
-            u = urljoin(base_url, u)
-        if u not in out:
-            out.append(u)
-    return out
+    return [e.loc for e in parse_sitemap(xml_bytes, base_url)[1]]
 
 
 def discover_from_html_listing(html_bytes: bytes, base_url: str) -> List[str]:
@@ -457,16 +681,16 @@ def discover_from_html_listing(html_bytes: bytes, base_url: str) -> List[str]:
         if href.startswith("http"):
             links.append(href)
 
-    out: List[str] = []
+    out: CandidateSet[str] = CandidateSet()
     for u in links:
-        if is_probably_article_url(u, base_url=base_url, allow_unknown=False) and u not in out:
-            out.append(u)
-    return out
+        if u not in out and is_probably_article_url(u, base_url=base_url, allow_unknown=False):
+            out.add(u)
+    return out.values()
 
 
 def discover_feed_links_from_directory_page(html_bytes: bytes, base_url: str) -> List[str]:
     soup = BeautifulSoup(html_bytes, "lxml")
-    cands: List[str] = []
+    cands: CandidateSet[str] = CandidateSet()
 
     for tag in soup.find_all("link"):
         rel = tag.get("rel") or []
@@ -481,8 +705,8 @@ def discover_feed_links_from_directory_page(html_bytes: bytes, base_url: str) ->
             if href.startswith("/"):
                 href = urljoin(base_url, href)
             href = normalize_url(href)
-            if href.startswith("http") and href not in cands:
-                cands.append(href)
+            if href.startswith("http"):
+                cands.add(href)
 
     for a in soup.find_all("a", href=True):
         href = (a.get("href") or "").strip()
@@ -493,11 +717,11 @@ def discover_feed_links_from_directory_page(html_bytes: bytes, base_url: str) ->
         href = normalize_url(href)
         low = href.lower()
         if any(x in low for x in ["rss", "feed", "atom", ".xml", ".rss"]):
-            if href.startswith("http") and href not in cands:
-                cands.append(href)
+            if href.startswith("http"):
+                cands.add(href)
 
     same = [u for u in cands if _same_domain(base_url, u)]
-    other = [u for u in cands if u not in same]
+    other = [u for u in cands if not _same_domain(base_url, u)]
     return (same + other)[:50]
 
 
@@ -544,7 +768,157 @@ def _parse_date_to_iso(dt_obj) -> Optional[str]:
     return None
 
 
-def parse_rss_items(xml_bytes: bytes, base_url: str) -> List[RSSItem]:
+def _feed_date_to_iso(s: Optional[str]) -> Optional[str]:
+    s = (s or "").strip()
+    if not s:
+        return None
+    if re.match(r"^\d{4}-\d{2}-\d{2}", s):
+        return _parse_date_to_iso(s)
+    try:
+        return _parse_date_to_iso(parsedate_to_datetime(s))  # RFC 822 (RSS pubDate)
+    except (TypeError, ValueError, IndexError):
+        pass
+    # date-only / non-RFC values ("06 May 2024"): same parser as the feedparser path
+    try:
+        from feedparser.datetimes import _parse_date as feedparser_date
+    except Exception:
+        return _normalize_any_date_to_iso(s)
+    return _parse_date_to_iso(feedparser_date(s))
+
+
+_FEED_ROOT_TAGS = ("rss", "feed", "rdf")
+_FEED_ITEM_TAGS = ("item", "entry")
+_CONTENT_ENCODED_TAG = "{http://purl.org/rss/1.0/modules/content/}encoded"
+# Atom content types feedparser copies into summary (text, HTML, XHTML)
+_SUMMARY_CONTENT_TYPES = ("text", "html", "xhtml", "text/plain", "text/html", "application/xhtml+xml")
+
+
+def _feed_text(el) -> str:
+    return "".join(el.itertext()).strip()
+
+
+def _collect_feed_field(fields_: Dict[str, str], name: str, el) -> None:
+    # first occurrence wins, like feedparser
+    if name == "link":
+        href = el.get("href")
+        if href is None:
+            text = (el.text or "").strip()
+            if text:
+                fields_.setdefault("link", text)
+        elif (el.get("rel") or "alternate").lower() == "alternate" and href.strip():
+            fields_.setdefault("link", href.strip())
+    elif name in ("guid", "id"):
+        fields_.setdefault("id", (el.text or "").strip())
+    elif name == "title":
+        fields_.setdefault("title", _feed_text(el))
+    elif name in ("summary", "description"):
+        fields_.setdefault("summary", _feed_text(el))
+    elif name == "content" or el.tag == _CONTENT_ENCODED_TAG:
+        # stands in for summary when the entry has none (as in feedparser)
+        ctype = (el.get("type") or "text").strip().lower()
+        if el.get("src") is None and ctype in _SUMMARY_CONTENT_TYPES:
+            fields_.setdefault("content", _feed_text(el))
+    elif name in ("author", "creator"):
+        if len(el) == 0 and (el.text or "").strip():
+            fields_.setdefault("author", el.text.strip())
+    elif name in ("published", "pubdate", "issued", "date"):
+        fields_.setdefault("published", (el.text or "").strip())
+    elif name in ("updated", "modified"):
+        fields_.setdefault("updated", (el.text or "").strip())
+
+
+def _feed_fields_to_item(fields_: Dict[str, str], base_url: str) -> Optional[RSSItem]:
+    url = fields_.get("link") or ""
+    if not url and fields_.get("id", "").startswith("http"):
+        url = fields_["id"]
+    if not url:
+        return None
+    if url.startswith("/"):
+        url = urljoin(base_url, url)
+    return RSSItem(
+        url=normalize_url(url),
+        title=fields_.get("title", ""),
+        summary=fields_.get("summary") or fields_.get("content", ""),
+        author=fields_.get("author", ""),
+        published_at=_feed_date_to_iso(fields_.get("published")) or _feed_date_to_iso(fields_.get("updated")),
+    )
+
+
+def _parse_feed_streaming(xml_bytes: bytes, base_url: str, *, max_items: Optional[int] = None) -> Optional[List[RSSItem]]:
+    """
+    Fast path: lxml iterparse straight into RSSItem (RSS 2.0, RSS 1.0/RDF,
+    Atom), deduplicated, stopping after max_items. Finished entries are freed
+    as parsing goes. Returns None when the document is not a well-formed feed.
+    """
+    out: CandidateSet[RSSItem] = CandidateSet(limit=max_items or None)
+    root = ""
+    cur = None
+    fields_: Dict[str, str] = {}
+    try:
+        for event, el in etree.iterparse(
+            io.BytesIO(xml_bytes),
+            events=("start", "end"),
+            huge_tree=True,
+            resolve_entities=False,
+            no_network=True,
+        ):
+            name = _xml_local_name(el.tag)
+            if event == "start":
+                if not root:
+                    root = name
+                    if root not in _FEED_ROOT_TAGS:
+                        return None
+                elif cur is None and name in _FEED_ITEM_TAGS:
+                    cur, fields_ = el, {}
+                continue
+            if cur is None:
+                continue
+
+            if el is cur:
+                it = _feed_fields_to_item(fields_, base_url)
+                if it is not None:
+                    out.add(it.url, it)
+                cur = None
+                parent = el.getparent()
+                el.clear(keep_tail=True)
+                while parent is not None and el.getprevious() is not None:
+                    del parent[0]
+                if out.full:
+                    break
+                continue
+
+            # only direct children of the entry (not media:title, source/title, ...)
+            parent = el.getparent()
+            if parent is cur:
+                _collect_feed_field(fields_, name, el)
+            elif (
+                name == "name"
+                and parent is not None
+                and _xml_local_name(parent.tag) == "author"
+                and parent.getparent() is cur
+                and (el.text or "").strip()
+            ):
+                fields_.setdefault("author", el.text.strip())  # Atom <author><name>
+    except (etree.LxmlError, ValueError):
+        return None
+    return out.values() if root else None
+
+
+def parse_rss_items(xml_bytes: bytes, base_url: str, *, max_items: Optional[int] = None) -> List[RSSItem]:
+    """
+    Feed bytes -> RSSItem list (deduplicated by URL, at most max_items).
+    Well-formed feeds use the streaming parser; malformed ones (truncated,
+    broken markup, HTML served as a feed) go through feedparser.
+    """
+    items = _parse_feed_streaming(xml_bytes, base_url, max_items=max_items)
+    if items is None:
+        items = _parse_rss_items_lenient(xml_bytes, base_url)
+        if max_items:
+            items = items[:max_items]
+    return items
+
+
+def _parse_rss_items_lenient(xml_bytes: bytes, base_url: str) -> List[RSSItem]:
     try:
         import feedparser
     except Exception:
@@ -600,13 +974,105 @@ def parse_rss_items(xml_bytes: bytes, base_url: str) -> List[RSSItem]:
 
         out.append(RSSItem(url=url, title=title, summary=summary, author=author, published_at=pub_iso))
 
-    dedup: List[RSSItem] = []
-    seen = set()
+    dedup: CandidateSet[RSSItem] = CandidateSet()
     for it in out:
-        if it.url not in seen:
-            seen.add(it.url)
-            dedup.append(it)
-    return dedup
+        dedup.add(it.url, it)
+    return dedup.values()
+
+
+# -----------------------
+# Feed validation (FEED_DIRECTORY)
+# -----------------------
+FEED_PROBE_LIMIT = 15
+FEED_PROBE_WORKERS = 4
+
+
+def _fetch_feed_items(http: SmartHTTP, feed_url: str, max_items: Optional[int] = None) -> List[RSSItem]:
+    fr, data, _ = http.get(feed_url, allow_redirects=True, expect="xml")
+    if fr.ok and data and (_ctype_is_xmlish(fr.content_type) or _looks_like_xml(data)):
+        return parse_rss_items(data, feed_url, max_items=max_items)
+    return []
+
+
+def first_valid_feed(
+    http: SmartHTTP,
+    candidates: List[str],
+    *,
+    max_workers: int = FEED_PROBE_WORKERS,
+    max_items: Optional[int] = None,
+) -> Tuple[Optional[str], List[RSSItem]]:
+    """
+    Validate feed candidates concurrently and return the best-ranked one that
+    parses (candidates are in preference order). Results are consumed in rank
+    order, so once a candidate is valid nothing ranked below it is waited for;
+    queued probes are cancelled.
+    """
+    if not candidates:
+        return None, []
+    ex = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(candidates))), thread_name_prefix="feed-probe")
+    try:
+        futures = [ex.submit(_fetch_feed_items, http, u, max_items) for u in candidates]
+        for u, fut in zip(candidates, futures):
+            try:
+                items = fut.result()
+            except Exception:
+                items = []
+            if items:
+                return u, items
+        return None, []
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
+
+
+# -----------------------
+# Sitemap crawl (SITEMAP_INDEX)
+# -----------------------
+MAX_CHILD_SITEMAPS = 30
+SITEMAP_WORKERS = 4
+
+
+def newest_sitemap_entries(entries: List[SitemapEntry], *, since: Optional[date] = None) -> List[SitemapEntry]:
+    """
+    Newest first by <lastmod>; entries without lastmod follow in document
+    order. With since, entries last modified before it are dropped: nothing
+    in them can have been published inside the window.
+    """
+    kept = [e for e in entries if not (since and e.lastmod and e.lastmod < since)]
+    dated = sorted((e for e in kept if e.lastmod), key=lambda e: e.lastmod, reverse=True)
+    return dated + [e for e in kept if not e.lastmod]
+
+
+def crawl_child_sitemaps(
+    http: SmartHTTP,
+    children: List[SitemapEntry],
+    *,
+    max_workers: int = SITEMAP_WORKERS,
+) -> Iterator[Tuple[SitemapEntry, Optional[List[SitemapEntry]]]]:
+    """
+    Fetch + parse child sitemaps concurrently, yielding (child, url entries or
+    None on failure) in the given order. Closing the iterator early (use
+    contextlib.closing) cancels fetches that have not started.
+    """
+    if not children:
+        return
+
+    def load(sm: SitemapEntry) -> Optional[List[SitemapEntry]]:
+        fr, data, _ = http.get(sm.loc, allow_redirects=True, expect="xml")
+        if not fr.ok or not data:
+            return None
+        return parse_sitemap(data, sm.loc)[1]
+
+    ex = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(children))), thread_name_prefix="sitemap")
+    try:
+        futures = [ex.submit(load, sm) for sm in children]
+        for sm, fut in zip(children, futures):
+            try:
+                entries = fut.result()
+            except Exception:
+                entries = None
+            yield sm, entries
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
 
 
 # -----------------------
@@ -625,40 +1091,48 @@ _DATE_META_KEYS = [
 ]
 
 
-def _extract_meta(soup: BeautifulSoup) -> Dict[str, str]:
+_META_TAG_RE = re.compile(rb"<meta\b[^>]*>", re.I)
+_TAG_ATTR_RE = re.compile(rb"""([\w:.-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+_JSONLD_DATE_KEYS = ("datePublished", "dateModified", "uploadDate", "dateCreated")
+_JSONLD_DATE_RE = re.compile(rb'"(datePublished|dateModified|uploadDate|dateCreated)"\s*:\s*"([^"]{4,64})"')
+
+DATE_SNIFF_WORKERS = 6
+OUT_OF_WINDOW = "published date outside the requested window"
+
+
+def _scan_meta(data: bytes) -> Dict[str, str]:
     meta: Dict[str, str] = {}
-    for m in soup.find_all("meta"):
-        k = m.get("property") or m.get("name") or ""
-        v = m.get("content") or ""
-        k = (k or "").strip()
-        v = (v or "").strip()
-        if k and v and k not in meta:
-            meta[k] = v
+    for m in _META_TAG_RE.finditer(data):
+        attrs = {k.lower(): (v1 or v2 or v3) for k, v1, v2, v3 in _TAG_ATTR_RE.findall(m.group(0))}
+        k = (attrs.get(b"property") or attrs.get(b"name") or attrs.get(b"itemprop") or b"").strip()
+        v = (attrs.get(b"content") or b"").strip()
+        if k and v:
+            meta.setdefault(k.decode("utf-8", errors="ignore"), html_lib.unescape(v.decode("utf-8", errors="ignore")))
     return meta
 
 
-def _extract_jsonld_dates(soup: BeautifulSoup) -> List[str]:
-    out: List[str] = []
-    for tag in soup.find_all("script", type=re.compile(r"ld\+json", re.I)):
-        txt = tag.get_text(strip=True) or ""
-        if not txt:
-            continue
-        try:
-            import json
-            j = json.loads(txt)
-            candidates = []
-            if isinstance(j, dict):
-                candidates.append(j)
-            elif isinstance(j, list):
-                candidates.extend([x for x in j if isinstance(x, dict)])
-            for obj in candidates:
-                for k in ("datePublished", "dateModified", "uploadDate", "dateCreated"):
-                    v = obj.get(k)
-                    if isinstance(v, str) and v.strip():
-                        out.append(v.strip())
-        except Exception:
-            continue
-    return out
+def sniff_published_in_html(data: bytes) -> Optional[str]:
+    """
+    Published date from raw page bytes without building a DOM: <meta> tags
+    (_DATE_META_KEYS order), then JSON-LD style "datePublished": "..." pairs.
+    Works on a partial document (e.g. just the head).
+    """
+    meta = _scan_meta(data)
+    for k in _DATE_META_KEYS:
+        v = meta.get(k)
+        if v:
+            iso = _normalize_any_date_to_iso(v)
+            if iso:
+                return iso
+
+    found: Dict[str, str] = {}
+    for m in _JSONLD_DATE_RE.finditer(data):
+        found.setdefault(m.group(1).decode("ascii"), m.group(2).decode("utf-8", errors="ignore"))
+    for k in _JSONLD_DATE_KEYS:
+        iso = _normalize_any_date_to_iso(found.get(k, ""))
+        if iso:
+            return iso
+    return None
 
 
 def _normalize_any_date_to_iso(s: str) -> Optional[str]:
@@ -684,35 +1158,50 @@ def _normalize_any_date_to_iso(s: str) -> Optional[str]:
         return None
 
 
-def sniff_published_at_fast(http: SmartHTTP, url: str) -> Optional[str]:
-    fr, data, _ = http.get(url, allow_redirects=True, expect="any")
-    if not fr.ok or not data:
-        return None
+def sniff_page_date(
+    http: SmartHTTP,
+    url: str,
+    *,
+    in_window: Optional[Callable[[str], bool]] = None,
+) -> Tuple[Optional[str], Optional[PrefetchedPage]]:
+    """
+    Published date of an article page -> (iso, page).
 
-    if not _looks_like_html(data) and ("html" not in (fr.content_type or "").lower()):
-        return None
+    The head (up to </head>, at most HEAD_SNIFF_BYTES) is scanned while the
+    page streams in; a date outside in_window aborts the transfer right there.
+    Otherwise the page is read to the end (the full body is scanned if the
+    head had no date) and, when its date is inside the window, returned as a
+    PrefetchedPage so extraction does not download it again.
+    """
+    head_iso: List[Optional[str]] = [None]
 
-    try:
-        html = data.decode("utf-8", errors="ignore")
-    except Exception:
+    def inspect(head: bytes) -> Optional[str]:
+        head_iso[0] = sniff_published_in_html(head)
+        if head_iso[0] and in_window is not None and not in_window(head_iso[0]):
+            return OUT_OF_WINDOW
         return None
 
-    soup = BeautifulSoup(html, "lxml")
-    meta = _extract_meta(soup)
-
-    for k in _DATE_META_KEYS:
-        v = meta.get(k)
-        if v:
-            iso = _normalize_any_date_to_iso(v)
-            if iso:
-                return iso
+    fr, data, _ = http.get(url, allow_redirects=True, expect="any", inspect=inspect)
+    pub_iso = head_iso[0]
+    if not fr.ok or not data:
+        return pub_iso, None
+    if not _looks_like_html(data) and ("html" not in (fr.content_type or "").lower()):
+        return None, None
+
+    pub_iso = pub_iso or sniff_published_in_html(data)
+    page = None
+    if pub_iso and in_window is not None and in_window(pub_iso):
+        page = PrefetchedPage(
+            data=data,
+            content_type=fr.content_type,
+            method=fr.method,
+            status=fr.status or 200,
+        )
+    return pub_iso, page
 
-    for v in _extract_jsonld_dates(soup):
-        iso = _normalize_any_date_to_iso(v)
-        if iso:
-            return iso
 
-    return None
+def sniff_published_at_fast(http: SmartHTTP, url: str) -> Optional[str]:
+    return sniff_page_date(http, url)[0]
 
 
 # -----------------------
@@ -749,6 +1238,31 @@ def _in_date_range(d: Optional[date], start: Optional[date], end: Optional[date]
     return True
 
 
+def _newest_first(dates: List[date]) -> bool:
+    """
+    Dates in candidate order look newest-first (a day of jitter and ~10%
+    out-of-order entries tolerated).
+    """
+    if len(dates) < 5:
+        return False
+    inversions = sum(1 for a, b in zip(dates, dates[1:]) if b > a + timedelta(days=1))
+    return inversions <= len(dates) // 10
+
+
+def _past_window(items: List[Article], batch: List[Article], window_start: Optional[date]) -> bool:
+    """
+    True when the source is ordered newest-first and the latest batch (mostly
+    dated) is entirely older than window_start: nothing further down can be
+    inside the window.
+    """
+    if window_start is None:
+        return False
+    batch_dates = [d for d in (_iso_to_date(a.published_at) for a in batch) if d]
+    if not batch_dates or len(batch_dates) * 2 < len(batch) or max(batch_dates) >= window_start:
+        return False
+    return _newest_first([d for d in (_iso_to_date(a.published_at) for a in items) if d])
+
+
 # -----------------------
 # Core: discovery / fetch
 # -----------------------
@@ -765,8 +1279,14 @@ def fetch_discovery_items(
     date_to: Optional[date] = None,
     prefetch_multiplier: int = 6,
     allow_unknown_article_urls: bool = False,
+    health: Optional[EndpointHealthStore] = None,
+    html_cache: Optional[Dict[str, PrefetchedPage]] = None,  # receives pages downloaded while date sniffing
+    url_dates: Optional[UrlDatePatternStore] = None,
+    routes: Optional[RouteSessions] = None,  # per-endpoint routes; session is the source's route
+    profiler: Optional[RunProfiler] = None,  # times the date_sniff stage
 ) -> Tuple[List[Article], List[str]]:
-    http = SmartHTTP(session)
+    source_label = f"{source.country} | {source.name}"
+    http = SmartHTTP(session, source=source_label)
     log: List[str] = []
 
     source_slug = _safe_slug(source.name)
@@ -786,28 +1306,35 @@ def fetch_discovery_items(
         target_n = 1
 
     want_date_filter = mode in (FETCH_MODE_ON_DATE, FETCH_MODE_DATE_RANGE)
+    cached_urls: Set[str] = set()  # pages this call put into html_cache
+    # earliest usable publication date (sitemap entries last modified before it are skipped)
+    window_start = on_date if mode == FETCH_MODE_ON_DATE else (date_from if mode == FETCH_MODE_DATE_RANGE else None)
     max_candidates = max(target_n * max(1, int(prefetch_multiplier)), target_n)
 
-    rss_items: List[RSSItem] = []
-    url_candidates: List[str] = []
+    rss_items: CandidateSet[RSSItem] = CandidateSet()
+    url_candidates: CandidateSet[str] = CandidateSet()
 
     def push_url(u: str) -> None:
         u = normalize_url(u)
-        if not u or not u.startswith("http"):
-            return
-        if u not in url_candidates:
-            url_candidates.append(u)
+        if u.startswith("http"):
+            url_candidates.add(u)
 
     def push_rss_item(it: RSSItem) -> None:
-        if not it.url.startswith("http"):
-            return
-        if all(x.url != it.url for x in rss_items):
-            rss_items.append(it)
+        if it.url.startswith("http"):
+            rss_items.add(it.url, it)
 
     enabled_endpoints = [e for e in (source.endpoints or []) if getattr(e, "enabled", True)]
     if not enabled_endpoints:
         return [], [f"[{source.country} | {source.name}] No enabled endpoints configured."]
 
+    if health is not None:
+        plan = health.plan(enabled_endpoints)
+        for ep in plan.skipped:
+            log.append(
+                f"[{source.country} | {source.name}] {ep.type} skipped: failing endpoint ({health.get(ep).describe()}) {ep.url}"
+            )
+        enabled_endpoints = plan.ordered
+
     endpoint_used = None
     discovery_method = ""
     for ep in enabled_endpoints:
@@ -815,122 +1342,185 @@ def fetch_discovery_items(
         ep_url = (ep.url or "").strip()
         if not ep_url:
             continue
-
-        endpoint_used = ep_url
-        base_url_guess = ep_url
-
-        if ep_type == "RSS":
-            discovery_method = "rss"
-            fr, data, _ = http.get(ep_url, allow_redirects=True, expect="xml")
-            if not fr.ok or not data:
-                log.append(f"[{source.country} | {source.name}] RSS fetch failed: {ep_url} err={fr.error}")
-                continue
-
-            items = parse_rss_items(data, ep_url)
-            log.append(f"[{source.country} | {source.name}] RSS parsed: {len(items)} entries from {ep_url}")
-
-            for it in items:
-                push_rss_item(it)
-                if len(rss_items) >= max_candidates:
-                    break
-
-            if rss_items:
-                break
+        if HOST_LIMITER.is_open(host_of(ep_url)):
+            log.append(f"[{source.country} | {source.name}] {ep_type} skipped: host circuit open ({host_of(ep_url)})")
             continue
-
-        if ep_type == "FEED_DIRECTORY":
-            discovery_method = "feed_directory"
-            fr, data, _ = http.get(ep_url, allow_redirects=True, expect="any")
-            if not fr.ok or not data:
-                log.append(f"[{source.country} | {source.name}] FEED_DIRECTORY fetch failed: {ep_url} err={fr.error}")
+        ep_http = http
+        if routes is not None:
+            try:
+                ep_http = SmartHTTP(routes.for_endpoint(source, ep), source=source_label)
+            except Exception as ex:
+                log.append(f"[{source.country} | {source.name}] {ep_type} skipped: route {route_for(source, ep)}: {ex}")
                 continue
 
-            feed_links = discover_feed_links_from_directory_page(data, ep_url)
-            log.append(f"[{source.country} | {source.name}] FEED_DIRECTORY found {len(feed_links)} feed candidates")
-
-            def feed_score(u: str) -> Tuple[int, int, int]:
-                same = 1 if _same_domain(ep_url, u) else 0
-                low = u.lower()
-                has_rss = 1 if ("rss" in low or "feed" in low or "atom" in low) else 0
-                return (same, has_rss, -len(u))
-
-            feed_links_sorted = sorted(feed_links, key=feed_score, reverse=True)
-
-            picked = None
-            for feed_url in feed_links_sorted[:15]:
-                fr2, data2, _ = http.get(feed_url, allow_redirects=True, expect="xml")
-                if fr2.ok and data2 and (_ctype_is_xmlish(fr2.content_type) or _looks_like_xml(data2)):
-                    parsed_items = parse_rss_items(data2, feed_url)
-                    if parsed_items:
-                        picked = feed_url
-                        for it in parsed_items:
-                            push_rss_item(it)
-                            if len(rss_items) >= max_candidates:
-                                break
+        ep_t0 = time.monotonic()
+        ep_found0 = len(rss_items) + len(url_candidates)
+        ep_error = ""
+        ep_feed: Optional[str] = None  # a failed probe keeps the old feed as fallback
+        try:
+            endpoint_used = ep_url
+            base_url_guess = ep_url
+
+            if ep_type == "RSS":
+                discovery_method = "rss"
+                fr, data, _ = ep_http.get(ep_url, allow_redirects=True, expect="xml")
+                if not fr.ok or not data:
+                    ep_error = fr.error or "fetch failed"
+                    log.append(f"[{source.country} | {source.name}] RSS fetch failed: {ep_url} err={fr.error}")
+                    continue
+
+                items = parse_rss_items(data, ep_url, max_items=max_candidates)
+                log.append(f"[{source.country} | {source.name}] RSS parsed: {len(items)} entries from {ep_url}")
+
+                for it in items:
+                    push_rss_item(it)
+                    if len(rss_items) >= max_candidates:
                         break
 
-            if picked:
-                log.append(f"[{source.country} | {source.name}] FEED_DIRECTORY picked feed: {picked} items={len(rss_items)}")
-                break
+                if rss_items:
+                    break
+                continue
 
-            log.append(f"[{source.country} | {source.name}] FEED_DIRECTORY could not validate any feed.")
-            continue
+            if ep_type == "FEED_DIRECTORY":
+                discovery_method = "feed_directory"
 
-        if ep_type == "HTML_LISTING":
-            discovery_method = "html_listing"
-            fr, data, _ = http.get(ep_url, allow_redirects=True, expect="any")
-            if not fr.ok or not data:
-                log.append(f"[{source.country} | {source.name}] HTML_LISTING fetch failed: {ep_url} err={fr.error}")
-                continue
+                def take(feed_items: List[RSSItem]) -> None:
+                    for it in feed_items:
+                        push_rss_item(it)
+                        if len(rss_items) >= max_candidates:
+                            break
 
-            urls = discover_from_html_listing(data, ep_url)
-            log.append(f"[{source.country} | {source.name}] HTML_LISTING discovered {len(urls)} urls")
-            for u in urls:
-                if is_probably_article_url(u, base_url=ep_url, allow_unknown=allow_unknown_article_urls):
-                    push_url(u)
-                    if len(url_candidates) >= max_candidates:
+                # feed resolved within its TTL: one request, no directory page / probing
+                fresh_feed = health.cached_feed(ep) if health is not None else ""
+                stale_feed = health.resolved_feed(ep) if (health is not None and not fresh_feed) else ""
+                if fresh_feed:
+                    take(_fetch_feed_items(ep_http, fresh_feed, max_candidates))
+                    if rss_items:
+                        ep_feed = None  # keep the cached feed and its TTL
+                        log.append(
+                            f"[{source.country} | {source.name}] FEED_DIRECTORY cached feed: {fresh_feed} items={len(rss_items)}"
+                        )
                         break
+                    log.append(f"[{source.country} | {source.name}] FEED_DIRECTORY cached feed failed, re-probing: {fresh_feed}")
+
+                picked = None
+                fr, data, _ = ep_http.get(ep_url, allow_redirects=True, expect="any")
+                if fr.ok and data:
+                    feed_links = discover_feed_links_from_directory_page(data, ep_url)
+                    log.append(f"[{source.country} | {source.name}] FEED_DIRECTORY found {len(feed_links)} feed candidates")
+
+                    def feed_score(u: str) -> Tuple[int, int, int]:
+                        same = 1 if _same_domain(ep_url, u) else 0
+                        low = u.lower()
+                        has_rss = 1 if ("rss" in low or "feed" in low or "atom" in low) else 0
+                        return (same, has_rss, -len(u))
+
+                    feed_links_sorted = sorted(feed_links, key=feed_score, reverse=True)
+                    picked, picked_items = first_valid_feed(
+                        ep_http, feed_links_sorted[:FEED_PROBE_LIMIT], max_items=max_candidates
+                    )
+                    take(picked_items)
+                else:
+                    ep_error = fr.error or "fetch failed"
+                    log.append(f"[{source.country} | {source.name}] FEED_DIRECTORY fetch failed: {ep_url} err={fr.error}")
+
+                if picked:
+                    ep_feed = picked
+                    log.append(f"[{source.country} | {source.name}] FEED_DIRECTORY picked feed: {picked} items={len(rss_items)}")
+                    break
 
-            if url_candidates:
-                break
-            continue
+                # directory down or nothing validated: an expired feed beats no feed
+                if stale_feed:
+                    take(_fetch_feed_items(ep_http, stale_feed, max_candidates))
+                    if rss_items:
+                        ep_error = ""
+                        ep_feed = None
+                        log.append(
+                            f"[{source.country} | {source.name}] FEED_DIRECTORY using expired cached feed: {stale_feed} "
+                            f"items={len(rss_items)}"
+                        )
+                        break
 
-        if ep_type == "SITEMAP_INDEX":
-            discovery_method = "sitemap"
-            fr, data, _ = http.get(ep_url, allow_redirects=True, expect="xml")
-            if not fr.ok or not data:
-                log.append(f"[{source.country} | {source.name}] SITEMAP_INDEX fetch failed: {ep_url} err={fr.error}")
+                if not ep_error:
+                    ep_error = "no valid feed among candidates"
+                    log.append(f"[{source.country} | {source.name}] FEED_DIRECTORY could not validate any feed.")
                 continue
 
-            if b"<sitemapindex" in data.lower():
-                child_sitemaps = parse_sitemap_index_urls(data, ep_url)
-                log.append(f"[{source.country} | {source.name}] Sitemap index has {len(child_sitemaps)} child sitemaps")
-                for sm in child_sitemaps[:30]:
-                    fr2, data2, _ = http.get(sm, allow_redirects=True, expect="xml")
-                    if not fr2.ok or not data2:
-                        continue
-                    urls = parse_sitemap_urls(data2, ep_url)
-                    for u in urls:
-                        if is_probably_article_url(u, base_url=ep_url, allow_unknown=allow_unknown_article_urls):
-                            push_url(u)
-                            if len(url_candidates) >= max_candidates:
-                                break
-                    if len(url_candidates) >= max_candidates:
-                        break
-            else:
-                urls = parse_sitemap_urls(data, ep_url)
-                log.append(f"[{source.country} | {source.name}] Sitemap urlset has {len(urls)} urls")
+            if ep_type == "HTML_LISTING":
+                discovery_method = "html_listing"
+                fr, data, _ = ep_http.get(ep_url, allow_redirects=True, expect="any")
+                if not fr.ok or not data:
+                    ep_error = fr.error or "fetch failed"
+                    log.append(f"[{source.country} | {source.name}] HTML_LISTING fetch failed: {ep_url} err={fr.error}")
+                    continue
+
+                urls = discover_from_html_listing(data, ep_url)
+                log.append(f"[{source.country} | {source.name}] HTML_LISTING discovered {len(urls)} urls")
                 for u in urls:
                     if is_probably_article_url(u, base_url=ep_url, allow_unknown=allow_unknown_article_urls):
                         push_url(u)
                         if len(url_candidates) >= max_candidates:
                             break
 
-            if url_candidates:
-                break
-            continue
+                if url_candidates:
+                    break
+                continue
+
+            if ep_type == "SITEMAP_INDEX":
+                discovery_method = "sitemap"
+                fr, data, _ = ep_http.get(ep_url, allow_redirects=True, expect="xml")
+                if not fr.ok or not data:
+                    ep_error = fr.error or "fetch failed"
+                    log.append(f"[{source.country} | {source.name}] SITEMAP_INDEX fetch failed: {ep_url} err={fr.error}")
+                    continue
+
+                def push_sitemap_urls(entries: List[SitemapEntry]) -> None:
+                    for e in newest_sitemap_entries(entries, since=window_start):
+                        if is_probably_article_url(e.loc, base_url=ep_url, allow_unknown=allow_unknown_article_urls):
+                            push_url(e.loc)
+                            if len(url_candidates) >= max_candidates:
+                                break
 
-        log.append(f"[{source.country} | {source.name}] Unknown endpoint type: {ep_type} url={ep_url}")
+                kind, entries = parse_sitemap(data, ep_url)
+                if kind == "sitemapindex":
+                    children = newest_sitemap_entries(entries, since=window_start)
+                    pruned = len(entries) - len(children)
+                    children = children[:MAX_CHILD_SITEMAPS]
+                    log.append(
+                        f"[{source.country} | {source.name}] Sitemap index has {len(entries)} child sitemaps; "
+                        f"fetching {len(children)} (pruned by lastmod: {pruned})"
+                    )
+                    with closing(crawl_child_sitemaps(ep_http, children)) as crawled:
+                        for _sm, child_entries in crawled:
+                            if child_entries:
+                                push_sitemap_urls(child_entries)
+                            if len(url_candidates) >= max_candidates:
+                                break
+                else:
+                    log.append(f"[{source.country} | {source.name}] Sitemap urlset has {len(entries)} urls")
+                    push_sitemap_urls(entries)
+
+                if url_candidates:
+                    break
+                continue
+
+            ep_error = f"unknown endpoint type: {ep_type}"
+            log.append(f"[{source.country} | {source.name}] Unknown endpoint type: {ep_type} url={ep_url}")
+        finally:
+            if health is not None:
+                found = len(rss_items) + len(url_candidates) - ep_found0
+                if ep_error:
+                    ep_status = STATUS_FAILING
+                else:
+                    ep_status = STATUS_WORKING if found > 0 else STATUS_PARTIAL
+                health.record(
+                    ep,
+                    status=ep_status,
+                    latency_s=time.monotonic() - ep_t0,
+                    items=found,
+                    error=ep_error,
+                    resolved_feed=ep_feed,
+                )
 
     if not endpoint_used:
         return [], [f"[{source.country} | {source.name}] No endpoint used (configuration issue)."]
@@ -1006,19 +1596,84 @@ def fetch_discovery_items(
             if len(items) >= max_candidates:
                 break
 
+    # URL date patterns learn from every date already known (any mode)
+    patterns = url_dates if url_dates is not None else UrlDatePatternStore()
+    for a in items:
+        if a.published_at:
+            patterns.observe(source_slug, a.url, a.published_at)
+
     if want_date_filter:
+        # drop items whose URL date puts them clearly outside the window (no request needed)
+        window = (on_date, on_date) if mode == FETCH_MODE_ON_DATE else (date_from, date_to)
+        kept: List[Article] = []
+        for a in items:
+            guess = None if a.published_at else patterns.infer(source_slug, a.url)
+            if guess is not None and not guess.overlaps(*window):
+                continue
+            kept.append(a)
+        if len(kept) < len(items):
+            log.append(
+                f"[{source.country} | {source.name}] URL dates pruned {len(items) - len(kept)} items outside the window "
+                f"(patterns: {', '.join(patterns.trusted_patterns(source_slug)) or '-'})"
+            )
+        items = kept
+
         missing = [a for a in items if not a.published_at]
         if missing:
-            log.append(f"[{source.country} | {source.name}] Date filter enabled; sniffing published dates for {len(missing)} items...")
-        for idx, a in enumerate(missing):
-            pub_iso = sniff_published_at_fast(http, a.url)
-            if pub_iso:
-                a.published_at = pub_iso
-                a.id = _article_id(source_slug, a.url, a.published_at)
-            else:
-                a.extraction_notes.append("date_sniff_failed")
-            if (idx + 1) % 25 == 0:
-                log.append(f"[{source.country} | {source.name}] Date sniff progress: {idx+1}/{len(missing)}")
+            sniff_stage = profiler.stage(STAGE_DATE_SNIFF, source_label) if profiler is not None else nullcontext(StageTimer())
+            with sniff_stage as sniff_timer:
+                log.append(f"[{source.country} | {source.name}] Date filter enabled; sniffing published dates for {len(missing)} items...")
+
+                def in_window(iso: str) -> bool:
+                    d = _iso_to_date(iso)
+                    return d == on_date if mode == FETCH_MODE_ON_DATE else _in_date_range(d, date_from, date_to)
+
+                def sniff(a: Article) -> Tuple[Optional[str], Optional[PrefetchedPage]]:
+                    try:
+                        return sniff_page_date(http, a.url, in_window=in_window)
+                    except Exception:
+                        return None, None
+
+                # sniff in candidate order, one batch at a time, and stop once the
+                # target is confirmed or a newest-first source has gone past the window
+                confirmed = sum(1 for a in items if a.published_at and in_window(a.published_at))
+                batch_size = DATE_SNIFF_WORKERS * 2
+                sniffed = reused = 0
+                stop_reason = ""
+                with ThreadPoolExecutor(
+                    max_workers=min(DATE_SNIFF_WORKERS, len(missing)), thread_name_prefix="date-sniff"
+                ) as ex:
+                    for start in range(0, len(missing), batch_size):
+                        batch = missing[start:start + batch_size]
+                        for a, (pub_iso, page) in zip(batch, ex.map(sniff, batch)):
+                            sniffed += 1
+                            if pub_iso:
+                                a.published_at = pub_iso
+                                a.id = _article_id(source_slug, a.url, a.published_at)
+                                patterns.observe(source_slug, a.url, pub_iso)
+                                confirmed += 1 if in_window(pub_iso) else 0
+                            else:
+                                a.extraction_notes.append("date_sniff_failed")
+                            if page is not None and html_cache is not None:
+                                html_cache[a.url] = page
+                                cached_urls.add(a.url)
+                                reused += 1
+                            if sniffed % 25 == 0:
+                                log.append(f"[{source.country} | {source.name}] Date sniff progress: {sniffed}/{len(missing)}")
+
+                        if confirmed >= target_n:
+                            stop_reason = f"{confirmed} items confirmed in the window"
+                        elif _past_window(items, batch, window[0]):
+                            stop_reason = f"items are older than {window[0].isoformat()}"
+                        if stop_reason and sniffed < len(missing):
+                            log.append(
+                                f"[{source.country} | {source.name}] Date sniff stopped early after {sniffed}/{len(missing)}: "
+                                f"{stop_reason}"
+                            )
+                            break
+                sniff_timer.items = sniffed
+                if html_cache is not None:
+                    log.append(f"[{source.country} | {source.name}] Date sniff kept {reused} pages for extraction")
 
     if mode == FETCH_MODE_ON_DATE:
         if on_date is None:
@@ -1053,6 +1708,14 @@ def fetch_discovery_items(
 
     items = items[:target_n]
 
+    if cached_urls and html_cache is not None:
+        # keep sniffed pages only for items that go on to extraction
+        dropped = cached_urls - {a.url for a in items}
+        for u in dropped:
+            html_cache.pop(u, None)
+        if dropped:
+            log.append(f"[{source.country} | {source.name}] Date sniff released {len(dropped)} pages of dropped items")
+
     log.append(
         f"[{source.country} | {source.name}] Discovery={discovery_method} endpoint={endpoint_used} "
         f"mode={mode} returned={len(items)} (target={target_n})"
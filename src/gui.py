@@ -1,19 +1,20 @@
 from __future__ import annotations
 import traceback
-import csv
 import html
 import json
 import os
 import re
 import sys
+import threading
 import webbrowser
-from dataclasses import dataclass
-from datetime import date, datetime
-from typing import Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QUrl
+from PyQt6.QtCore import QModelIndex, Qt, QThread, QTimer, pyqtSignal, QUrl
 from PyQt6.QtGui import QAction, QDesktopServices
 from PyQt6.QtWidgets import (
+    QAbstractItemView,
     QApplication,
     QCheckBox,
     QComboBox,
@@ -36,6 +37,7 @@ from PyQt6.QtWidgets import (
     QSpinBox,
     QSplitter,
     QTabWidget,
+    QTableView,
     QTableWidget,
     QTableWidgetItem,
     QTextBrowser,
@@ -45,7 +47,7 @@ from PyQt6.QtWidgets import (
 
 from .models import Endpoint, Source, Article
 from .sources_repo import load_sources, save_sources
-from .tor_client import get_managed_tor_session
+from .tor_client import STATE_FAILED, STATE_READY, get_managed_tor_session, get_tor_service
 from .fetcher import (
     fetch_discovery_items,
     FETCH_MODE_ANY,
@@ -53,7 +55,41 @@ from .fetcher import (
     FETCH_MODE_ON_DATE,
     FETCH_MODE_DATE_RANGE,
 )
-from .extractor import extract_article_metadata_and_text
+from .extract_pool import DEFAULT_FETCH_WORKERS, DEFAULT_PARSE_WORKERS, ExtractionPool
+from .extractor import PrefetchedPage
+from .snapshot_store import SnapshotStore
+from .http_stream import TRANSFER_STATS
+from .telemetry import FETCH_TELEMETRY
+from .profiling import (
+    PROFILE_CPROFILE,
+    PROFILE_OFF,
+    PROFILE_SAMPLING,
+    STAGE_DISCOVERY,
+    STAGE_EXTRACTION,
+    STAGE_LAYER2,
+    STAGE_LAYER3,
+    STAGE_SAVE,
+    STAGE_SHORTLISTING,
+    ProfileCapture,
+    RunProfiler,
+)
+from .host_limiter import unhealthy_hosts_summary
+from .endpoint_health import STATUS_FAILING, EndpointHealthStore
+from .routing import ROUTE_DIRECT, ROUTE_TOR, RouteSessions, parse_route, route_for, route_report
+from .url_dates import UrlDatePatternStore
+from .search_index import ArticleSearchIndex, article_key
+from .table_models import ArticleTableModel, ColumnSpec, sort_articles
+from .archive_index import (
+    ArchiveHit,
+    ArchiveQuery,
+    archive_facets,
+    count_archive_articles,
+    iter_archive_articles,
+    load_archive_articles,
+    query_archive,
+    update_archive_index,
+)
+from .exporter import HAS_PYARROW, ExportStats, export_articles, format_for_path, iter_run_articles
 
 # legacy storage
 from .storage import save_articles_country_source, load_all_articles as load_all_articles_legacy
@@ -67,6 +103,13 @@ from .keywords import (
     save_keywords_threat,
     shortlist_articles_two_layer,
     ShortlistResult,
+    is_shortlisted,
+    national_hits,
+    threat_hits,
+    GATE_DEFER,
+    GATE_OFF,
+    GATE_SKIP,
+    gate_by_national_signal,
 )
 
 # analysis layers
@@ -242,29 +285,89 @@ def _bucket_from_prepriority(v: Optional[float]) -> str:
     return "LOW"
 
 
-def _get_kw_nat(a: Article) -> List[str]:
-    # Prefer spec field, fall back to legacy/raw
-    if getattr(a, "kw_national_hits", None):
-        return list(a.kw_national_hits or [])
-    if getattr(a, "keywords_national_matched", None):
-        return list(a.keywords_national_matched or [])
-    return list((a.raw or {}).get("kw_national_hits") or [])
+# -----------------------
+# Table columns (Browse / Analysis)
+# -----------------------
+def _title_of(a: Article) -> str:
+    return a.title if a.title and a.title != a.url else (a.url or "")
+
+
+def _has_fulltext(a: Article) -> bool:
+    return bool(a.content_text and len(a.content_text) > 200)
+
+
+def _fmt_score(x) -> str:
+    if x is None:
+        return ""
+    if isinstance(x, (int, float)):
+        return f"{float(x):.1f}"
+    return str(x)
 
 
-def _get_kw_thr(a: Article) -> List[str]:
-    if getattr(a, "kw_threat_hits", None):
-        return list(a.kw_threat_hits or [])
-    if getattr(a, "keywords_threat_matched", None):
-        return list(a.keywords_threat_matched or [])
-    return list((a.raw or {}).get("kw_threat_hits") or [])
+def _num_or_none(x) -> Optional[float]:
+    try:
+        return float(x) if x is not None else None
+    except Exception:
+        return None
 
 
-def _is_shortlisted(a: Article) -> bool:
-    if getattr(a, "shortlisted", None) is True:
-        return True
-    if (a.raw or {}).get("kw_shortlisted") is True:
-        return True
-    return False
+def _score_column(header: str, attr: str) -> ColumnSpec:
+    return ColumnSpec(
+        header,
+        lambda a: _fmt_score(getattr(a, attr, None)),
+        lambda a: _num_or_none(getattr(a, attr, None)),
+    )
+
+
+BROWSE_COLUMNS: List[ColumnSpec] = [
+    ColumnSpec("Title", _title_of, lambda a: _title_of(a).casefold()),
+    ColumnSpec("Country", lambda a: a.country or ""),
+    ColumnSpec("Source", lambda a: a.source_name or "", lambda a: (a.source_name or "").casefold()),
+    ColumnSpec("Published", lambda a: a.published_at or ""),
+    ColumnSpec("Full?", lambda a: "YES" if _has_fulltext(a) else "NO"),
+    ColumnSpec("Nat hits", lambda a: str(len(national_hits(a))), lambda a: len(national_hits(a))),
+    ColumnSpec("Threat hits", lambda a: str(len(threat_hits(a))), lambda a: len(threat_hits(a))),
+    ColumnSpec("Shortlisted?", lambda a: "YES" if is_shortlisted(a) else "NO"),
+]
+
+ANALYSIS_COLUMNS: List[ColumnSpec] = [
+    ColumnSpec("Title", _title_of, lambda a: _title_of(a).casefold()),
+    _score_column("PrePriority", "prepriority_score"),
+    ColumnSpec(
+        "Bucket",
+        lambda a: str(getattr(a, "prepriority_bucket", None) or _bucket_from_prepriority(getattr(a, "prepriority_score", None))),
+    ),
+    _score_column("R", "relevance_score"),
+    _score_column("E", "evidence_numeric"),
+    _score_column("U", "urgency_score"),
+    _score_column("K", "keyword_intensity"),
+    _score_column("T", "threat_score"),
+    ColumnSpec("ThreatLevel", lambda a: str(getattr(a, "threat_level", None) or "")),
+    ColumnSpec("Vector", lambda a: str(getattr(a, "threat_vector", None) or "")),
+    _score_column("RiskIndex", "risk_index"),
+    ColumnSpec("Published", lambda a: a.published_at or ""),
+]
+
+
+def _make_article_view(model: ArticleTableModel) -> QTableView:
+    view = QTableView()
+    view.setModel(model)
+    view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+    view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    view.setWordWrap(False)
+    view.setAlternatingRowColors(True)
+
+    # fixed row height: no per-row size computation on large tables
+    vh = view.verticalHeader()
+    vh.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+    vh.setDefaultSectionSize(view.fontMetrics().height() + 8)
+
+    h = view.horizontalHeader()
+    h.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+    h.setResizeContentsPrecision(200)
+    for col in range(1, model.columnCount()):
+        h.setSectionResizeMode(col, QHeaderView.ResizeMode.ResizeToContents)
+    return view
 
 
 # -----------------------
@@ -278,6 +381,12 @@ class RunConfig:
     on_date: Optional[date] = None
     from_date: Optional[date] = None
     to_date: Optional[date] = None
+    fetch_workers: int = DEFAULT_FETCH_WORKERS   # concurrent article downloads
+    parse_workers: int = DEFAULT_PARSE_WORKERS   # extraction processes (0 = in-thread)
+    relevance_gate: str = GATE_OFF               # off / defer / skip zero-signal items
+    national_keywords: List[str] = field(default_factory=list)
+    save_snapshots: bool = True                  # keep raw HTML for offline re-extraction
+    profile: str = PROFILE_OFF                   # off / cprofile / sampling dump into <run>/profile/
 
 
 class WorkerFetch(QThread):
@@ -295,6 +404,25 @@ class WorkerFetch(QThread):
     def request_stop(self) -> None:
         self._stop = True
 
+    def _filter_by_date(self, items: List[Article]) -> List[Article]:
+        if self.cfg.mode == "on_date" and self.cfg.on_date:
+            return [x for x in items if _iso_to_date(x.published_at) == self.cfg.on_date]
+        if self.cfg.mode == "range":
+            fd, td = self.cfg.from_date, self.cfg.to_date
+
+            def _in_range(a: Article) -> bool:
+                d = _iso_to_date(a.published_at)
+                if not d:
+                    return False
+                if fd and d < fd:
+                    return False
+                if td and d > td:
+                    return False
+                return True
+
+            return [x for x in items if _in_range(x)]
+        return items
+
     def run(self) -> None:
         try:
             logs: List[str] = []
@@ -302,9 +430,41 @@ class WorkerFetch(QThread):
 
             run_dir = create_run_dir(self.base_dir)
             logs.append(f"[RUN] {run_dir}")
-
-            client = get_managed_tor_session(app_base_dir=self.base_dir)
-            session = client.session
+            net_start = TRANSFER_STATS.snapshot()
+            routes_start = TRANSFER_STATS.snapshot_routes()
+            FETCH_TELEMETRY.begin_run(run_dir)  # per-request events -> <run>/metrics.jsonl
+            profiler = RunProfiler(run_dir)     # per-stage timings -> <run>/meta.json
+            capture = ProfileCapture(self.cfg.profile, run_dir)
+            capture.start()
+
+            # one session per route (tor / direct / proxy), opened when a source first needs it;
+            # the Tor service is warmed up at app start, so this only waits if it is still bootstrapping
+            routes = RouteSessions(
+                lambda: get_managed_tor_session(
+                    app_base_dir=self.base_dir,
+                    on_progress=lambda st: self.progress.emit(f"Waiting for Tor: {st.describe()}"),
+                )
+            )
+            health = EndpointHealthStore.load(self.base_dir)
+            url_dates = UrlDatePatternStore.load(self.base_dir)
+            pool: Optional[ExtractionPool] = None
+            deferred: List[Tuple[str, List[Article], object]] = []  # (source label, items, route session)
+            # pages downloaded while sniffing dates (date modes), reused by extraction
+            html_cache: Optional[Dict[str, PrefetchedPage]] = None
+            if self.cfg.extract_full_text:
+                pool = ExtractionPool(
+                    None,  # each batch brings its source's route session
+                    fetch_workers=self.cfg.fetch_workers,
+                    parse_workers=self.cfg.parse_workers,
+                    timeout=30,
+                    snapshots=SnapshotStore.for_base_dir(self.base_dir) if self.cfg.save_snapshots else None,
+                )
+                html_cache = {}
+                logs.append(
+                    f"[EXTRACT] fetch_workers={pool.fetch_workers} parse_workers={pool.parse_workers} "
+                    f"processes={'yes' if pool.uses_processes else 'no'} "
+                    f"snapshots={pool.snapshots.codec if pool.snapshots else 'off'}"
+                )
             try:
                 for s in self.sources:
                     if self._stop:
@@ -314,6 +474,11 @@ class WorkerFetch(QThread):
                         continue
 
                     self.progress.emit(f"Discovering: {s.country} | {s.name}")
+                    try:
+                        session = routes.for_source(s)
+                    except Exception as ex:
+                        logs.append(f"[ROUTE] {s.country} | {s.name} skipped: route {route_for(s)}: {ex}")
+                        continue
 
                     fetcher_mode = FETCH_MODE_ANY
                     kwargs = {}
@@ -330,58 +495,106 @@ class WorkerFetch(QThread):
                         kwargs["date_to"] = self.cfg.to_date
                         kwargs["latest_n"] = self.cfg.limit_items_per_source
 
-                    items, log_lines = fetch_discovery_items(
-                        session=session,
-                        source=s,
-                        limit_items=self.cfg.limit_items_per_source,
-                        timeout=30,
-                        mode=fetcher_mode,
-                        **kwargs,
-                    )
+                    label = f"{s.country} | {s.name}"
+                    with profiler.stage(STAGE_DISCOVERY, label) as st:
+                        items, log_lines = fetch_discovery_items(
+                            session=session,
+                            source=s,
+                            limit_items=self.cfg.limit_items_per_source,
+                            timeout=30,
+                            mode=fetcher_mode,
+                            health=health,
+                            html_cache=html_cache,
+                            url_dates=url_dates,
+                            routes=routes,
+                            profiler=profiler,
+                            **kwargs,
+                        )
+                        st.items = len(items)
                     logs.extend(log_lines)
-
-                    if self.cfg.extract_full_text:
-                        for i, a in enumerate(items):
-                            if self._stop:
-                                break
-                            self.progress.emit(f"Extracting: {s.name} ({i+1}/{len(items)})")
-                            title, author, published_iso, text, note = extract_article_metadata_and_text(
-                                session, a.url, timeout=30
+                    try:
+                        health.save()
+                    except Exception as ex:
+                        logs.append(f"[HEALTH] could not save endpoint health: {type(ex).__name__}: {ex}")
+                    try:
+                        url_dates.save()
+                    except Exception as ex:
+                        logs.append(f"[DATES] could not save URL date patterns: {type(ex).__name__}: {ex}")
+
+                    if pool is not None and items:
+                        to_extract = items
+                        if self.cfg.relevance_gate != GATE_OFF:
+                            gate = gate_by_national_signal(items, self.cfg.national_keywords)
+                            to_extract = gate.with_signal
+                            if gate.without_signal:
+                                if self.cfg.relevance_gate == GATE_SKIP:
+                                    for x in gate.without_signal:
+                                        x.extraction_notes.append(
+                                            "extraction skipped: no national keyword in title/summary/url"
+                                        )
+                                        html_cache.pop(x.url, None)  # sniffed page no longer needed
+                                    all_articles.extend(self._filter_by_date(gate.without_signal))
+                                else:
+                                    deferred.append((label, gate.without_signal, session))
+                            logs.append(
+                                f"[GATE] {s.name}: {len(gate.with_signal)} with signal, "
+                                f"{len(gate.without_signal)} "
+                                f"{'skipped' if self.cfg.relevance_gate == GATE_SKIP else 'deferred'}"
                             )
-                            if title and (not a.title or a.title == a.url):
-                                a.title = title
-                            if author and not a.author:
-                                a.author = author
-                            if published_iso and not a.published_at:
-                                a.published_at = published_iso
-                            if text:
-                                a.content_text = text
-                                a.content_length = len(text)
-                            if note:
-                                a.extraction_notes.append(note)
-
-                    if self.cfg.mode == "on_date" and self.cfg.on_date:
-                        items = [x for x in items if _iso_to_date(x.published_at) == self.cfg.on_date]
-                    elif self.cfg.mode == "range":
-                        fd, td = self.cfg.from_date, self.cfg.to_date
-
-                        def _in_range(a: Article) -> bool:
-                            d = _iso_to_date(a.published_at)
-                            if not d:
-                                return False
-                            if fd and d < fd:
-                                return False
-                            if td and d > td:
-                                return False
-                            return True
+                        with profiler.stage(STAGE_EXTRACTION, label, items=len(to_extract)):
+                            pool.extract(
+                                to_extract,
+                                prefetched=html_cache,
+                                session=session,
+                                source=label,
+                                should_stop=lambda: self._stop,
+                                progress=lambda done, total, name=s.name: self.progress.emit(
+                                    f"Extracting: {name} ({done}/{total})"
+                                ),
+                            )
+                        items = to_extract
 
-                        items = [x for x in items if _in_range(x)]
+                    all_articles.extend(self._filter_by_date(items))
 
-                    all_articles.extend(items)
+                # deferred zero-signal items: extracted only once every source is done
+                for name, items, session in deferred:
+                    if self._stop:
+                        for x in items:
+                            x.extraction_notes.append("extraction deferred: run stopped")
+                            html_cache.pop(x.url, None)
+                    else:
+                        with profiler.stage(STAGE_EXTRACTION, name, items=len(items)):
+                            pool.extract(
+                                items,
+                                prefetched=html_cache,
+                                session=session,
+                                source=name,
+                                should_stop=lambda: self._stop,
+                                progress=lambda done, total, name=name: self.progress.emit(
+                                    f"Extracting (deferred): {name} ({done}/{total})"
+                                ),
+                            )
+                    all_articles.extend(self._filter_by_date(items))
 
-                _save_articles_grouped(run_dir, "fetched", all_articles)
+                with profiler.stage(STAGE_SAVE, items=len(all_articles)):
+                    _save_articles_grouped(run_dir, "fetched", all_articles)
             finally:
-                client.close()
+                if pool is not None:
+                    pool.close()
+                routes.close()
+                logs.append(f"[NET] {TRANSFER_STATS.snapshot().minus(net_start).summary()}")
+                logs.extend(f"[ROUTE] {line}" for line in route_report(routes_start, TRANSFER_STATS.snapshot_routes()))
+                timing = FETCH_TELEMETRY.end_run()
+                if timing is not None and timing.events:
+                    logs.extend(f"[TIMING] {line}" for line in timing.log_lines())
+                logs.extend(f"[HOST] {line}" for line in unhealthy_hosts_summary())
+                try:
+                    profiler.dumps = capture.stop()
+                    profiler.save()
+                except Exception as ex:
+                    logs.append(f"[PROFILE] could not write profile: {type(ex).__name__}: {ex}")
+                logs.extend(f"[STAGE] {line}" for line in profiler.log_lines())
+                logs.extend(f"[PROFILE] wrote {p}" for p in profiler.dumps)
 
             self.finished_ok.emit(all_articles, logs, run_dir)
         except Exception as ex:
@@ -396,10 +609,11 @@ class WorkerLLM(QThread):
     finished_ok = pyqtSignal(int)  # count processed
     finished_fail = pyqtSignal(str)
 
-    def __init__(self, articles: List[Article], model_path: str) -> None:
+    def __init__(self, articles: List[Article], model_path: str, profiler: RunProfiler) -> None:
         super().__init__()
         self.articles = articles
         self.model_path = model_path
+        self.profiler = profiler
 
     def run(self) -> None:
         try:
@@ -431,8 +645,9 @@ class WorkerLLM(QThread):
                 cb(f"[LLM] Model size read failed: {type(ex).__name__}: {ex}")
 
             # Call into analysis with progress callback
-            al.run_layer3_llm_scoring(self.articles, self.model_path, progress_cb=cb)
-            al.compute_risk_index(self.articles)
+            with self.profiler.stage(STAGE_LAYER3, items=len(self.articles)):
+                al.run_layer3_llm_scoring(self.articles, self.model_path, progress_cb=cb)
+                al.compute_risk_index(self.articles)
 
             self.finished_ok.emit(len(self.articles))
 
@@ -443,9 +658,280 @@ class WorkerLLM(QThread):
 
 
 
+# -----------------------
+# Worker thread (archive index)
+# -----------------------
+class WorkerArchiveIndex(QThread):
+    finished_ok = pyqtSignal(str)
+    finished_fail = pyqtSignal(str)
+
+    def __init__(self, base_dir: str, run_dirs: Optional[List[str]] = None) -> None:
+        super().__init__()
+        self.base_dir = base_dir
+        self.run_dirs = run_dirs
+
+    def run(self) -> None:
+        try:
+            st = update_archive_index(self.base_dir, self.run_dirs)
+            self.finished_ok.emit(
+                f"[ARCHIVE] Index updated: runs={st.runs_scanned} files={st.files_indexed}/{st.files_scanned} "
+                f"removed={st.files_removed} articles={st.articles_indexed}"
+            )
+        except Exception as ex:
+            self.finished_fail.emit(f"{type(ex).__name__}: {ex}")
+
+
+# -----------------------
+# Worker thread (export)
+# -----------------------
+class WorkerReextract(QThread):
+    """
+    Re-run extraction for a run's fetched articles from stored HTML snapshots.
+    No network access; results are written back to <run>/fetched.
+    """
+    progress = pyqtSignal(str)
+    finished_ok = pyqtSignal(list, list, str)  # articles, logs, run_dir
+    finished_fail = pyqtSignal(str)
+
+    def __init__(self, base_dir: str, run_dir: str, parse_workers: int) -> None:
+        super().__init__()
+        self.base_dir = base_dir
+        self.run_dir = run_dir
+        self.parse_workers = parse_workers
+        self._stop = False
+
+    def request_stop(self) -> None:
+        self._stop = True
+
+    def run(self) -> None:
+        try:
+            logs: List[str] = [f"[REEXTRACT] {self.run_dir}"]
+            articles = load_articles_from_run(self.run_dir, subfolder="fetched")
+            store = SnapshotStore.for_base_dir(self.base_dir)
+
+            with ExtractionPool(None, parse_workers=self.parse_workers) as pool:
+                done, missing = pool.reextract(
+                    articles,
+                    store,
+                    should_stop=lambda: self._stop,
+                    progress=lambda d, t: self.progress.emit(f"Re-extracting from snapshots ({d}/{t})"),
+                )
+
+            if self._stop:
+                logs.append("[STOP] user requested stop (run not modified)")
+            elif done:
+                _save_articles_grouped(self.run_dir, "fetched", articles)
+            logs.append(f"[REEXTRACT] re-extracted={done} without_snapshot={missing} total={len(articles)}")
+            self.finished_ok.emit(articles, logs, self.run_dir)
+        except Exception as ex:
+            self.finished_fail.emit(f"{type(ex).__name__}: {ex}")
+
+
+class WorkerExport(QThread):
+    progress = pyqtSignal(int, int)  # rows written, total (0 = unknown)
+    finished_ok = pyqtSignal(object)  # ExportStats
+    finished_fail = pyqtSignal(str)
+
+    def __init__(
+        self,
+        make_articles: Callable[[], Iterable[Article]],
+        path: str,
+        fmt: str,
+        total: int = 0,
+        count_total: Optional[Callable[[], int]] = None,
+    ) -> None:
+        super().__init__()
+        self.make_articles = make_articles
+        self.path = path
+        self.fmt = fmt
+        self.total = total
+        self.count_total = count_total
+        self._stop = False
+
+    def request_stop(self) -> None:
+        self._stop = True
+
+    def run(self) -> None:
+        try:
+            if self.count_total is not None:
+                self.total = int(self.count_total())
+            self.progress.emit(0, self.total)
+            st = export_articles(
+                self.make_articles(),
+                self.path,
+                self.fmt,
+                progress=lambda n: self.progress.emit(n, self.total),
+                should_stop=lambda: self._stop,
+            )
+            self.finished_ok.emit(st)
+        except Exception as ex:
+            self.finished_fail.emit(f"{type(ex).__name__}: {ex}")
+
+
+# -----------------------
+# View engine (Browse/Analysis filtering + sorting off the UI thread)
+# -----------------------
+SEARCH_DEBOUNCE_MS = 200
+
+
+@dataclass
+class ViewRequest:
+    articles: List[Article]
+    country: str = "ALL"
+    source: str = "ALL"
+    query: str = ""
+    only_shortlisted: bool = False
+    only_fulltext: bool = False
+    browse_sort: Tuple[int, Qt.SortOrder] = (-1, Qt.SortOrder.AscendingOrder)
+    analysis_sort: Tuple[int, Qt.SortOrder] = (-1, Qt.SortOrder.AscendingOrder)
+    browse: bool = False
+    analysis: bool = False
+    kpis: bool = False
+    reindex: str = ""  # "", "update", "rebuild"
+    generation: int = 0
+
+
+@dataclass
+class ViewResult:
+    generation: int
+    articles: List[Article]
+    browse_rows: Optional[List[Article]] = None
+    analysis_rows: Optional[List[Article]] = None
+    kpis: Optional[Tuple[int, int, int]] = None
+
+
+_REINDEX_RANK = {"": 0, "update": 1, "rebuild": 2}
+
+
+def _merge_view_requests(old: ViewRequest, new: ViewRequest) -> ViewRequest:
+    """
+    Newest UI state wins; pending work flags accumulate.
+    """
+    new.browse = new.browse or old.browse
+    new.analysis = new.analysis or old.analysis
+    new.kpis = new.kpis or old.kpis
+    if _REINDEX_RANK.get(old.reindex, 0) > _REINDEX_RANK.get(new.reindex, 0):
+        new.reindex = old.reindex
+    return new
+
+
+def _filter_browse(req: ViewRequest, search_index: ArticleSearchIndex) -> List[Article]:
+    items = req.articles
+    c, s = req.country, req.source
+    if c != "ALL" or s != "ALL" or req.only_shortlisted or req.only_fulltext:
+        items = [
+            a for a in items
+            if (c == "ALL" or a.country == c)
+            and (s == "ALL" or a.source_name == s)
+            and (not req.only_shortlisted or is_shortlisted(a))
+            and (not req.only_fulltext or _has_fulltext(a))
+        ]
+    else:
+        items = list(items)
+
+    q = (req.query or "").strip().lower()
+    if q:
+        if search_index.available:
+            # unstripped: a trailing space ends prefix matching on the last word
+            keys = search_index.search(req.query)
+            if keys is not None:
+                items = [a for a in items if article_key(a) in keys]
+        else:
+            def ok(a: Article) -> bool:
+                hay = " ".join([a.title or "", a.summary or "", a.content_text or "", a.url or ""]).lower()
+                return q in hay
+            items = [a for a in items if ok(a)]
+
+    col, order = req.browse_sort
+    return sort_articles(items, BROWSE_COLUMNS, col, order)
+
+
+def compute_view(req: ViewRequest, search_index: ArticleSearchIndex) -> ViewResult:
+    if req.reindex == "rebuild":
+        search_index.rebuild(req.articles)
+    elif req.reindex == "update":
+        search_index.update(req.articles)
+
+    res = ViewResult(generation=req.generation, articles=req.articles)
+    if req.browse:
+        res.browse_rows = _filter_browse(req, search_index)
+    if req.analysis:
+        col, order = req.analysis_sort
+        res.analysis_rows = sort_articles(req.articles, ANALYSIS_COLUMNS, col, order)
+    if req.kpis:
+        res.kpis = (
+            len(req.articles),
+            sum(1 for a in req.articles if is_shortlisted(a)),
+            sum(1 for a in req.articles if _has_fulltext(a)),
+        )
+    return res
+
+
+class WorkerViewEngine(QThread):
+    """
+    Long-lived worker. Only the latest submitted request is kept; requests that
+    arrive while one is computing are merged and the stale result is dropped.
+    """
+
+    result_ready = pyqtSignal(object)  # ViewResult
+    failed = pyqtSignal(str)
+
+    def __init__(self, search_index: ArticleSearchIndex) -> None:
+        super().__init__()
+        self.search_index = search_index
+        self._cond = threading.Condition()
+        self._pending: Optional[ViewRequest] = None
+        self._stop = False
+
+    def submit(self, req: ViewRequest) -> None:
+        with self._cond:
+            if self._pending is not None:
+                req = _merge_view_requests(self._pending, req)
+            self._pending = req
+            self._cond.notify()
+
+    def request_stop(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+
+    def run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stop:
+                    self._cond.wait()
+                if self._stop:
+                    return
+                req = self._pending
+                self._pending = None
+
+            try:
+                res = compute_view(req, self.search_index)
+            except Exception as ex:
+                self.failed.emit(f"{type(ex).__name__}: {ex}")
+                continue
+
+            with self._cond:
+                if self._pending is not None:
+                    # superseded: fold this request's work into the next one
+                    # (the index is already rebuilt, so do not repeat that)
+                    req.reindex = ""
+                    self._pending = _merge_view_requests(req, self._pending)
+                    continue
+            self.result_ready.emit(res)
+
+
 # -----------------------
 # Source editor dialog
 # -----------------------
+def _route_combo(current: str, *, allow_inherit: bool) -> QComboBox:
+    cmb = QComboBox()
+    cmb.setEditable(True)  # proxy:<URL> is typed in
+    cmb.addItems(([""] if allow_inherit else []) + [ROUTE_TOR, ROUTE_DIRECT, "proxy:socks5h://127.0.0.1:1080"])
+    cmb.setCurrentText(current)
+    return cmb
+
+
 class SourceEditorDialog(QDialog):
     def __init__(self, parent: QWidget, src: Optional[Source] = None) -> None:
         super().__init__(parent)
@@ -456,6 +942,7 @@ class SourceEditorDialog(QDialog):
         self.name = QLineEdit(src.name if src else "")
         self.enabled = QCheckBox("Enabled")
         self.enabled.setChecked(src.enabled if src else True)
+        self.route = _route_combo(src.route if src else ROUTE_TOR, allow_inherit=False)
 
         self.endpoints = QListWidget()
         if src:
@@ -475,6 +962,7 @@ class SourceEditorDialog(QDialog):
         form = QFormLayout()
         form.addRow("Country", self.country)
         form.addRow("Source Name", self.name)
+        form.addRow("Route (tor / direct / proxy:<URL>)", self.route)
         form.addRow("", self.enabled)
 
         ep_box = QGroupBox("Endpoints")
@@ -497,7 +985,8 @@ class SourceEditorDialog(QDialog):
         root.addLayout(bottom)
 
     def _add_endpoint_item(self, ep: Endpoint) -> None:
-        item = QListWidgetItem(f"{ep.type} | {ep.url} | {ep.note} | enabled={ep.enabled}")
+        route = f" | route={ep.route}" if ep.route else ""
+        item = QListWidgetItem(f"{ep.type} | {ep.url} | {ep.note} | enabled={ep.enabled}{route}")
         item.setData(Qt.ItemDataRole.UserRole, ep)
         self.endpoints.addItem(item)
 
@@ -508,6 +997,7 @@ class SourceEditorDialog(QDialog):
         t = QLineEdit("RSS")
         u = QLineEdit()
         n = QLineEdit()
+        r = _route_combo("", allow_inherit=True)
         en = QCheckBox("Enabled")
         en.setChecked(True)
 
@@ -515,6 +1005,7 @@ class SourceEditorDialog(QDialog):
         form.addRow("Type (RSS/FEED_DIRECTORY/HTML_LISTING/SITEMAP_INDEX)", t)
         form.addRow("URL", u)
         form.addRow("Note", n)
+        form.addRow("Route (empty = same as source)", r)
         form.addRow("", en)
 
         btn = QPushButton("Add")
@@ -522,7 +1013,13 @@ class SourceEditorDialog(QDialog):
         form.addRow(btn)
 
         if d.exec() == QDialog.DialogCode.Accepted:
-            ep = Endpoint(type=t.text().strip(), url=u.text().strip(), note=n.text().strip(), enabled=en.isChecked())
+            ep = Endpoint(
+                type=t.text().strip(),
+                url=u.text().strip(),
+                note=n.text().strip(),
+                enabled=en.isChecked(),
+                route=parse_route(r.currentText()),
+            )
             self._add_endpoint_item(ep)
 
     def _on_remove_ep(self) -> None:
@@ -541,6 +1038,7 @@ class SourceEditorDialog(QDialog):
             name=self.name.text().strip(),
             enabled=self.enabled.isChecked(),
             endpoints=eps,
+            route=parse_route(self.route.currentText()) or ROUTE_TOR,
         )
 
 
@@ -557,6 +1055,24 @@ class MainWindow(QMainWindow):
 
         self.sources: List[Source] = load_sources(self.base_dir)
         self.articles_cache: List[Article] = []
+        self.search_index = ArticleSearchIndex()
+
+        # Browse/Analysis/KPI recomputation runs on a single background engine;
+        # UI changes are coalesced by _view_timer before being submitted.
+        self._view_engine = WorkerViewEngine(self.search_index)
+        self._view_engine.result_ready.connect(self._on_view_result)
+        self._view_engine.failed.connect(lambda err: self.log(f"[VIEW] ERROR: {err}"))
+        self._view_engine.start()
+        self._view_generation = 0
+        # generation of the last request whose article list differed from the
+        # one before; results older than that describe a replaced list
+        self._view_list_generation = 0
+        self._view_articles: Optional[List[Article]] = None
+        self._view_flags: Dict[str, object] = {}
+        self._kpi_counts: Tuple[int, int, int] = (0, 0, 0)
+        self._view_timer = QTimer(self)
+        self._view_timer.setSingleShot(True)
+        self._view_timer.timeout.connect(self._flush_view_request)
 
         self.current_run_dir: Optional[str] = None
         self.current_view_subfolder: str = "fetched"
@@ -564,6 +1080,12 @@ class MainWindow(QMainWindow):
         self._last_selected_countries: Set[str] = set()
         self._last_selected_sources: Set[Tuple[str, str]] = set()
 
+        self._archive_worker: Optional[WorkerArchiveIndex] = None
+        self._archive_pending: Optional[List[str]] = None
+        self._archive_pending_full = False
+        self._archive_hits: List[ArchiveHit] = []
+        self._export_worker: Optional[WorkerExport] = None
+
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
 
@@ -575,6 +1097,7 @@ class MainWindow(QMainWindow):
         self.tab_run = self._build_run_tab()
         self.tab_browse = self._build_browse_tab()
         self.tab_analysis = self._build_analysis_tab()
+        self.tab_archive = self._build_archive_tab()
         self.tab_sources = self._build_sources_tab()
         self.tab_keywords = self._build_keywords_tab()
         self.tab_logs = self._build_logs_tab()
@@ -582,6 +1105,7 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.tab_run, "Run")
         self.tabs.addTab(self.tab_browse, "Browse")
         self.tabs.addTab(self.tab_analysis, "Analysis")
+        self.tabs.addTab(self.tab_archive, "Archive")
         self.tabs.addTab(self.tab_sources, "Sources")
         self.tabs.addTab(self.tab_keywords, "Keywords")
         self.tabs.addTab(self.tab_logs, "Logs")
@@ -592,8 +1116,20 @@ class MainWindow(QMainWindow):
         self.status_label = QLabel("Idle")
         self.statusBar().addWidget(self.status_label, 1)
         self.statusBar().addPermanentWidget(self.progress)
+        self.lbl_tor = QLabel("Tor: starting")
+        self.statusBar().addPermanentWidget(self.lbl_tor)
+
+        # Tor bootstraps in the background from app start and stays up across runs
+        self._tor = get_tor_service(self.base_dir)
+        self._tor.start_async()
+        self._tor_logged = ""
+        self._tor_timer = QTimer(self)
+        self._tor_timer.setInterval(500)
+        self._tor_timer.timeout.connect(self._poll_tor)
+        self._tor_timer.start()
 
         self.refresh_ui()
+        self._schedule_archive_index()
 
     # ---------------- Menu ----------------
     def _build_menu(self) -> None:
@@ -665,11 +1201,16 @@ class MainWindow(QMainWindow):
         btn_load_shortlisted = QPushButton("Load Shortlisted")
         btn_load_legacy = QPushButton("Load Legacy")
         btn_open_run = QPushButton("Open Run Folder")
+        btn_export_run = QPushButton("Export Run...")
+        btn_reextract = QPushButton("Re-extract (Snapshots)")
+        btn_reextract.setToolTip("Re-run text extraction from stored HTML snapshots (no network)")
 
         btn_load_fetched.clicked.connect(lambda: self._on_load_selected_run("fetched"))
         btn_load_shortlisted.clicked.connect(lambda: self._on_load_selected_run("shortlisted"))
         btn_load_legacy.clicked.connect(self._on_load_legacy)
         btn_open_run.clicked.connect(self._on_open_selected_run_folder)
+        btn_export_run.clicked.connect(self._on_export_run)
+        btn_reextract.clicked.connect(self._on_reextract_run)
 
         mgr_layout.addWidget(QLabel("Run:"))
         mgr_layout.addWidget(self.cmb_runs, 1)
@@ -677,6 +1218,8 @@ class MainWindow(QMainWindow):
         mgr_layout.addWidget(btn_load_shortlisted)
         mgr_layout.addWidget(btn_load_legacy)
         mgr_layout.addWidget(btn_open_run)
+        mgr_layout.addWidget(btn_export_run)
+        mgr_layout.addWidget(btn_reextract)
 
         self.lbl_kpis = QLabel("Loaded: 0 | Shortlisted: 0 | Full-text: 0 | View: - | Storage: -")
         self.lbl_kpis.setWordWrap(True)
@@ -739,12 +1282,54 @@ class MainWindow(QMainWindow):
 
         self.chk_fulltext = QCheckBox("Extract full article text (recommended)")
         self.chk_fulltext.setChecked(True)
+        self.chk_snapshots = QCheckBox("Keep HTML snapshots (offline re-extraction)")
+        self.chk_snapshots.setChecked(True)
+
+        self.spin_fetch_workers = QSpinBox()
+        self.spin_fetch_workers.setRange(1, 64)
+        self.spin_fetch_workers.setValue(DEFAULT_FETCH_WORKERS)
+        self.spin_fetch_workers.setToolTip("Concurrent article downloads")
+        self.spin_parse_workers = QSpinBox()
+        self.spin_parse_workers.setRange(0, max(1, os.cpu_count() or 1))
+        self.spin_parse_workers.setValue(DEFAULT_PARSE_WORKERS)
+        self.spin_parse_workers.setToolTip("Extraction processes (0 = parse in download threads)")
+
+        workers_widget = QWidget()
+        ww = QHBoxLayout(workers_widget)
+        ww.setContentsMargins(0, 0, 0, 0)
+        ww.addWidget(QLabel("Download"))
+        ww.addWidget(self.spin_fetch_workers)
+        ww.addWidget(QLabel("Parse"))
+        ww.addWidget(self.spin_parse_workers)
+
+        self.cmb_gate = QComboBox()
+        self.cmb_gate.addItem("Off (extract everything)", GATE_OFF)
+        self.cmb_gate.addItem("Defer zero-signal items", GATE_DEFER)
+        self.cmb_gate.addItem("Skip zero-signal items", GATE_SKIP)
+        self.cmb_gate.setToolTip(
+            "Check title/summary/URL for a national keyword before extraction.\n"
+            "Defer: extract items without a hit after all sources.\n"
+            "Skip: never extract items without a hit."
+        )
+
+        self.cmb_profile = QComboBox()
+        self.cmb_profile.addItem("Off (stage timings only)", PROFILE_OFF)
+        self.cmb_profile.addItem("cProfile (fetch worker thread)", PROFILE_CPROFILE)
+        self.cmb_profile.addItem("Sampling (all threads)", PROFILE_SAMPLING)
+        self.cmb_profile.setToolTip(
+            "Stage timings are always written to the run's meta.json.\n"
+            "cProfile / Sampling also write profiler dumps to <run>/profile/."
+        )
 
         c.addRow(mode_box)
         c.addRow("N (per source)", self.spin_limit)
         c.addRow("Date", self.txt_on_date)
         c.addRow("Range", range_widget)
         c.addRow("", self.chk_fulltext)
+        c.addRow("", self.chk_snapshots)
+        c.addRow("Workers", workers_widget)
+        c.addRow("Relevance gate", self.cmb_gate)
+        c.addRow("Profiling", self.cmb_profile)
 
         actions = QGroupBox("Actions")
         a = QVBoxLayout(actions)
@@ -806,17 +1391,17 @@ class MainWindow(QMainWindow):
         self.cmb_country_filter = QComboBox()
         self.cmb_source_filter = QComboBox()
         self.txt_search = QLineEdit()
-        self.txt_search.setPlaceholderText("Search title/summary/content/url...")
+        self.txt_search.setPlaceholderText('Search title/summary/content/url: terms, "exact phrase", prefix*')
         self.chk_only_shortlisted = QCheckBox("Only shortlisted")
         self.chk_only_fulltext = QCheckBox("Only full-text")
 
         self.cmb_country_filter.currentIndexChanged.connect(self._refresh_browse)
         self.cmb_source_filter.currentIndexChanged.connect(self._refresh_browse)
-        self.txt_search.textChanged.connect(self._refresh_browse)
+        self.txt_search.textChanged.connect(lambda _t: self._request_view(browse=True, delay_ms=SEARCH_DEBOUNCE_MS))
         self.chk_only_shortlisted.stateChanged.connect(self._refresh_browse)
         self.chk_only_fulltext.stateChanged.connect(self._refresh_browse)
 
-        btn_export_csv = QPushButton("Export CSV")
+        btn_export_csv = QPushButton("Export...")
         btn_export_csv.clicked.connect(self._on_export_csv)
 
         btn_open_storage = QPushButton("Open Storage")
@@ -834,20 +1419,12 @@ class MainWindow(QMainWindow):
 
         splitter = QSplitter(Qt.Orientation.Horizontal)
 
-        self.tbl_articles = QTableWidget(0, 8)
-        self.tbl_articles.setHorizontalHeaderLabels(
-            ["Title", "Country", "Source", "Published", "Full?", "Nat hits", "Threat hits", "Shortlisted?"]
-        )
-        self.tbl_articles.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.tbl_articles.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.browse_model = ArticleTableModel(BROWSE_COLUMNS, self)
+        self.browse_model.sort_handler = lambda _c, _o: self._request_view(browse=True)
+        self.tbl_articles = _make_article_view(self.browse_model)
         self.tbl_articles.setSortingEnabled(True)
-        self.tbl_articles.itemSelectionChanged.connect(self._on_article_selected)
-        self.tbl_articles.itemDoubleClicked.connect(self._on_article_double_click)
-
-        header = self.tbl_articles.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        for col in range(1, 8):
-            header.setSectionResizeMode(col, QHeaderView.ResizeMode.ResizeToContents)
+        self.tbl_articles.selectionModel().selectionChanged.connect(self._on_article_selected)
+        self.tbl_articles.doubleClicked.connect(self._on_article_double_click)
 
         self.detail = QTextBrowser()
         self.detail.setReadOnly(True)
@@ -912,20 +1489,14 @@ class MainWindow(QMainWindow):
 
         splitter = QSplitter(Qt.Orientation.Horizontal)
 
-        self.tbl_analysis = QTableWidget(0, 12)
-        self.tbl_analysis.setHorizontalHeaderLabels(
-            ["Title", "PrePriority", "Bucket", "R", "E", "U", "K", "T", "ThreatLevel", "Vector", "RiskIndex", "Published"]
-        )
-        self.tbl_analysis.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.tbl_analysis.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.analysis_model = ArticleTableModel(ANALYSIS_COLUMNS, self)
+        self.analysis_model.sort_handler = lambda _c, _o: self._request_view(analysis=True)
+        self.tbl_analysis = _make_article_view(self.analysis_model)
+        # highest PrePriority first until the analyst picks another column
+        self.tbl_analysis.horizontalHeader().setSortIndicator(1, Qt.SortOrder.DescendingOrder)
         self.tbl_analysis.setSortingEnabled(True)
-        self.tbl_analysis.itemSelectionChanged.connect(self._on_analysis_selected)
-        self.tbl_analysis.itemDoubleClicked.connect(self._on_analysis_double_click)
-
-        h = self.tbl_analysis.horizontalHeader()
-        h.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        for col in range(1, 12):
-            h.setSectionResizeMode(col, QHeaderView.ResizeMode.ResizeToContents)
+        self.tbl_analysis.selectionModel().selectionChanged.connect(self._on_analysis_selected)
+        self.tbl_analysis.doubleClicked.connect(self._on_analysis_double_click)
 
         self.analysis_detail = QTextBrowser()
         self.analysis_detail.setReadOnly(True)
@@ -940,6 +1511,90 @@ class MainWindow(QMainWindow):
         root.addWidget(splitter, 1)
         return w
 
+    def _build_archive_tab(self) -> QWidget:
+        w = QWidget()
+        root = QVBoxLayout(w)
+
+        filters = QGroupBox("Archive Query (all runs)")
+        f = QFormLayout(filters)
+
+        self.cmb_arch_country = QComboBox()
+        self.cmb_arch_source = QComboBox()
+        self.cmb_arch_bucket = QComboBox()
+        self.cmb_arch_level = QComboBox()
+        self.cmb_arch_vector = QComboBox()
+
+        self.txt_arch_keywords = QLineEdit()
+        self.txt_arch_keywords.setPlaceholderText("Keyword hits, comma separated (e.g. Balochistan, blast)")
+        self.chk_arch_kw_all = QCheckBox("Require all keywords")
+
+        self.spin_arch_days = QSpinBox()
+        self.spin_arch_days.setRange(0, 3650)
+        self.spin_arch_days.setValue(30)
+        self.spin_arch_days.setSpecialValueText("Any")
+
+        self.txt_arch_from = QLineEdit()
+        self.txt_arch_from.setPlaceholderText("YYYY-MM-DD (overrides Last N days)")
+        self.txt_arch_to = QLineEdit()
+        self.txt_arch_to.setPlaceholderText("YYYY-MM-DD")
+
+        self.chk_arch_shortlisted = QCheckBox("Only shortlisted")
+
+        self.spin_arch_limit = QSpinBox()
+        self.spin_arch_limit.setRange(1, 200000)
+        self.spin_arch_limit.setValue(5000)
+
+        f.addRow("Country", self.cmb_arch_country)
+        f.addRow("Source", self.cmb_arch_source)
+        f.addRow("PrePriority bucket", self.cmb_arch_bucket)
+        f.addRow("Threat level", self.cmb_arch_level)
+        f.addRow("Threat vector", self.cmb_arch_vector)
+        f.addRow("Keywords", self.txt_arch_keywords)
+        f.addRow("", self.chk_arch_kw_all)
+        f.addRow("Last N days", self.spin_arch_days)
+        f.addRow("From", self.txt_arch_from)
+        f.addRow("To", self.txt_arch_to)
+        f.addRow("", self.chk_arch_shortlisted)
+        f.addRow("Max results", self.spin_arch_limit)
+
+        btns = QHBoxLayout()
+        btn_search = QPushButton("Search Archive")
+        btn_search.clicked.connect(self._on_archive_search)
+        btn_reindex = QPushButton("Update Index")
+        btn_reindex.clicked.connect(lambda: self._schedule_archive_index())
+        btn_load = QPushButton("Load Results into Browse")
+        btn_load.clicked.connect(self._on_archive_load_results)
+        btns.addWidget(btn_search)
+        btns.addWidget(btn_reindex)
+        btn_export_arch = QPushButton("Export Results...")
+        btn_export_arch.setToolTip("Stream every match (ignores Max results) to CSV / JSONL / Parquet")
+        btn_export_arch.clicked.connect(self._on_export_archive)
+        btns.addStretch(1)
+        btns.addWidget(btn_export_arch)
+        btns.addWidget(btn_load)
+
+        self.lbl_archive_status = QLabel("Index: -")
+
+        self.tbl_archive = QTableWidget(0, 9)
+        self.tbl_archive.setHorizontalHeaderLabels(
+            ["Title", "Country", "Source", "Published", "Bucket", "ThreatLevel", "Vector", "RiskIndex", "Run"]
+        )
+        self.tbl_archive.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.tbl_archive.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.tbl_archive.setSortingEnabled(True)
+        self.tbl_archive.itemDoubleClicked.connect(self._on_archive_double_click)
+
+        h = self.tbl_archive.horizontalHeader()
+        h.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for col in range(1, 9):
+            h.setSectionResizeMode(col, QHeaderView.ResizeMode.ResizeToContents)
+
+        root.addWidget(filters)
+        root.addLayout(btns)
+        root.addWidget(self.lbl_archive_status)
+        root.addWidget(self.tbl_archive, 1)
+        return w
+
     def _build_sources_tab(self) -> QWidget:
         w = QWidget()
         root = QVBoxLayout(w)
@@ -1015,9 +1670,14 @@ class MainWindow(QMainWindow):
         for c in countries:
             self.country_list.addItem(QListWidgetItem(c))
 
+        EndpointHealthStore.load(self.base_dir).apply_to(self.sources)
         self.sources_list.clear()
         for s in sorted(self.sources, key=lambda x: (x.country, x.name)):
-            self.sources_list.addItem(f"{s.country} | {s.name} | enabled={s.enabled} | endpoints={len(s.endpoints)}")
+            failing = sum(1 for ep in s.endpoints if ep.last_status == STATUS_FAILING)
+            self.sources_list.addItem(
+                f"{s.country} | {s.name} | enabled={s.enabled} | endpoints={len(s.endpoints)}"
+                + (f" | failing={failing}" if failing else "")
+            )
 
         self._refresh_runs_combo()
         self._on_keywords_load()
@@ -1031,9 +1691,7 @@ class MainWindow(QMainWindow):
 
         self._restore_country_source_selection()
         self._refresh_filters()
-        self._refresh_browse()
-        self._refresh_analysis_table()
-        self._update_kpis()
+        self._refresh_views()
 
     def _refresh_runs_combo(self) -> None:
         self.cmb_runs.blockSignals(True)
@@ -1136,6 +1794,12 @@ class MainWindow(QMainWindow):
             on_date=on_d,
             from_date=f_d,
             to_date=t_d,
+            fetch_workers=int(self.spin_fetch_workers.value()),
+            parse_workers=int(self.spin_parse_workers.value()),
+            relevance_gate=str(self.cmb_gate.currentData() or GATE_OFF),
+            national_keywords=[x.strip() for x in self.national_editor.toPlainText().splitlines() if x.strip()],
+            save_snapshots=bool(self.chk_snapshots.isChecked()),
+            profile=str(self.cmb_profile.currentData() or PROFILE_OFF),
         )
 
     # ---------------- Fetch actions ----------------
@@ -1169,6 +1833,50 @@ class MainWindow(QMainWindow):
         if hasattr(self, "worker_fetch") and self.worker_fetch.isRunning():
             self.worker_fetch.request_stop()
             self.log("Stop requested...")
+        if hasattr(self, "worker_reextract") and self.worker_reextract.isRunning():
+            self.worker_reextract.request_stop()
+            self.log("Stop requested...")
+
+    def _on_reextract_run(self) -> None:
+        run_dir = self.cmb_runs.currentText().strip() if self.cmb_runs.count() else ""
+        if not run_dir or not os.path.isdir(run_dir):
+            QMessageBox.warning(self, "No run", "No valid run selected.")
+            return
+        if hasattr(self, "worker_fetch") and self.worker_fetch.isRunning():
+            QMessageBox.information(self, "Busy", "A fetch is already running.")
+            return
+        if hasattr(self, "worker_reextract") and self.worker_reextract.isRunning():
+            QMessageBox.information(self, "Busy", "Re-extraction is already running.")
+            return
+
+        self.worker_reextract = WorkerReextract(self.base_dir, run_dir, int(self.spin_parse_workers.value()))
+        self.worker_reextract.progress.connect(self._on_worker_progress)
+        self.worker_reextract.finished_ok.connect(self._on_reextract_done)
+        self.worker_reextract.finished_fail.connect(self._on_worker_fail)
+
+        self._set_busy(True, "Re-extracting from snapshots...")
+        self.btn_fetch.setEnabled(False)
+        self.btn_stop.setEnabled(True)
+        self.btn_shortlist.setEnabled(False)
+        self.log("=== RE-EXTRACT START ===")
+        self.worker_reextract.start()
+
+    def _on_reextract_done(self, articles: list, logs: list, run_dir: str) -> None:
+        self._set_busy(False, "Re-extraction complete.")
+        self.btn_fetch.setEnabled(True)
+        self.btn_stop.setEnabled(False)
+        self.btn_shortlist.setEnabled(True)
+
+        for line in logs:
+            self.log(line)
+
+        self.current_run_dir = run_dir
+        self.current_view_subfolder = "fetched"
+        self.articles_cache = list(articles)
+        self._schedule_archive_index([run_dir])
+
+        self._refresh_filters()
+        self._refresh_views(reindex="rebuild")
 
     def _on_worker_progress(self, msg: str) -> None:
         self.status_label.setText(msg)
@@ -1190,11 +1898,10 @@ class MainWindow(QMainWindow):
         idx = self.cmb_runs.findText(run_dir)
         if idx >= 0:
             self.cmb_runs.setCurrentIndex(idx)
+        self._schedule_archive_index([run_dir])
 
         self._refresh_filters()
-        self._refresh_browse()
-        self._refresh_analysis_table()
-        self._update_kpis()
+        self._refresh_views(reindex="rebuild")
 
         QMessageBox.information(self, "Fetch complete", f"Fetched & saved {len(articles)} items.\nRun: {run_dir}")
 
@@ -1233,9 +1940,7 @@ class MainWindow(QMainWindow):
         self.log(f"Loaded {len(self.articles_cache)} articles from {run_dir} ({subfolder})")
 
         self._refresh_filters()
-        self._refresh_browse()
-        self._refresh_analysis_table()
-        self._update_kpis()
+        self._refresh_views(reindex="rebuild")
         if not silent:
             QMessageBox.information(self, "Loaded", f"Loaded {len(self.articles_cache)} items.")
 
@@ -1246,9 +1951,7 @@ class MainWindow(QMainWindow):
         self.log("Loaded legacy articles from data/news")
 
         self._refresh_filters()
-        self._refresh_browse()
-        self._refresh_analysis_table()
-        self._update_kpis()
+        self._refresh_views(reindex="rebuild")
         if not silent:
             QMessageBox.information(self, "Loaded", f"Loaded {len(self.articles_cache)} legacy items.")
 
@@ -1275,14 +1978,20 @@ class MainWindow(QMainWindow):
         nat = [x.strip() for x in self.national_editor.toPlainText().splitlines() if x.strip()]
         thr = [x.strip() for x in self.threat_editor.toPlainText().splitlines() if x.strip()]
 
-        res: ShortlistResult = shortlist_articles_two_layer(self.articles_cache, nat, thr)
+        prof = self._stage_profiler()
+        with prof.stage(STAGE_SHORTLISTING, items=len(self.articles_cache)):
+            res: ShortlistResult = shortlist_articles_two_layer(self.articles_cache, nat, thr)
         self.articles_cache = res.articles_all
+        self._finish_stage_profile(prof)
 
         if self.current_run_dir and os.path.isdir(self.current_run_dir):
             _save_articles_grouped(self.current_run_dir, "fetched", self.articles_cache)
-            shortlisted_only = [a for a in self.articles_cache if _is_shortlisted(a)]
+            shortlisted_only = [a for a in self.articles_cache if is_shortlisted(a)]
             _save_articles_grouped(self.current_run_dir, "shortlisted", shortlisted_only)
             self.log(f"Saved shortlisted items to: {self.current_run_dir}/shortlisted")
+            self._schedule_archive_index([self.current_run_dir])
+        elif self.current_view_subfolder == "archive":
+            self.log("Archive view: shortlisting results are not written back to run storage")
         else:
             save_articles_country_source(self.base_dir, self.articles_cache)
             self.log("Saved to legacy data/news (no run selected)")
@@ -1294,11 +2003,23 @@ class MainWindow(QMainWindow):
         )
 
         self._refresh_filters()
-        self._refresh_browse()
-        self._refresh_analysis_table()
-        self._update_kpis()
+        self._refresh_views(reindex="update")
         self.tabs.setCurrentWidget(self.tab_browse)
 
+    # ---------------- Stage timings (post-fetch steps) ----------------
+    def _stage_profiler(self) -> RunProfiler:
+        # timings go into the loaded run's meta.json; archive / legacy views are only logged
+        run_dir = self.current_run_dir if self.current_run_dir and os.path.isdir(self.current_run_dir) else None
+        return RunProfiler(run_dir)
+
+    def _finish_stage_profile(self, prof: RunProfiler) -> None:
+        try:
+            prof.save()
+        except Exception as ex:
+            self.log(f"[PROFILE] could not update meta.json: {type(ex).__name__}: {ex}")
+        for line in prof.log_lines():
+            self.log(f"[STAGE] {line}")
+
     # ---------------- Analysis tab actions ----------------
     def _on_pick_model(self) -> None:
         start_dir = os.path.join(self.base_dir, "data", "models")
@@ -1315,14 +2036,19 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Missing module", "analysis_layers.py is not ready yet.")
             return
 
-        al.compute_layer2_scores(self.articles_cache)
+        prof = self._stage_profiler()
+        with prof.stage(STAGE_LAYER2, items=len(self.articles_cache)):
+            al.compute_layer2_scores(self.articles_cache)
 
         self.log("[ANALYSIS] Computed Layer 2 scores for loaded articles.")
-        self._refresh_analysis_table()
+        self._finish_stage_profile(prof)
+        self.analysis_model.refresh_all()
+        self.analysis_model.resort()
 
         if self.current_run_dir and os.path.isdir(self.current_run_dir):
             _save_articles_grouped(self.current_run_dir, self.current_view_subfolder, self.articles_cache)
             self.log("[ANALYSIS] Saved Layer 2 results into current run storage.")
+            self._schedule_archive_index([self.current_run_dir])
 
         QMessageBox.information(self, "Layer 2 complete", "Computed R, E, U, K, PrePriority for loaded articles.")
 
@@ -1357,7 +2083,7 @@ class MainWindow(QMainWindow):
             QMessageBox.information(self, "Nothing selected", "No articles matched your LLM selection criteria.")
             return
 
-        self.worker_llm = WorkerLLM(chosen, model_path)
+        self.worker_llm = WorkerLLM(chosen, model_path, self._stage_profiler())
         self.worker_llm.progress.connect(self._on_llm_progress)
         self.worker_llm.finished_ok.connect(self._on_llm_done)
         self.worker_llm.finished_fail.connect(self._on_llm_fail)
@@ -1381,11 +2107,14 @@ class MainWindow(QMainWindow):
         self.btn_compute_layer2.setEnabled(True)
 
         self.log(f"[LLM] Completed threat scoring on {n} articles.")
-        self._refresh_analysis_table()
+        self._finish_stage_profile(self.worker_llm.profiler)
+        self.analysis_model.refresh_articles(self.worker_llm.articles)
+        self.analysis_model.resort()
 
         if self.current_run_dir and os.path.isdir(self.current_run_dir):
             _save_articles_grouped(self.current_run_dir, self.current_view_subfolder, self.articles_cache)
             self.log("[LLM] Saved Layer 3 results into current run storage.")
+            self._schedule_archive_index([self.current_run_dir])
 
         QMessageBox.information(self, "LLM complete", f"Threat scoring complete for {n} articles.")
 
@@ -1397,67 +2126,7 @@ class MainWindow(QMainWindow):
         QMessageBox.critical(self, "LLM Error", err)
 
     def _refresh_analysis_table(self) -> None:
-        items = list(self.articles_cache)
-
-        def pre(a: Article) -> float:
-            v = getattr(a, "prepriority_score", None)
-            try:
-                return float(v) if v is not None else -1.0
-            except Exception:
-                return -1.0
-
-        items.sort(key=pre, reverse=True)
-
-        was_sorting = self.tbl_analysis.isSortingEnabled()
-        self.tbl_analysis.setSortingEnabled(False)
-
-        try:
-            self.tbl_analysis.clearContents()
-            self.tbl_analysis.setRowCount(len(items))
-
-            for row, a in enumerate(items):
-                title = a.title if a.title and a.title != a.url else (a.url or "")
-                pre_v = getattr(a, "prepriority_score", None)
-                bucket = getattr(a, "prepriority_bucket", None) or _bucket_from_prepriority(pre_v)
-                r = getattr(a, "relevance_score", None)
-                e = getattr(a, "evidence_numeric", None)
-                u = getattr(a, "urgency_score", None)
-                k = getattr(a, "keyword_intensity", None)
-                t = getattr(a, "threat_score", None)
-                lvl = getattr(a, "threat_level", None) or ""
-                vec = getattr(a, "threat_vector", None) or ""
-                risk = getattr(a, "risk_index", None)
-
-                it_title = QTableWidgetItem(title)
-                it_title.setData(Qt.ItemDataRole.UserRole, a)
-                it_title.setData(Qt.ItemDataRole.UserRole + 1, a.url or "")
-
-                def _fmt(x) -> str:
-                    if x is None:
-                        return ""
-                    try:
-                        if isinstance(x, (int, float)):
-                            return f"{float(x):.1f}"
-                    except Exception:
-                        pass
-                    return str(x)
-
-                self.tbl_analysis.setItem(row, 0, it_title)
-                self.tbl_analysis.setItem(row, 1, QTableWidgetItem(_fmt(pre_v)))
-                self.tbl_analysis.setItem(row, 2, QTableWidgetItem(str(bucket)))
-                self.tbl_analysis.setItem(row, 3, QTableWidgetItem(_fmt(r)))
-                self.tbl_analysis.setItem(row, 4, QTableWidgetItem(_fmt(e)))
-                self.tbl_analysis.setItem(row, 5, QTableWidgetItem(_fmt(u)))
-                self.tbl_analysis.setItem(row, 6, QTableWidgetItem(_fmt(k)))
-                self.tbl_analysis.setItem(row, 7, QTableWidgetItem(_fmt(t)))
-                self.tbl_analysis.setItem(row, 8, QTableWidgetItem(str(lvl)))
-                self.tbl_analysis.setItem(row, 9, QTableWidgetItem(str(vec)))
-                self.tbl_analysis.setItem(row, 10, QTableWidgetItem(_fmt(risk)))
-                self.tbl_analysis.setItem(row, 11, QTableWidgetItem(a.published_at or ""))
-
-            self.tbl_analysis.resizeRowsToContents()
-        finally:
-            self.tbl_analysis.setSortingEnabled(was_sorting)
+        self._request_view(analysis=True)
 
     def _on_analysis_selected(self) -> None:
         rows = self.tbl_analysis.selectionModel().selectedRows()
@@ -1465,21 +2134,14 @@ class MainWindow(QMainWindow):
             self.analysis_detail.setHtml("")
             return
 
-        row = rows[0].row()
-        item = self.tbl_analysis.item(row, 0)
-        if not item:
-            self.analysis_detail.setHtml("<i>No item selected.</i>")
-            return
-
-        a_obj = item.data(Qt.ItemDataRole.UserRole)
-        a: Optional[Article] = a_obj if isinstance(a_obj, Article) else None
+        a = self.analysis_model.article_at(rows[0].row())
         if a is None:
             self.analysis_detail.setHtml("<b>Could not load this article.</b>")
             return
 
-        nat_hits = _get_kw_nat(a)
-        thr_hits = _get_kw_thr(a)
-        shortlisted = _is_shortlisted(a)
+        nat_hits = national_hits(a)
+        thr_hits = threat_hits(a)
+        shortlisted = is_shortlisted(a)
 
         lines: List[str] = []
         lines.append(a.title or a.url or "")
@@ -1535,10 +2197,10 @@ class MainWindow(QMainWindow):
             esc = esc.replace(f"URL: {url_esc}", f"URL: <a href='{url_esc}'>{url_esc}</a>")
         self.analysis_detail.setHtml(f"<pre style='white-space: pre-wrap;'>{esc}</pre>")
 
-    def _on_analysis_double_click(self, item: QTableWidgetItem) -> None:
-        if item.column() != 0:
+    def _on_analysis_double_click(self, index: QModelIndex) -> None:
+        if index.column() != 0:
             return
-        url = item.data(Qt.ItemDataRole.UserRole + 1)
+        url = index.data(ArticleTableModel.UrlRole)
         if isinstance(url, str) and url.strip():
             _open_url(url.strip())
 
@@ -1572,62 +2234,95 @@ class MainWindow(QMainWindow):
         self.cmb_source_filter.blockSignals(False)
 
     def _refresh_browse(self) -> None:
-        items = list(self.articles_cache)
-
-        c = self.cmb_country_filter.currentText() if self.cmb_country_filter.count() else "ALL"
-        s = self.cmb_source_filter.currentText() if self.cmb_source_filter.count() else "ALL"
-        q = (self.txt_search.text() or "").strip().lower()
-        only_short = self.chk_only_shortlisted.isChecked()
-        only_full = self.chk_only_fulltext.isChecked()
-
-        if c != "ALL":
-            items = [a for a in items if a.country == c]
-        if s != "ALL":
-            items = [a for a in items if a.source_name == s]
-
-        if only_short:
-            items = [a for a in items if _is_shortlisted(a)]
-
-        if only_full:
-            items = [a for a in items if a.content_text and len(a.content_text) > 200]
-
-        if q:
-            def ok(a: Article) -> bool:
-                hay = " ".join([a.title or "", a.summary or "", a.content_text or "", a.url or ""]).lower()
-                return q in hay
-            items = [a for a in items if ok(a)]
-
-        was_sorting = self.tbl_articles.isSortingEnabled()
-        self.tbl_articles.setSortingEnabled(False)
+        self._request_view(browse=True)
+
+    # ---------------- View engine ----------------
+    def _refresh_views(self, reindex: str = "") -> None:
+        """
+        Recompute Browse, Analysis and KPIs for the current articles_cache.
+        reindex: "rebuild" after articles_cache was replaced, "update" after
+        articles changed in place.
+        """
+        self._request_view(browse=True, analysis=True, kpis=True, reindex=reindex)
+
+    def _request_view(
+        self,
+        *,
+        browse: bool = False,
+        analysis: bool = False,
+        kpis: bool = False,
+        reindex: str = "",
+        delay_ms: int = 0,
+    ) -> None:
+        f = self._view_flags
+        f["browse"] = bool(f.get("browse")) or browse
+        f["analysis"] = bool(f.get("analysis")) or analysis
+        f["kpis"] = bool(f.get("kpis")) or kpis
+        if _REINDEX_RANK.get(reindex, 0) > _REINDEX_RANK.get(str(f.get("reindex") or ""), 0):
+            f["reindex"] = reindex
+
+        # restarting the single-shot timer coalesces bursts (typing, combo churn)
+        self._view_timer.start(delay_ms)
+
+    def _flush_view_request(self) -> None:
+        f = self._view_flags
+        self._view_flags = {}
+        if not f:
+            return
 
-        try:
-            self.tbl_articles.clearContents()
-            self.tbl_articles.setRowCount(len(items))
-
-            for row, a in enumerate(items):
-                title = a.title if a.title and a.title != a.url else (a.url or "")
-                full = "YES" if a.content_text and len(a.content_text) > 200 else "NO"
-
-                nat_hits = _get_kw_nat(a)
-                thr_hits = _get_kw_thr(a)
-                shortlisted = _is_shortlisted(a)
-
-                it_title = QTableWidgetItem(title)
-                it_title.setData(Qt.ItemDataRole.UserRole, a)
-                it_title.setData(Qt.ItemDataRole.UserRole + 1, a.url or "")
-
-                self.tbl_articles.setItem(row, 0, it_title)
-                self.tbl_articles.setItem(row, 1, QTableWidgetItem(a.country or ""))
-                self.tbl_articles.setItem(row, 2, QTableWidgetItem(a.source_name or ""))
-                self.tbl_articles.setItem(row, 3, QTableWidgetItem(a.published_at or ""))
-                self.tbl_articles.setItem(row, 4, QTableWidgetItem(full))
-                self.tbl_articles.setItem(row, 5, QTableWidgetItem(str(len(nat_hits))))
-                self.tbl_articles.setItem(row, 6, QTableWidgetItem(str(len(thr_hits))))
-                self.tbl_articles.setItem(row, 7, QTableWidgetItem("YES" if shortlisted else "NO"))
-
-            self.tbl_articles.resizeRowsToContents()
-        finally:
-            self.tbl_articles.setSortingEnabled(was_sorting)
+        self._view_generation += 1
+        if self.articles_cache is not self._view_articles:
+            self._view_articles = self.articles_cache
+            self._view_list_generation = self._view_generation
+        req = ViewRequest(
+            articles=self.articles_cache,
+            country=self.cmb_country_filter.currentText() if self.cmb_country_filter.count() else "ALL",
+            source=self.cmb_source_filter.currentText() if self.cmb_source_filter.count() else "ALL",
+            query=self.txt_search.text() or "",
+            only_shortlisted=self.chk_only_shortlisted.isChecked(),
+            only_fulltext=self.chk_only_fulltext.isChecked(),
+            browse_sort=self.browse_model.sort_state(),
+            analysis_sort=self.analysis_model.sort_state(),
+            browse=bool(f.get("browse")),
+            analysis=bool(f.get("analysis")),
+            kpis=bool(f.get("kpis")),
+            reindex=str(f.get("reindex") or ""),
+            generation=self._view_generation,
+        )
+        self._view_engine.submit(req)
+
+    def _on_view_result(self, res: ViewResult) -> None:
+        if res.generation < self._view_list_generation:
+            return  # computed for a list that has since been replaced
+        if res.browse_rows is not None:
+            self.browse_model.set_rows(res.articles, res.browse_rows)
+        if res.analysis_rows is not None:
+            self.analysis_model.set_rows(res.articles, res.analysis_rows)
+        if res.kpis is not None:
+            self._kpi_counts = res.kpis
+            self._update_kpis()
+
+    def _poll_tor(self) -> None:
+        st = self._tor.status()
+        self.lbl_tor.setText(f"Tor: {st.describe()}")
+        if st.state not in (STATE_READY, STATE_FAILED):
+            self._tor_logged = ""
+        elif st.state in (STATE_READY, STATE_FAILED) and st.state != self._tor_logged:
+            self._tor_logged = st.state
+            self.log(f"[TOR] {st.describe()}")
+        # slow down once settled; a dead Tor is restarted by the next run
+        self._tor_timer.setInterval(500 if st.state not in (STATE_READY, STATE_FAILED) else 5000)
+
+    def closeEvent(self, event) -> None:
+        self._tor_timer.stop()
+        self._tor.stop()
+        self._view_timer.stop()
+        self._view_engine.request_stop()
+        self._view_engine.wait(2000)
+        if self._export_worker is not None and self._export_worker.isRunning():
+            self._export_worker.request_stop()
+            self._export_worker.wait(5000)
+        super().closeEvent(event)
 
     def _on_article_selected(self) -> None:
         rows = self.tbl_articles.selectionModel().selectedRows()
@@ -1635,21 +2330,14 @@ class MainWindow(QMainWindow):
             self.detail.setHtml("")
             return
 
-        row = rows[0].row()
-        item = self.tbl_articles.item(row, 0)
-        if not item:
-            self.detail.setHtml("<i>No item selected.</i>")
-            return
-
-        a_obj = item.data(Qt.ItemDataRole.UserRole)
-        a: Optional[Article] = a_obj if isinstance(a_obj, Article) else None
+        a = self.browse_model.article_at(rows[0].row())
         if a is None:
             self.detail.setHtml("<b>Could not load this article.</b>")
             return
 
-        nat_hits = _get_kw_nat(a)
-        thr_hits = _get_kw_thr(a)
-        shortlisted = _is_shortlisted(a)
+        nat_hits = national_hits(a)
+        thr_hits = threat_hits(a)
+        shortlisted = is_shortlisted(a)
 
         lines: List[str] = []
         lines.append(a.title or a.url or "")
@@ -1687,112 +2375,275 @@ class MainWindow(QMainWindow):
             esc = esc.replace(f"URL: {url_esc}", f"URL: <a href='{url_esc}'>{url_esc}</a>")
         self.detail.setHtml(f"<pre style='white-space: pre-wrap;'>{esc}</pre>")
 
-    def _on_article_double_click(self, item: QTableWidgetItem) -> None:
-        if item.column() != 0:
+    def _on_article_double_click(self, index: QModelIndex) -> None:
+        if index.column() != 0:
             return
-        url = item.data(Qt.ItemDataRole.UserRole + 1)
+        url = index.data(ArticleTableModel.UrlRole)
         if isinstance(url, str) and url.strip():
             _open_url(url.strip())
 
     def _on_export_csv(self) -> None:
-        if not self.articles_cache:
+        rows = self.browse_model.visible_articles() or list(self.articles_cache)
+        if not rows:
             QMessageBox.warning(self, "No data", "Nothing to export.")
             return
 
-        default_name = "export.csv"
         if self.current_run_dir and os.path.isdir(self.current_run_dir):
-            default_path = os.path.join(self.current_run_dir, default_name)
+            default_dir = self.current_run_dir
         else:
-            default_path = os.path.join(self.base_dir, "data", default_name)
+            default_dir = os.path.join(self.base_dir, "data")
+
+        picked = self._pick_export_path(default_dir, "export")
+        if not picked:
+            return
+        path, fmt = picked
+        # exactly what the Browse view shows, in its current sort order
+        self._start_export(lambda: iter(rows), path, fmt, total=len(rows))
+
+    def _on_export_run(self) -> None:
+        run_dir = self.cmb_runs.currentText().strip() if self.cmb_runs.count() else ""
+        if not run_dir or not os.path.isdir(run_dir):
+            QMessageBox.warning(self, "No run", "No valid run selected.")
+            return
+        picked = self._pick_export_path(run_dir, os.path.basename(run_dir))
+        if not picked:
+            return
+        path, fmt = picked
+        self._start_export(lambda: iter_run_articles(run_dir, "fetched"), path, fmt)
 
-        path, _ = QFileDialog.getSaveFileName(self, "Export CSV", default_path, "CSV files (*.csv)")
+    def _on_export_archive(self) -> None:
+        q = self._archive_query_from_ui()
+        if q is None:
+            return
+        picked = self._pick_export_path(os.path.join(self.base_dir, "data"), "archive_export")
+        if not picked:
+            return
+        path, fmt = picked
+        base_dir = self.base_dir
+        self._start_export(
+            lambda: iter_archive_articles(base_dir, q),
+            path,
+            fmt,
+            count_total=lambda: count_archive_articles(base_dir, q),
+        )
+
+    def _pick_export_path(self, default_dir: str, stem: str) -> Optional[Tuple[str, str]]:
+        filters = ["CSV files (*.csv)", "JSON Lines (*.jsonl)"]
+        if HAS_PYARROW:
+            filters.append("Parquet (*.parquet)")
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Export", os.path.join(default_dir, f"{stem}.csv"), ";;".join(filters)
+        )
         if not path:
+            return None
+
+        ext = {"CSV": ".csv", "JSON": ".jsonl", "Parquet": ".parquet"}.get((selected or "CSV").split(" ")[0], ".csv")
+        if not os.path.splitext(path)[1]:
+            path += ext
+        return path, format_for_path(path)
+
+    def _start_export(
+        self,
+        make_articles: Callable[[], Iterable[Article]],
+        path: str,
+        fmt: str,
+        total: int = 0,
+        count_total: Optional[Callable[[], int]] = None,
+    ) -> None:
+        if self._export_worker is not None and self._export_worker.isRunning():
+            QMessageBox.information(self, "Export running", "Wait for the current export to finish.")
             return
 
-        ids: List[str] = []
-        for r in range(self.tbl_articles.rowCount()):
-            it = self.tbl_articles.item(r, 0)
-            if not it:
-                continue
-            a_obj = it.data(Qt.ItemDataRole.UserRole)
-            if isinstance(a_obj, Article) and a_obj.id:
-                ids.append(a_obj.id)
+        self._export_worker = WorkerExport(make_articles, path, fmt, total=total, count_total=count_total)
+        self._export_worker.progress.connect(self._on_export_progress)
+        self._export_worker.finished_ok.connect(self._on_export_done)
+        self._export_worker.finished_fail.connect(self._on_export_fail)
+        self._set_busy(True, f"Exporting {fmt.upper()}...")
+        self.log(f"[EXPORT] {fmt} -> {path}")
+        self._export_worker.start()
+
+    def _on_export_progress(self, rows: int, total: int) -> None:
+        if total > 0:
+            self.progress.setRange(0, total)
+            self.progress.setValue(min(rows, total))
+            self.status_label.setText(f"Exporting: {rows}/{total} rows")
+        else:
+            self.status_label.setText(f"Exporting: {rows} rows")
+
+    def _on_export_done(self, st: ExportStats) -> None:
+        self.progress.setRange(0, 0)
+        self._set_busy(False, "Export complete.")
+        self.log(f"[EXPORT] {st.rows} rows -> {st.path} ({st.elapsed_s:.1f}s)")
+        QMessageBox.information(self, "Exported", f"Saved {st.rows} rows:\n{st.path}")
+
+    def _on_export_fail(self, err: str) -> None:
+        self.progress.setRange(0, 0)
+        self._set_busy(False, "Export failed.")
+        self.log(f"[EXPORT] ERROR: {err}")
+        QMessageBox.critical(self, "Export failed", err)
+
+    # ---------------- Archive tab ----------------
+    def _schedule_archive_index(self, run_dirs: Optional[List[str]] = None) -> None:
+        """
+        run_dirs=None -> full incremental scan of data/runs.
+        Requests made while an update is running are merged and run afterwards.
+        """
+        if self._archive_worker is not None and self._archive_worker.isRunning():
+            if run_dirs is None:
+                self._archive_pending_full = True
+            else:
+                pending = self._archive_pending or []
+                self._archive_pending = list(dict.fromkeys(pending + list(run_dirs)))
+            return
+
+        self.lbl_archive_status.setText("Index: updating...")
+        self._archive_worker = WorkerArchiveIndex(self.base_dir, run_dirs)
+        self._archive_worker.finished_ok.connect(self._on_archive_index_done)
+        self._archive_worker.finished_fail.connect(self._on_archive_index_fail)
+        self._archive_worker.start()
+
+    def _drain_archive_pending(self) -> None:
+        if self._archive_pending_full:
+            self._archive_pending_full = False
+            self._archive_pending = None
+            self._schedule_archive_index()
+        elif self._archive_pending:
+            pending = self._archive_pending
+            self._archive_pending = None
+            self._schedule_archive_index(pending)
+
+    def _on_archive_index_done(self, msg: str) -> None:
+        self.log(msg)
+        self.lbl_archive_status.setText("Index: up to date")
+        self._refresh_archive_facets()
+        self._drain_archive_pending()
 
-        idset = set(ids)
-        rows = [a for a in self.articles_cache if a.id in idset] if idset else list(self.articles_cache)
+    def _on_archive_index_fail(self, err: str) -> None:
+        self.log(f"[ARCHIVE] ERROR: {err}")
+        self.lbl_archive_status.setText(f"Index: failed ({err})")
+        self._drain_archive_pending()
 
+    def _refresh_archive_facets(self) -> None:
         try:
-            with open(path, "w", encoding="utf-8", newline="") as f:
-                w = csv.writer(f)
-                w.writerow(
-                    [
-                        "title",
-                        "country",
-                        "source",
-                        "published_at",
-                        "url",
-                        "shortlisted",
-                        "national_hits",
-                        "threat_hits",
-                        "content_length",
-                        "relevance_score",
-                        "evidence_strength",
-                        "evidence_numeric",
-                        "urgency_score",
-                        "keyword_intensity",
-                        "prepriority_score",
-                        "prepriority_bucket",
-                        "threat_score",
-                        "threat_level",
-                        "threat_vector",
-                        "one_liner_threat",
-                        "reasons",
-                        "risk_index",
-                    ]
-                )
-                for a in rows:
-                    nat_hits = _get_kw_nat(a)
-                    thr_hits = _get_kw_thr(a)
-                    shortlisted = _is_shortlisted(a)
-
-                    reasons = getattr(a, "reasons", None) or []
-                    w.writerow(
-                        [
-                            a.title or "",
-                            a.country or "",
-                            a.source_name or "",
-                            a.published_at or "",
-                            a.url or "",
-                            "YES" if shortlisted else "NO",
-                            ";".join(nat_hits),
-                            ";".join(thr_hits),
-                            str(len(a.content_text or "")),
-                            getattr(a, "relevance_score", None),
-                            getattr(a, "evidence_strength", None),
-                            getattr(a, "evidence_numeric", None),
-                            getattr(a, "urgency_score", None),
-                            getattr(a, "keyword_intensity", None),
-                            getattr(a, "prepriority_score", None),
-                            getattr(a, "prepriority_bucket", None),
-                            getattr(a, "threat_score", None),
-                            getattr(a, "threat_level", None),
-                            getattr(a, "threat_vector", None),
-                            getattr(a, "one_liner_threat", None),
-                            " | ".join([str(x) for x in reasons]),
-                            getattr(a, "risk_index", None),
-                        ]
-                    )
-            QMessageBox.information(self, "Exported", f"Saved CSV:\n{path}")
+            facets = archive_facets(self.base_dir)
+        except Exception as ex:
+            self.log(f"[ARCHIVE] facets failed: {type(ex).__name__}: {ex}")
+            return
+
+        def fill(cmb: QComboBox, values: List[str]) -> None:
+            cur = cmb.currentText() if cmb.count() else "ALL"
+            cmb.blockSignals(True)
+            cmb.clear()
+            cmb.addItem("ALL")
+            for v in values:
+                cmb.addItem(v)
+            if cur and cmb.findText(cur) >= 0:
+                cmb.setCurrentText(cur)
+            cmb.blockSignals(False)
+
+        fill(self.cmb_arch_country, facets.get("countries", []))
+        fill(self.cmb_arch_source, facets.get("sources", []))
+        fill(self.cmb_arch_bucket, facets.get("buckets", []))
+        fill(self.cmb_arch_level, facets.get("threat_levels", []))
+        fill(self.cmb_arch_vector, facets.get("threat_vectors", []))
+
+    def _archive_query_from_ui(self) -> Optional[ArchiveQuery]:
+        def pick(cmb: QComboBox) -> List[str]:
+            t = cmb.currentText() if cmb.count() else "ALL"
+            return [] if (not t or t == "ALL") else [t]
+
+        d_from = _parse_yyyy_mm_dd(self.txt_arch_from.text())
+        d_to = _parse_yyyy_mm_dd(self.txt_arch_to.text())
+        if self.txt_arch_from.text().strip() and not d_from:
+            QMessageBox.warning(self, "Invalid date", "From must be YYYY-MM-DD.")
+            return None
+        if self.txt_arch_to.text().strip() and not d_to:
+            QMessageBox.warning(self, "Invalid date", "To must be YYYY-MM-DD.")
+            return None
+        if not d_from and int(self.spin_arch_days.value()) > 0:
+            d_from = date.today() - timedelta(days=int(self.spin_arch_days.value()))
+
+        kws = [k.strip() for k in (self.txt_arch_keywords.text() or "").split(",") if k.strip()]
+
+        return ArchiveQuery(
+            countries=pick(self.cmb_arch_country),
+            sources=pick(self.cmb_arch_source),
+            date_from=d_from,
+            date_to=d_to,
+            buckets=pick(self.cmb_arch_bucket),
+            threat_levels=pick(self.cmb_arch_level),
+            threat_vectors=pick(self.cmb_arch_vector),
+            keywords=kws,
+            keywords_match_all=self.chk_arch_kw_all.isChecked(),
+            shortlisted_only=self.chk_arch_shortlisted.isChecked(),
+            limit=int(self.spin_arch_limit.value()),
+        )
+
+    def _on_archive_search(self) -> None:
+        q = self._archive_query_from_ui()
+        if q is None:
+            return
+        try:
+            hits = query_archive(self.base_dir, q)
         except Exception as ex:
-            QMessageBox.critical(self, "Export failed", f"{type(ex).__name__}: {ex}")
+            QMessageBox.critical(self, "Archive query failed", f"{type(ex).__name__}: {ex}")
+            return
+
+        self._archive_hits = hits
+
+        def _fmt(x) -> str:
+            return "" if x is None else f"{float(x):.1f}"
+
+        self.tbl_archive.setSortingEnabled(False)
+        try:
+            self.tbl_archive.clearContents()
+            self.tbl_archive.setRowCount(len(hits))
+            for row, h in enumerate(hits):
+                it_title = QTableWidgetItem(h.title if h.title and h.title != h.url else h.url)
+                it_title.setData(Qt.ItemDataRole.UserRole + 1, h.url or "")
+                self.tbl_archive.setItem(row, 0, it_title)
+                self.tbl_archive.setItem(row, 1, QTableWidgetItem(h.country))
+                self.tbl_archive.setItem(row, 2, QTableWidgetItem(h.source_name))
+                self.tbl_archive.setItem(row, 3, QTableWidgetItem(h.published_at or ""))
+                self.tbl_archive.setItem(row, 4, QTableWidgetItem(h.bucket or ""))
+                self.tbl_archive.setItem(row, 5, QTableWidgetItem(h.threat_level or ""))
+                self.tbl_archive.setItem(row, 6, QTableWidgetItem(h.threat_vector or ""))
+                self.tbl_archive.setItem(row, 7, QTableWidgetItem(_fmt(h.risk_index)))
+                self.tbl_archive.setItem(row, 8, QTableWidgetItem(h.run_id))
+        finally:
+            self.tbl_archive.setSortingEnabled(True)
+
+        self.lbl_archive_status.setText(f"Index: {len(hits)} matching articles")
+
+    def _on_archive_load_results(self) -> None:
+        if not self._archive_hits:
+            QMessageBox.information(self, "No results", "Run an archive search first.")
+            return
+
+        self.current_run_dir = None
+        self.current_view_subfolder = "archive"
+        self.articles_cache = load_archive_articles(self._archive_hits)
+        self.log(f"[ARCHIVE] Loaded {len(self.articles_cache)} articles from archive query")
+
+        self._refresh_filters()
+        self._refresh_views(reindex="rebuild")
+        self.tabs.setCurrentWidget(self.tab_browse)
+
+    def _on_archive_double_click(self, item: QTableWidgetItem) -> None:
+        if item.column() != 0:
+            return
+        url = item.data(Qt.ItemDataRole.UserRole + 1)
+        if isinstance(url, str) and url.strip():
+            _open_url(url.strip())
 
     # ---------------- KPI/Stats ----------------
     def _update_kpis(self) -> None:
-        total = len(self.articles_cache)
-        shortlisted = sum(1 for a in self.articles_cache if _is_shortlisted(a))
-        fulltext = sum(1 for a in self.articles_cache if a.content_text and len(a.content_text) > 200)
+        # counts come from the view engine (see _on_view_result)
+        total, shortlisted, fulltext = self._kpi_counts
 
-        storage_hint = self.current_run_dir or "LEGACY:data/news"
+        storage_hint = self.current_run_dir or (
+            "ARCHIVE:data/archive_index.sqlite3" if self.current_view_subfolder == "archive" else "LEGACY:data/news"
+        )
         view = self.current_view_subfolder
 
         self.lbl_kpis.setText(
@@ -1812,8 +2663,10 @@ class MainWindow(QMainWindow):
             f"Enabled: {s.enabled}",
             "Endpoints:",
         ]
+        health = EndpointHealthStore.load(self.base_dir)
         for ep in s.endpoints:
             lines.append(f"  - {ep.type} | enabled={ep.enabled} | {ep.url} | {ep.note}")
+            lines.append(f"      health: {health.get(ep).describe()}")
         self.source_preview.setPlainText("\n".join(lines))
 
     def _on_add_source(self) -> None:
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, List, Optional, Set
+from urllib.parse import urlparse
+
+
+# =============================================================================
+# Per-host rate limiting + circuit breaker
+# =============================================================================
+#
+# One HostLimiter is shared by every fetch path (SmartHTTP discovery, article
+# extraction threads), so what one request learns about a host applies to all
+# of them:
+#
+#   - token bucket per host; the rate adapts (AIMD): +RATE_STEP per success,
+#     halved on 429/503
+#   - Retry-After (seconds or HTTP date) blocks the host until that time
+#   - FAILURE_THRESHOLD consecutive failures open the circuit: requests fail
+#     fast with HostUnavailable instead of retrying. After the open period one
+#     probe is let through (half-open); success closes the circuit, failure
+#     re-opens it for twice as long (up to MAX_OPEN_SECONDS)
+#   - a 403 counts once per URL (record(..., url=)): a few forbidden or
+#     paywalled articles must not open the circuit for the whole host, while
+#     a host that forbids every URL still does
+#
+# snapshot()/is_open() expose host health to the callers that schedule work.
+# =============================================================================
+
+DEFAULT_RATE = 4.0          # requests / second / host
+DEFAULT_BURST = 8
+MIN_RATE = 0.2
+MAX_RATE = 8.0
+RATE_STEP = 0.25
+
+FAILURE_THRESHOLD = 5
+OPEN_SECONDS = 60.0
+MAX_OPEN_SECONDS = 900.0
+
+# never block a worker longer than this waiting for a host; fail instead
+MAX_ACQUIRE_WAIT = 45.0
+# a half-open probe that never reported back does not block the host forever
+PROBE_TIMEOUT = 120.0
+
+THROTTLE_STATUSES = (429, 503)
+
+
+class HostUnavailable(RuntimeError):
+    def __init__(self, host: str, reason: str, retry_in: float) -> None:
+        super().__init__(f"{host}: {reason} (retry in {retry_in:.0f}s)")
+        self.host = host
+        self.reason = reason
+        self.retry_in = retry_in
+
+
+@dataclass
+class HostHealth:
+    host: str
+    rate: float
+    state: str                  # closed / open / half_open
+    consecutive_failures: int
+    successes: int
+    failures: int
+    throttled: int
+    blocked_for: float          # seconds until requests are allowed again
+    last_error: str = ""
+
+
+@dataclass
+class _HostState:
+    rate: float
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0      # Retry-After
+    open_until: float = 0.0         # circuit open
+    open_seconds: float = OPEN_SECONDS
+    probe_started: float = 0.0      # half-open probe in flight since (0 = none)
+    consecutive_failures: int = 0
+    successes: int = 0
+    failures: int = 0
+    throttled: int = 0
+    last_error: str = ""
+    forbidden_urls: Set[str] = field(default_factory=set)  # 403s counted since the last success
+
+
+def host_of(url: str) -> str:
+    try:
+        return (urlparse(url).hostname or "").lower()
+    except Exception:
+        return ""
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Retry-After header -> seconds to wait (None if absent/invalid).
+    """
+    v = (value or "").strip()
+    if not v:
+        return None
+    if v.isdigit():
+        return float(v)
+    try:
+        dt = parsedate_to_datetime(v)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        now_ts = now if now is not None else datetime.now(timezone.utc).timestamp()
+        return max(0.0, dt.timestamp() - now_ts)
+    except Exception:
+        return None
+
+
+class HostLimiter:
+    def __init__(
+        self,
+        *,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.failure_threshold = max(1, int(failure_threshold))
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostState] = {}
+
+    def _state(self, host: str, now: float) -> _HostState:
+        st = self._hosts.get(host)
+        if st is None:
+            st = self._hosts[host] = _HostState(rate=self.rate, tokens=float(self.burst), updated=now)
+        return st
+
+    # -----------------------
+    # Before a request
+    # -----------------------
+    def acquire(self, host: str, *, max_wait: float = MAX_ACQUIRE_WAIT) -> None:
+        """
+        Block until host may be contacted. Raises HostUnavailable if its circuit
+        is open or the required wait exceeds max_wait.
+        """
+        if not host:
+            return
+        while True:
+            with self._lock:
+                now = self._clock()
+                st = self._state(host, now)
+
+                if st.open_until:
+                    if now < st.open_until:
+                        raise HostUnavailable(host, "circuit open", st.open_until - now)
+                    if st.probe_started and now - st.probe_started < PROBE_TIMEOUT:
+                        raise HostUnavailable(host, "circuit half-open (probe in flight)", PROBE_TIMEOUT)
+                    st.probe_started = now
+                    return
+
+                wait = 0.0
+                if st.blocked_until > now:
+                    wait = st.blocked_until - now
+                else:
+                    st.tokens = min(float(self.burst), st.tokens + (now - st.updated) * st.rate)
+                    st.updated = now
+                    if st.tokens >= 1.0:
+                        st.tokens -= 1.0
+                        return
+                    wait = (1.0 - st.tokens) / st.rate
+
+                if wait > max_wait:
+                    raise HostUnavailable(host, "throttled", wait)
+
+            self._sleep(wait)
+
+    # -----------------------
+    # After a request
+    # -----------------------
+    def record(
+        self,
+        host: str,
+        *,
+        status: Optional[int] = None,
+        error: Optional[str] = None,
+        retry_after: Optional[str] = None,
+        url: str = "",
+    ) -> None:
+        """
+        Feed back one outcome: status for an HTTP response, error for a
+        connection-level failure. With url, a repeated 403 for the same URL
+        (e.g. the curl_cffi fallback) is not counted again.
+        """
+        if not host:
+            return
+        with self._lock:
+            now = self._clock()
+            st = self._state(host, now)
+            probe = bool(st.probe_started)
+            st.probe_started = 0.0
+
+            wait = parse_retry_after(retry_after)
+            if wait:
+                st.blocked_until = max(st.blocked_until, now + wait)
+
+            throttled = status in THROTTLE_STATUSES
+            failed = bool(error) or throttled or status == 403 or (status is not None and status >= 500)
+
+            if throttled:
+                st.throttled += 1
+                st.rate = max(MIN_RATE, st.rate / 2.0)
+                st.tokens = min(st.tokens, 0.0)
+
+            if status == 403 and url:
+                if url in st.forbidden_urls:
+                    st.last_error = "HTTP 403"
+                    return
+                st.forbidden_urls.add(url)
+
+            if not failed:
+                st.successes += 1
+                st.consecutive_failures = 0
+                st.forbidden_urls.clear()
+                st.rate = min(MAX_RATE, st.rate + RATE_STEP)
+                st.open_until = 0.0
+                st.open_seconds = OPEN_SECONDS
+                return
+
+            st.failures += 1
+            st.consecutive_failures += 1
+            st.last_error = error or f"HTTP {status}"
+            if probe:
+                st.open_seconds = min(MAX_OPEN_SECONDS, st.open_seconds * 2.0)
+                st.open_until = now + st.open_seconds
+            elif st.consecutive_failures >= self.failure_threshold:
+                st.open_until = now + max(st.open_seconds, wait or 0.0)
+
+    # -----------------------
+    # Health
+    # -----------------------
+    def is_open(self, host: str) -> bool:
+        with self._lock:
+            st = self._hosts.get(host)
+            return bool(st and st.open_until and self._clock() < st.open_until)
+
+    def health(self, host: str) -> Optional[HostHealth]:
+        with self._lock:
+            st = self._hosts.get(host)
+            return self._health(host, st, self._clock()) if st else None
+
+    def snapshot(self) -> List[HostHealth]:
+        with self._lock:
+            now = self._clock()
+            return [self._health(h, st, now) for h, st in sorted(self._hosts.items())]
+
+    @staticmethod
+    def _health(host: str, st: _HostState, now: float) -> HostHealth:
+        if st.open_until and now < st.open_until:
+            state = "open"
+        elif st.open_until:
+            state = "half_open"
+        else:
+            state = "closed"
+        return HostHealth(
+            host=host,
+            rate=round(st.rate, 2),
+            state=state,
+            consecutive_failures=st.consecutive_failures,
+            successes=st.successes,
+            failures=st.failures,
+            throttled=st.throttled,
+            blocked_for=max(0.0, max(st.open_until, st.blocked_until) - now),
+            last_error=st.last_error,
+        )
+
+
+HOST_LIMITER = HostLimiter()
+
+
+def unhealthy_hosts_summary(limiter: HostLimiter = HOST_LIMITER) -> List[str]:
+    """
+    One log line per host that is throttled or has an open circuit.
+    """
+    out: List[str] = []
+    for h in limiter.snapshot():
+        if h.state != "closed" or h.throttled:
+            out.append(
+                f"{h.host}: state={h.state} rate={h.rate}/s throttled={h.throttled} "
+                f"failures={h.failures} ok={h.successes} last_error={h.last_error or '-'}"
+            )
+    return out
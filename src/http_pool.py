@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from curl_cffi import requests as curl_requests  # type: ignore
+    HAS_CURL_CFFI = True
+except Exception:
+    curl_requests = None  # type: ignore
+    HAS_CURL_CFFI = False
+
+
+# =============================================================================
+# Connection reuse (requests adapters, curl_cffi sessions)
+# =============================================================================
+#
+# Over Tor every new connection pays a SOCKS circuit setup plus a TLS
+# handshake (often seconds). Connections are therefore kept alive and reused
+# per host:
+#   - mount_pooled_adapters() sizes the requests.Session pools: POOL_HOSTS
+#     hosts kept, up to POOL_PER_HOST idle connections each (enough for the
+#     extraction / date-sniff workers hitting one site at the same time)
+#   - release() returns a streamed response's connection to the pool; a body
+#     stopped early (e.g. at </html>) with at most DRAIN_MAX_BYTES left is read
+#     to the end first, anything larger is closed
+#   - curl_session() keeps one curl_cffi Session per thread and proxy, so the
+#     403 / TLS fallback also reuses its connections (curl handles are not
+#     thread-safe, hence per thread)
+# =============================================================================
+
+POOL_HOSTS = 64
+POOL_PER_HOST = 16
+DRAIN_MAX_BYTES = 64 * 1024
+_DRAIN_CHUNK = 16 * 1024
+
+
+def mount_pooled_adapters(
+    sess: requests.Session,
+    *,
+    hosts: int = POOL_HOSTS,
+    per_host: int = POOL_PER_HOST,
+) -> requests.Session:
+    adapter = HTTPAdapter(pool_connections=hosts, pool_maxsize=per_host)
+    sess.mount("http://", adapter)
+    sess.mount("https://", adapter)
+    return sess
+
+
+def release(resp, *, drain_limit: int = 0) -> None:
+    """
+    Close a streamed response. With drain_limit > 0, a body that ends within
+    drain_limit more bytes is read out so its keep-alive connection goes back
+    to the pool instead of being torn down.
+    """
+    raw = getattr(resp, "raw", None)
+    if drain_limit > 0 and raw is not None and hasattr(raw, "release_conn"):
+        try:
+            remaining = getattr(raw, "length_remaining", None)
+            if remaining is None or remaining <= drain_limit:
+                budget = drain_limit
+                while budget > 0:
+                    chunk = raw.read(min(_DRAIN_CHUNK, budget))
+                    if not chunk:
+                        raw.release_conn()
+                        break
+                    budget -= len(chunk)
+        except Exception:
+            pass
+    try:
+        resp.close()
+    except Exception:
+        pass
+
+
+_CURL_LOCAL = threading.local()
+
+
+def curl_session(proxies: Optional[Dict[str, str]] = None):
+    """
+    This thread's curl_cffi Session (Chrome impersonation) for the given
+    proxies, or None when curl_cffi is not installed.
+    """
+    if not (HAS_CURL_CFFI and curl_requests is not None):
+        return None
+    sessions = getattr(_CURL_LOCAL, "sessions", None)
+    if sessions is None:
+        sessions = _CURL_LOCAL.sessions = {}
+    key = tuple(sorted((proxies or {}).items()))
+    s = sessions.get(key)
+    if s is None:
+        s = curl_requests.Session(impersonate="chrome", proxies=dict(proxies) if proxies else None)
+        sessions[key] = s
+    return s
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, fields
+from typing import Callable, Dict, Optional
+
+try:
+    # gzip,deflate plus br / zstd when brotli / zstandard are installed
+    from urllib3.util.request import ACCEPT_ENCODING
+except Exception:
+    ACCEPT_ENCODING = "gzip,deflate"
+
+from .http_pool import DRAIN_MAX_BYTES, release
+
+
+# =============================================================================
+# Streaming, byte-capped body reads
+# =============================================================================
+#
+# Shared by SmartHTTP (feeds/sitemaps/listings) and the article fetcher.
+# Bodies are read chunk by chunk instead of one blocking read of the full cap:
+#   - inspect(head) sees the first SNIFF_BYTES (or everything up to a
+#     sniff_until marker such as "</head", if that comes first) and can abort
+#     the transfer (binary payload, HTML where XML was expected, ...)
+#   - stop_at_html_end stops as soon as "</html>" has been received
+#   - max_bytes caps what is kept in memory (decoded bytes)
+#
+# Compression is negotiated (ACCEPT_ENCODING) and decoded while streaming, so
+# the cap applies to decoded bytes. A body that decodes to more than
+# MAX_DECODE_RATIO x its wire size is treated as a decompression bomb.
+#
+# Every read is counted (wire vs decoded bytes, time to headers and body
+# transfer time) in TRANSFER_STATS, in total and per route (resp.route, set by
+# routing.RouteSessions).
+#
+# The response is always released: an aborted transfer is closed so it stops
+# pulling bytes over Tor right away; a read stopped at </html> or max_bytes
+# drains a short remainder so the keep-alive connection is reused (see
+# http_pool.release).
+# =============================================================================
+
+CHUNK_SIZE = 16 * 1024
+SNIFF_BYTES = 4096
+
+MAX_DECODE_RATIO = 100          # decoded / wire
+BOMB_CHECK_MIN_BYTES = 1_000_000
+
+_HTML_END = b"</html"
+
+# inspect(head_bytes) -> abort reason, or None to keep reading
+Inspector = Callable[[bytes], Optional[str]]
+
+
+@dataclass
+class BodyRead:
+    data: bytes
+    aborted: str = ""          # reason when the transfer was cut short (inspector / bomb guard)
+    truncated: bool = False    # stopped at max_bytes
+    html_end: bool = False     # stopped after </html>
+    content_encoding: str = ""
+    wire_bytes: int = 0        # bytes received from the network (compressed)
+    decoded_bytes: int = 0     # bytes after content decoding
+    route: str = ""            # routing label of the session that sent the request
+    latency_s: float = 0.0     # request sent -> headers received
+    transfer_s: float = 0.0    # body read time
+
+
+@dataclass
+class TransferTotals:
+    requests: int = 0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+    compressed: int = 0        # responses with a Content-Encoding
+    aborted: int = 0
+    latency_s: float = 0.0
+    transfer_s: float = 0.0
+
+    @property
+    def saved_ratio(self) -> float:
+        if self.decoded_bytes <= 0:
+            return 0.0
+        return max(0.0, 1.0 - self.wire_bytes / self.decoded_bytes)
+
+    @property
+    def avg_latency_s(self) -> float:
+        return self.latency_s / self.requests if self.requests else 0.0
+
+    @property
+    def throughput_bps(self) -> float:
+        """
+        Wire bytes per second of request time (latency + body transfer).
+        """
+        busy = self.latency_s + self.transfer_s
+        return self.wire_bytes / busy if busy > 0 else 0.0
+
+    def add(self, body: BodyRead) -> None:
+        self.requests += 1
+        self.wire_bytes += body.wire_bytes
+        self.decoded_bytes += body.decoded_bytes
+        if body.content_encoding and body.content_encoding.lower() != "identity":
+            self.compressed += 1
+        if body.aborted:
+            self.aborted += 1
+        self.latency_s += body.latency_s
+        self.transfer_s += body.transfer_s
+
+    def copy(self) -> "TransferTotals":
+        return TransferTotals(**{f.name: getattr(self, f.name) for f in fields(self)})
+
+    def minus(self, other: "TransferTotals") -> "TransferTotals":
+        return TransferTotals(**{f.name: getattr(self, f.name) - getattr(other, f.name) for f in fields(self)})
+
+    def summary(self) -> str:
+        return (
+            f"requests={self.requests} wire={self.wire_bytes / 1e6:.2f}MB "
+            f"decoded={self.decoded_bytes / 1e6:.2f}MB saved={self.saved_ratio * 100:.0f}% "
+            f"compressed={self.compressed} aborted={self.aborted}"
+        )
+
+
+class TransferStats:
+    """
+    Process-wide wire/decoded counters (thread-safe), in total and per route.
+    Take snapshot() / snapshot_routes() before and after a run and diff them
+    with TransferTotals.minus().
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._totals = TransferTotals()
+        self._routes: Dict[str, TransferTotals] = {}
+
+    def record(self, body: BodyRead) -> None:
+        with self._lock:
+            self._totals.add(body)
+            if body.route:
+                self._routes.setdefault(body.route, TransferTotals()).add(body)
+
+    def snapshot(self) -> TransferTotals:
+        with self._lock:
+            return self._totals.copy()
+
+    def snapshot_routes(self) -> Dict[str, TransferTotals]:
+        with self._lock:
+            return {k: v.copy() for k, v in self._routes.items()}
+
+
+TRANSFER_STATS = TransferStats()
+
+
+def _wire_position(resp) -> Optional[int]:
+    # urllib3: raw.tell() counts bytes pulled off the socket (before decoding)
+    raw = getattr(resp, "raw", None)
+    tell = getattr(raw, "tell", None)
+    if tell is None:
+        return None
+    try:
+        return int(tell())
+    except Exception:
+        return None
+
+
+def _elapsed_s(resp) -> float:
+    # requests: timedelta until the headers were parsed; curl_cffi: seconds
+    el = getattr(resp, "elapsed", None)
+    try:
+        return float(el.total_seconds()) if hasattr(el, "total_seconds") else float(el or 0.0)
+    except Exception:
+        return 0.0
+
+
+def _iter_chunks(resp, chunk_size: int):
+    it = getattr(resp, "iter_content", None)
+    if it is None:
+        content = getattr(resp, "content", b"") or b""
+        for i in range(0, len(content), chunk_size):
+            yield content[i:i + chunk_size]
+        return
+    for chunk in it(chunk_size=chunk_size):
+        if chunk:
+            yield chunk
+
+
+def read_body(
+    resp,
+    *,
+    max_bytes: int,
+    inspect: Optional[Inspector] = None,
+    stop_at_html_end: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    sniff_bytes: int = SNIFF_BYTES,
+    sniff_until: Optional[bytes] = None,
+) -> BodyRead:
+    """
+    Read a streamed response (requests or curl_cffi, stream=True) up to
+    max_bytes. On abort, data holds what was read so far (at least the sniffed
+    head) so callers can still log/sniff it.
+    """
+    buf = bytearray()
+    inspected = inspect is None
+    headers = getattr(resp, "headers", None) or {}
+    out = BodyRead(
+        data=b"",
+        content_encoding=(headers.get("Content-Encoding") or "").strip(),
+        route=str(getattr(resp, "route", "") or ""),
+        latency_s=_elapsed_s(resp),
+    )
+    t0 = time.perf_counter()
+    decoded = 0
+    wire: Optional[int] = None
+    clean = False
+    try:
+        for chunk in _iter_chunks(resp, chunk_size):
+            decoded += len(chunk)
+            wire = _wire_position(resp)
+            if wire and decoded >= BOMB_CHECK_MIN_BYTES and decoded > wire * MAX_DECODE_RATIO:
+                out.aborted = f"decompression ratio exceeded ({decoded}/{wire} bytes)"
+                break
+
+            prev_len = len(buf)
+            room = max_bytes - prev_len
+            if len(chunk) > room:
+                buf += chunk[:room]
+                out.truncated = True
+            else:
+                buf += chunk
+
+            if not inspected:
+                head_done = len(buf) >= sniff_bytes or out.truncated
+                if not head_done and sniff_until:
+                    window = bytes(buf[max(0, prev_len - len(sniff_until)):]).lower()
+                    head_done = sniff_until in window
+                if head_done:
+                    inspected = True
+                    reason = inspect(bytes(buf[:sniff_bytes]))
+                    if reason:
+                        out.aborted = reason
+                        break
+
+            if stop_at_html_end:
+                # look back a few bytes so a tag split across chunks is still found
+                window = bytes(buf[max(0, prev_len - len(_HTML_END)):]).lower()
+                if _HTML_END in window:
+                    out.html_end = True
+                    break
+
+            if out.truncated:
+                break
+
+        if not inspected and buf:
+            reason = inspect(bytes(buf[:sniff_bytes]))
+            if reason:
+                out.aborted = reason
+        clean = not out.aborted
+    finally:
+        if wire is None:
+            wire = _wire_position(resp)
+        release(resp, drain_limit=DRAIN_MAX_BYTES if clean else 0)
+
+    out.transfer_s = time.perf_counter() - t0
+    out.data = bytes(buf)
+    out.decoded_bytes = decoded
+    if wire is None:
+        # no raw stream to ask (e.g. curl_cffi): best effort from the header
+        try:
+            wire = int(headers.get("Content-Length") or 0) if out.content_encoding else 0
+        except Exception:
+            wire = 0
+        wire = wire or decoded
+    out.wire_bytes = wire
+    TRANSFER_STATS.record(out)
+    return out
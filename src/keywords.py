@@ -177,6 +177,32 @@ def _write_layer1_fields(a: Article, nat_hits: List[str], thr_hits: List[str], s
     a.raw["kw_shortlisted"] = bool(shortlisted)
 
 
+# -----------------------
+# Reading Layer 1 fields (UI, export)
+# -----------------------
+def national_hits(a: Article) -> List[str]:
+    # Prefer spec field, fall back to legacy/raw
+    if getattr(a, "kw_national_hits", None):
+        return list(a.kw_national_hits or [])
+    if getattr(a, "keywords_national_matched", None):
+        return list(a.keywords_national_matched or [])
+    return list((a.raw or {}).get("kw_national_hits") or [])
+
+
+def threat_hits(a: Article) -> List[str]:
+    if getattr(a, "kw_threat_hits", None):
+        return list(a.kw_threat_hits or [])
+    if getattr(a, "keywords_threat_matched", None):
+        return list(a.keywords_threat_matched or [])
+    return list((a.raw or {}).get("kw_threat_hits") or [])
+
+
+def is_shortlisted(a: Article) -> bool:
+    if getattr(a, "shortlisted", None) is True:
+        return True
+    return (a.raw or {}).get("kw_shortlisted") is True
+
+
 # -----------------------
 # Two-layer shortlisting
 # -----------------------
@@ -262,3 +288,49 @@ def shortlist_articles_two_layer(
         national_total_hits=nat_hits_total,
         threat_total_hits=thr_hits_total,
     )
+
+
+# -----------------------
+# Pre-extraction relevance gate
+# -----------------------
+GATE_OFF = "off"
+GATE_DEFER = "defer"   # extract zero-signal items last, after everything else
+GATE_SKIP = "skip"     # never extract zero-signal items (discovery data is kept)
+
+GATE_MODES = (GATE_OFF, GATE_DEFER, GATE_SKIP)
+
+_URL_SEP_RE = re.compile(r"[/_.\-+=?&%]+")
+
+
+def _gate_haystack(a: Article) -> str:
+    # URL slugs: split on separators so "pakistan_army" / "pakistan-army" match \bpakistan\b
+    return " ".join([a.title or "", a.summary or "", _URL_SEP_RE.sub(" ", a.url or "")])
+
+
+@dataclass
+class GateResult:
+    with_signal: List[Article]
+    without_signal: List[Article]
+
+
+def gate_by_national_signal(articles: List[Article], national_keywords: List[str]) -> GateResult:
+    """
+    Cheap Layer-1 preview on discovery data only (title, summary, URL), run
+    before full-text extraction. Articles without any national keyword in those
+    fields are unlikely to survive shortlisting.
+
+    Hits are recorded in raw["gate_national_hits"]; shortlisting later
+    recomputes the real Layer-1 fields on full text.
+    """
+    pats = _compile_keyword_patterns(national_keywords)
+    if not pats:
+        return GateResult(with_signal=list(articles), without_signal=[])
+
+    with_signal: List[Article] = []
+    without_signal: List[Article] = []
+    for a in articles:
+        hits = _match_keywords(_gate_haystack(a), pats)
+        _ensure_raw(a)
+        a.raw["gate_national_hits"] = hits
+        (with_signal if hits else without_signal).append(a)
+    return GateResult(with_signal=with_signal, without_signal=without_signal)
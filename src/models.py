@@ -10,6 +10,7 @@ class Endpoint:
     url: str
     note: str = ""
     enabled: bool = True
+    route: str = ""  # "" = same as the source; else tor / direct / proxy:<URL> (see routing.py)
 
     # runtime status (not necessarily persisted)
     last_status: str = "UNKNOWN"  # WORKING / PARTIAL / FAILING / UNKNOWN
@@ -22,6 +23,7 @@ class Source:
     name: str
     endpoints: List[Endpoint] = field(default_factory=list)
     enabled: bool = True
+    route: str = "tor"  # tor / direct / proxy:<URL> (see routing.py)
 
 
 @dataclass
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# =============================================================================
+# Per-stage run profiling (meta.json "profile", optional profiler dumps)
+# =============================================================================
+#
+# RunProfiler times the pipeline stages of a run, per stage and source:
+#   discovery    fetch_discovery_items (includes date_sniff)
+#   date_sniff   page date sniffing inside discovery (date modes)
+#   extraction   article download + extraction, per source (and deferred)
+#   save         writing fetched/ items
+#   shortlisting / layer2 / layer3   analysis steps run later on the loaded run
+#
+# Each stage records calls, wall time, CPU time of the whole process (all
+# threads; extraction processes are not included) and items handled, so
+# throughput is items / wall second. The numbers are merged into the
+# run's meta.json under "profile" (later stages add to what is there) and
+# summarized as [STAGE] lines in the Logs tab.
+#
+# Optionally a fetch run also writes profiler dumps to <run>/profile/:
+#   cprofile   fetch.prof (pstats / snakeviz) + fetch.prof.txt, the run's
+#              worker thread only (discovery, feed / sitemap / listing
+#              parsing, date filtering)
+#   sampling   fetch.stacks.txt, collapsed stacks of every thread sampled
+#              every SAMPLE_INTERVAL_S (flamegraph.pl / speedscope), plus
+#              fetch.stacks.top.txt with the hottest functions; idle pool
+#              workers are left out
+# =============================================================================
+
+META_FILE = "meta.json"
+PROFILE_DIRNAME = "profile"
+
+STAGE_DISCOVERY = "discovery"
+STAGE_DATE_SNIFF = "date_sniff"
+STAGE_EXTRACTION = "extraction"
+STAGE_SAVE = "save"
+STAGE_SHORTLISTING = "shortlisting"
+STAGE_LAYER2 = "layer2"
+STAGE_LAYER3 = "layer3"
+
+PROFILE_OFF = "off"
+PROFILE_CPROFILE = "cprofile"
+PROFILE_SAMPLING = "sampling"
+PROFILE_MODES = (PROFILE_OFF, PROFILE_CPROFILE, PROFILE_SAMPLING)
+
+SAMPLE_INTERVAL_S = 0.005
+_TOP_FUNCTIONS = 40
+
+# meta.json is read-modify-written by the fetch worker and the GUI thread
+_META_LOCK = threading.Lock()
+
+
+@dataclass
+class StageStats:
+    stage: str
+    source: str = ""
+    calls: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    items: int = 0
+
+    @property
+    def items_per_s(self) -> float:
+        return self.items / self.wall_s if self.wall_s > 0 else 0.0
+
+    def add(self, other: "StageStats") -> None:
+        self.calls += other.calls
+        self.wall_s += other.wall_s
+        self.cpu_s += other.cpu_s
+        self.items += other.items
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        d["wall_s"] = round(self.wall_s, 3)
+        d["cpu_s"] = round(self.cpu_s, 3)
+        d["items_per_s"] = round(self.items_per_s, 2)
+        return d
+
+    def describe(self) -> str:
+        who = f"{self.stage} [{self.source}]" if self.source else self.stage
+        return (
+            f"{who}: calls={self.calls} wall={self.wall_s:.2f}s cpu={self.cpu_s:.2f}s "
+            f"items={self.items} ({self.items_per_s:.1f}/s)"
+        )
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "StageStats":
+        return cls(
+            stage=str(d.get("stage") or ""),
+            source=str(d.get("source") or ""),
+            calls=int(d.get("calls") or 0),
+            wall_s=float(d.get("wall_s") or 0.0),
+            cpu_s=float(d.get("cpu_s") or 0.0),
+            items=int(d.get("items") or 0),
+        )
+
+
+class StageTimer:
+    """
+    Handle yielded by RunProfiler.stage(); set .items to what the stage
+    handled (known only once it is done).
+    """
+    def __init__(self, items: int = 0) -> None:
+        self.items = items
+
+
+def _merge(stats: Dict[Tuple[str, str], StageStats], st: StageStats) -> None:
+    cur = stats.get((st.stage, st.source))
+    if cur is None:
+        stats[(st.stage, st.source)] = StageStats(st.stage, st.source, st.calls, st.wall_s, st.cpu_s, st.items)
+    else:
+        cur.add(st)
+
+
+def stage_totals(stages: List[StageStats]) -> List[StageStats]:
+    """
+    Per-stage sums over all sources, in pipeline order of first appearance.
+    """
+    out: Dict[Tuple[str, str], StageStats] = {}
+    for st in stages:
+        _merge(out, StageStats(st.stage, "", st.calls, st.wall_s, st.cpu_s, st.items))
+    return list(out.values())
+
+
+class RunProfiler:
+    """
+    Stage timings for one run (thread-safe). With run_dir None nothing is
+    written; stages are still timed for the log.
+    """
+    def __init__(self, run_dir: Optional[str]) -> None:
+        self.run_dir = run_dir
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], StageStats] = {}
+        self.dumps: List[str] = []
+
+    @contextmanager
+    def stage(self, name: str, source: str = "", items: int = 0) -> Iterator[StageTimer]:
+        timer = StageTimer(items)
+        w0, c0 = time.perf_counter(), time.process_time()
+        try:
+            yield timer
+        finally:
+            st = StageStats(
+                stage=name,
+                source=source,
+                calls=1,
+                wall_s=time.perf_counter() - w0,
+                cpu_s=time.process_time() - c0,
+                items=int(timer.items or 0),
+            )
+            with self._lock:
+                _merge(self._stats, st)
+
+    def stages(self) -> List[StageStats]:
+        with self._lock:
+            return [StageStats(s.stage, s.source, s.calls, s.wall_s, s.cpu_s, s.items) for s in self._stats.values()]
+
+    def log_lines(self, top_sources: int = 10) -> List[str]:
+        stages = self.stages()
+        lines = [st.describe() for st in stage_totals(stages)]
+        per_source = [st for st in stages if st.source]
+        per_source.sort(key=lambda s: (-s.wall_s, s.stage, s.source))
+        lines.extend(st.describe() for st in per_source[:top_sources])
+        return lines
+
+    def save(self) -> None:
+        """
+        Merge this profiler's stages into <run>/meta.json ("profile").
+        """
+        if not self.run_dir or not os.path.isdir(self.run_dir):
+            return
+        path = os.path.join(self.run_dir, META_FILE)
+        with _META_LOCK:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                if not isinstance(meta, dict):
+                    meta = {}
+            except Exception:
+                meta = {}
+
+            prof = meta.get("profile") if isinstance(meta.get("profile"), dict) else {}
+            merged: Dict[Tuple[str, str], StageStats] = {}
+            for d in prof.get("stages") or []:
+                if isinstance(d, dict):
+                    _merge(merged, StageStats.from_dict(d))
+            for st in self.stages():
+                _merge(merged, st)
+            stages = list(merged.values())
+
+            dumps = [x for x in (prof.get("dumps") or []) if isinstance(x, str)]
+            for p in self.dumps:
+                rel = os.path.relpath(p, self.run_dir)
+                if rel not in dumps:
+                    dumps.append(rel)
+
+            meta["profile"] = {
+                "version": 1,
+                "totals": [st.to_dict() for st in stage_totals(stages)],
+                "stages": [st.to_dict() for st in stages],
+                "dumps": dumps,
+            }
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, path)
+
+
+# -----------------------
+# Profiler dumps
+# -----------------------
+def _is_idle_pool_worker(frame) -> bool:
+    # ThreadPoolExecutor worker blocked on its work queue (the wait itself is in C)
+    code = frame.f_code
+    return code.co_name == "_worker" and code.co_filename.endswith(os.path.join("concurrent", "futures", "thread.py"))
+
+
+class StackSampler:
+    """
+    Samples the Python stacks of all threads on a background thread and
+    counts them as collapsed stacks ("thread;module:func;module:func").
+    """
+    def __init__(self, interval_s: float = SAMPLE_INTERVAL_S) -> None:
+        self.interval_s = interval_s
+        self.samples = 0
+        self._counts: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me or _is_idle_pool_worker(frame):
+                    continue
+                stack: List[str] = []
+                f = frame
+                while f is not None:
+                    code = f.f_code
+                    mod = os.path.splitext(os.path.basename(code.co_filename))[0]
+                    stack.append(f"{mod}:{code.co_name}")
+                    f = f.f_back
+                stack.append(names.get(ident) or str(ident))
+                key = ";".join(reversed(stack))
+                self._counts[key] = self._counts.get(key, 0) + 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{k} {v}\n" for k, v in sorted(self._counts.items(), key=lambda kv: -kv[1]))
+
+    def top_functions(self, n: int = _TOP_FUNCTIONS) -> str:
+        own: Dict[str, int] = {}
+        total: Dict[str, int] = {}
+        for key, count in self._counts.items():
+            frames = key.split(";")[1:]
+            if not frames:
+                continue
+            own[frames[-1]] = own.get(frames[-1], 0) + count
+            for fn in set(frames):
+                total[fn] = total.get(fn, 0) + count
+        n_all = sum(self._counts.values()) or 1
+        lines = [f"{'self%':>7} {'total%':>7}  function   ({self.samples} samples every {self.interval_s * 1000:.0f}ms)"]
+        for fn, c in sorted(own.items(), key=lambda kv: -kv[1])[:n]:
+            lines.append(f"{c * 100 / n_all:7.2f} {total.get(fn, 0) * 100 / n_all:7.2f}  {fn}")
+        return "\n".join(lines) + "\n"
+
+
+class ProfileCapture:
+    """
+    Optional profiler around a fetch run; stop() writes the dumps into
+    <run>/profile/ and returns their paths.
+    """
+    def __init__(self, mode: str, run_dir: str, name: str = "fetch") -> None:
+        self.mode = mode if mode in PROFILE_MODES else PROFILE_OFF
+        self.out_dir = os.path.join(run_dir, PROFILE_DIRNAME)
+        self.name = name
+        self._cprof: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+
+    def start(self) -> None:
+        # call from the thread to be profiled (cProfile is per thread)
+        if self.mode == PROFILE_CPROFILE:
+            self._cprof = cProfile.Profile()
+            self._cprof.enable()
+        elif self.mode == PROFILE_SAMPLING:
+            self._sampler = StackSampler()
+            self._sampler.start()
+
+    def stop(self) -> List[str]:
+        paths: List[str] = []
+        if self._cprof is not None:
+            self._cprof.disable()
+            os.makedirs(self.out_dir, exist_ok=True)
+            prof_path = os.path.join(self.out_dir, f"{self.name}.prof")
+            self._cprof.dump_stats(prof_path)
+            buf = io.StringIO()
+            pstats.Stats(self._cprof, stream=buf).sort_stats("cumulative").print_stats(_TOP_FUNCTIONS)
+            txt_path = prof_path + ".txt"
+            with open(txt_path, "w", encoding="utf-8") as f:
+                f.write(buf.getvalue())
+            paths += [prof_path, txt_path]
+            self._cprof = None
+        if self._sampler is not None:
+            self._sampler.stop()
+            os.makedirs(self.out_dir, exist_ok=True)
+            stacks_path = os.path.join(self.out_dir, f"{self.name}.stacks.txt")
+            with open(stacks_path, "w", encoding="utf-8") as f:
+                f.write(self._sampler.collapsed())
+            top_path = os.path.join(self.out_dir, f"{self.name}.stacks.top.txt")
+            with open(top_path, "w", encoding="utf-8") as f:
+                f.write(self._sampler.top_functions())
+            paths += [stacks_path, top_path]
+            self._sampler = None
+        return paths
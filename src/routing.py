@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from .http_pool import mount_pooled_adapters
+from .http_stream import TransferTotals
+from .models import Endpoint, Source
+
+
+# =============================================================================
+# Per-source routing (direct / Tor / explicit proxy)
+# =============================================================================
+#
+# sources.json may set "route" on a source and on single endpoints:
+#   "tor"          (default) through the warm Tor service (tor_client)
+#   "direct"       no proxy; for large international outlets that do not
+#                  need anonymity and are far faster without Tor
+#   "proxy:<URL>"  through that proxy, e.g. proxy:socks5h://127.0.0.1:1080 or
+#                  proxy:http://10.0.0.2:3128
+# An endpoint without a route uses its source's. Unrecognised values fall back
+# to Tor, never to a direct connection.
+#
+# Discovery uses the endpoint's route; date sniffing and article extraction
+# use the source's.
+#
+# RouteSessions opens one pooled session per route on first use, so Tor is
+# only waited for when a run needs it. Responses are tagged with their route
+# (resp.route) and TRANSFER_STATS keeps per-route latency / transfer time /
+# bytes, logged as [ROUTE] lines after each run.
+# =============================================================================
+
+ROUTE_TOR = "tor"
+ROUTE_DIRECT = "direct"
+PROXY_PREFIX = "proxy:"
+
+_PROXY_SCHEMES = ("http", "https", "socks4", "socks4a", "socks5", "socks5h")
+
+
+def parse_route(value: Any) -> str:
+    """
+    Normalized route, "" when unset (inherit). Invalid values become "tor".
+    """
+    s = str(value or "").strip()
+    if not s:
+        return ""
+    low = s.lower()
+    if low in (ROUTE_TOR, ROUTE_DIRECT):
+        return low
+    if low.startswith(PROXY_PREFIX):
+        url = s[len(PROXY_PREFIX):].strip()
+        p = urlparse(url)
+        if p.scheme.lower() in _PROXY_SCHEMES and p.hostname:
+            return PROXY_PREFIX + url
+    return ROUTE_TOR
+
+
+def route_for(source: Source, endpoint: Optional[Endpoint] = None) -> str:
+    if endpoint is not None:
+        r = parse_route(getattr(endpoint, "route", ""))
+        if r:
+            return r
+    return parse_route(getattr(source, "route", "")) or ROUTE_TOR
+
+
+def route_label(route: str) -> str:
+    """
+    Route for logs: proxy credentials are dropped.
+    """
+    if not route.startswith(PROXY_PREFIX):
+        return route
+    p = urlparse(route[len(PROXY_PREFIX):])
+    host = p.hostname or ""
+    return f"{PROXY_PREFIX}{p.scheme}://{host}" + (f":{p.port}" if p.port else "")
+
+
+def _tag_route(label: str):
+    def hook(r, *args, **kwargs):
+        r.route = label
+        return r
+    return hook
+
+
+class RouteSessions:
+    """
+    One requests.Session per route for a fetch run. tor_factory returns a
+    started TorHTTPClient (get_managed_tor_session); it is called at most
+    once, and a failure is remembered so later Tor sources fail fast.
+    """
+    def __init__(self, tor_factory: Callable[[], Any]) -> None:
+        self._tor_factory = tor_factory
+        self._tor_client: Any = None
+        self._tor_error: Optional[str] = None
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def session(self, route: str) -> requests.Session:
+        route = parse_route(route) or ROUTE_TOR
+        with self._lock:
+            sess = self._sessions.get(route)
+            if sess is not None:
+                return sess
+            if route == ROUTE_TOR:
+                if self._tor_error is not None:
+                    raise RuntimeError(self._tor_error)
+                try:
+                    self._tor_client = self._tor_factory()
+                except Exception as ex:
+                    self._tor_error = str(ex) or type(ex).__name__
+                    raise
+                sess = self._tor_client.session
+            else:
+                sess = mount_pooled_adapters(requests.Session())
+                # an explicit route must not be overridden by HTTP(S)_PROXY from the environment
+                sess.trust_env = False
+                if route.startswith(PROXY_PREFIX):
+                    url = route[len(PROXY_PREFIX):]
+                    sess.proxies.update({"http": url, "https": url})
+            sess.hooks["response"].append(_tag_route(route_label(route)))
+            self._sessions[route] = sess
+            return sess
+
+    def for_source(self, source: Source) -> requests.Session:
+        return self.session(route_for(source))
+
+    def for_endpoint(self, source: Source, endpoint: Endpoint) -> requests.Session:
+        return self.session(route_for(source, endpoint))
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+            client, self._tor_client = self._tor_client, None
+        for route, sess in sessions.items():
+            if route != ROUTE_TOR:
+                try:
+                    sess.close()
+                except Exception:
+                    pass
+        if client is not None:
+            client.close()
+
+
+def route_report(before: Dict[str, TransferTotals], after: Dict[str, TransferTotals]) -> List[str]:
+    """
+    One line per route used between two TRANSFER_STATS.snapshot_routes().
+    """
+    out: List[str] = []
+    for label in sorted(after):
+        t = after[label].minus(before.get(label) or TransferTotals())
+        if t.requests <= 0:
+            continue
+        out.append(
+            f"{label}: requests={t.requests} avg_latency={t.avg_latency_s * 1000:.0f}ms "
+            f"throughput={t.throughput_bps / 1024:.1f}KB/s wire={t.wire_bytes / 1e6:.2f}MB"
+        )
+    return out
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+from .models import Article
+
+
+# =============================================================================
+# In-memory full-text index for the Browse tab
+# =============================================================================
+#
+# Backed by an in-memory SQLite FTS5 table (contentless, so article text is not
+# stored twice). Documents are keyed by article id (url as fallback).
+#
+# Query syntax (all terms are ANDed):
+#   karachi police          -> both terms
+#   "suicide attack"        -> exact phrase
+#   balo*                   -> prefix
+# The last bare term is also treated as a prefix so results update while the
+# analyst is still typing a word.
+#
+# If FTS5 is not compiled into the local SQLite, `available` is False and
+# callers fall back to a linear substring scan.
+# =============================================================================
+
+_QUERY_TOKEN_RE = re.compile(r'"([^"]*)"?|(\S+)')
+_WORD_RE = re.compile(r"\w", re.UNICODE)
+
+
+def article_key(a: Article) -> str:
+    return a.id or a.url or ""
+
+
+def _doc_fields(a: Article) -> List[str]:
+    return [a.title or "", a.summary or "", a.content_text or "", a.url or ""]
+
+
+def _signature(fields: List[str]) -> str:
+    h = hashlib.blake2b(digest_size=12)
+    for f in fields:
+        h.update(f.encode("utf-8", errors="ignore"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def _fts_quote(s: str) -> str:
+    return '"' + s.replace('"', '""') + '"'
+
+
+def build_fts_query(query: str) -> str:
+    """
+    Translate the Browse search box syntax into an FTS5 MATCH expression.
+    Returns "" when the query has no searchable terms.
+    """
+    raw = query or ""
+    q = raw.strip()
+    if not q:
+        return ""
+
+    parts: List[str] = []
+    last_bare_idx = -1
+    for m in _QUERY_TOKEN_RE.finditer(q):
+        phrase, bare = m.group(1), m.group(2)
+        if phrase is not None:
+            if _WORD_RE.search(phrase):
+                parts.append(_fts_quote(phrase.strip()))
+            continue
+
+        term = bare or ""
+        prefix = term.endswith("*")
+        term = term.rstrip("*")
+        if not _WORD_RE.search(term):
+            continue
+        if prefix:
+            parts.append(_fts_quote(term) + "*")
+        else:
+            parts.append(_fts_quote(term))
+            last_bare_idx = len(parts) - 1
+
+    # as-you-type: trailing bare word acts as prefix (a trailing space ends the word)
+    if last_bare_idx == len(parts) - 1 and last_bare_idx >= 0 and not raw.endswith((" ", '"')):
+        parts[last_bare_idx] = parts[last_bare_idx] + "*"
+
+    return " ".join(parts)
+
+
+class ArticleSearchIndex:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(":memory:", check_same_thread=False)
+        self._key_rowid: Dict[str, int] = {}
+        self._key_sig: Dict[str, str] = {}
+        self._rowid_key: Dict[int, str] = {}
+        self._next_rowid = 1
+        self._orphans = 0
+        self.available = self._create_table()
+
+    def _create_table(self) -> bool:
+        for tokenizer in ("unicode61 remove_diacritics 2", "unicode61"):
+            try:
+                self._con.execute(
+                    "CREATE VIRTUAL TABLE docs USING fts5("
+                    f"title, summary, content, url, content='', tokenize='{tokenizer}')"
+                )
+                return True
+            except sqlite3.OperationalError:
+                continue
+        return False
+
+    def __len__(self) -> int:
+        return len(self._key_rowid)
+
+    # -----------------------
+    # Build / update
+    # -----------------------
+    def rebuild(self, articles: Iterable[Article]) -> None:
+        if not self.available:
+            return
+        with self._lock:
+            self._con.execute("INSERT INTO docs(docs) VALUES('delete-all')")
+            self._key_rowid.clear()
+            self._key_sig.clear()
+            self._rowid_key.clear()
+            self._next_rowid = 1
+            self._orphans = 0
+            self._insert_locked(articles)
+
+    def update(self, articles: Iterable[Article]) -> int:
+        """
+        Add new articles and re-index those whose searchable text changed.
+        Unchanged documents are skipped. Returns number of documents written.
+        """
+        if not self.available:
+            return 0
+        articles = list(articles)
+        with self._lock:
+            n = self._insert_locked(articles)
+            # Contentless FTS rows cannot be deleted on every SQLite version;
+            # superseded rows are left behind and filtered out. Compact when
+            # they start to dominate.
+            if self._orphans > max(1000, len(self._key_rowid)):
+                self._compact_locked(articles)
+            return n
+
+    def _insert_locked(self, articles: Iterable[Article]) -> int:
+        rows = []
+        for a in articles:
+            key = article_key(a)
+            if not key:
+                continue
+            fields = _doc_fields(a)
+            sig = _signature(fields)
+            if self._key_sig.get(key) == sig:
+                continue
+            old = self._key_rowid.get(key)
+            if old is not None:
+                self._rowid_key.pop(old, None)
+                self._orphans += 1
+            rowid = self._next_rowid
+            self._next_rowid += 1
+            self._key_rowid[key] = rowid
+            self._key_sig[key] = sig
+            self._rowid_key[rowid] = key
+            rows.append((rowid, *fields))
+
+        if rows:
+            with self._con:
+                self._con.executemany(
+                    "INSERT INTO docs(rowid, title, summary, content, url) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+        return len(rows)
+
+    def _compact_locked(self, articles: Iterable[Article]) -> None:
+        self._con.execute("INSERT INTO docs(docs) VALUES('delete-all')")
+        self._key_rowid.clear()
+        self._key_sig.clear()
+        self._rowid_key.clear()
+        self._next_rowid = 1
+        self._orphans = 0
+        self._insert_locked(articles)
+
+    # -----------------------
+    # Search
+    # -----------------------
+    def search(self, query: str) -> Optional[Set[str]]:
+        """
+        Returns matching article keys, or None if the query has no searchable
+        terms (callers should then apply no text filter).
+        """
+        if not self.available:
+            return None
+        expr = build_fts_query(query)
+        if not expr:
+            return None
+        with self._lock:
+            try:
+                rows = self._con.execute("SELECT rowid FROM docs WHERE docs MATCH ?", (expr,)).fetchall()
+            except sqlite3.OperationalError:
+                return set()
+            rk = self._rowid_key
+            return {rk[r] for (r,) in rows if r in rk}
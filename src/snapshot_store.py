@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+try:
+    import zstandard as zstd
+    HAS_ZSTD = True
+except Exception:
+    zstd = None
+    HAS_ZSTD = False
+
+
+# =============================================================================
+# Raw HTML snapshot store
+# =============================================================================
+#
+# Fetched article pages are kept on disk so extraction can be re-run later
+# without going back to the network (e.g. after an extractor change).
+#
+# Layout (content-addressed, deduplicated by sha256 of the UTF-8 page):
+#   data/snapshots/<sha[:2]>/<sha>.html.zst   (zstandard, if installed)
+#   data/snapshots/<sha[:2]>/<sha>.html.gz    (gzip otherwise)
+#
+# Articles point at their page through raw["snapshot"]:
+#   {"sha256", "codec", "size", "fetch_method", "fetch_status", "fetched_at"}
+# =============================================================================
+
+CODEC_ZSTD = "zst"
+CODEC_GZIP = "gz"
+
+ZSTD_LEVEL = 10
+GZIP_LEVEL = 6
+
+_CODECS = (CODEC_ZSTD, CODEC_GZIP)
+
+
+def snapshots_dir(base_dir: str) -> str:
+    return os.path.join(base_dir, "data", "snapshots")
+
+
+def _iso_utc_now() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+
+class SnapshotStore:
+    def __init__(self, root: str, *, codec: Optional[str] = None) -> None:
+        self.root = root
+        if codec is None:
+            codec = CODEC_ZSTD if HAS_ZSTD else CODEC_GZIP
+        if codec == CODEC_ZSTD and not HAS_ZSTD:
+            raise RuntimeError("zstd snapshots require zstandard (pip install zstandard)")
+        if codec not in _CODECS:
+            raise ValueError(f"Unknown snapshot codec: {codec}")
+        self.codec = codec
+        self._local = threading.local()
+        os.makedirs(self.root, exist_ok=True)
+
+    @classmethod
+    def for_base_dir(cls, base_dir: str, *, codec: Optional[str] = None) -> "SnapshotStore":
+        return cls(snapshots_dir(base_dir), codec=codec)
+
+    # -----------------------
+    # Paths / codecs
+    # -----------------------
+    def path_for(self, sha: str, codec: str) -> str:
+        return os.path.join(self.root, sha[:2], f"{sha}.html.{codec}")
+
+    def _find(self, sha: str, codec: Optional[str] = None) -> Optional[str]:
+        order = [codec] if codec in _CODECS else []
+        order += [c for c in _CODECS if c not in order]
+        for c in order:
+            p = self.path_for(sha, c)
+            if os.path.exists(p):
+                return p
+        return None
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == CODEC_ZSTD:
+            # ZstdCompressor is not thread-safe: one per fetch thread
+            c = getattr(self._local, "zc", None)
+            if c is None:
+                c = self._local.zc = zstd.ZstdCompressor(level=ZSTD_LEVEL)
+            return c.compress(data)
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+    @staticmethod
+    def _decompress(path: str, blob: bytes) -> bytes:
+        if path.endswith("." + CODEC_ZSTD):
+            if not HAS_ZSTD:
+                raise RuntimeError("snapshot is zstd-compressed but zstandard is not installed")
+            return zstd.ZstdDecompressor().decompress(blob)
+        return gzip.decompress(blob)
+
+    # -----------------------
+    # API
+    # -----------------------
+    def has(self, sha: str) -> bool:
+        return self._find(sha) is not None
+
+    def put(self, html: str, *, fetch_method: str = "", fetch_status: int = 0) -> Dict[str, Any]:
+        """
+        Store a page (no-op if the same content is already stored) and return
+        the reference to keep in article.raw["snapshot"].
+        """
+        data = html.encode("utf-8", errors="replace")
+        sha = hashlib.sha256(data).hexdigest()
+
+        existing = self._find(sha, self.codec)
+        codec = self.codec
+        if existing is not None:
+            codec = existing.rsplit(".", 1)[-1]
+        else:
+            path = self.path_for(sha, codec)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+            with open(tmp, "wb") as f:
+                f.write(self._compress(data))
+            os.replace(tmp, path)
+
+        return {
+            "sha256": sha,
+            "codec": codec,
+            "size": len(data),
+            "fetch_method": fetch_method,
+            "fetch_status": int(fetch_status or 0),
+            "fetched_at": _iso_utc_now(),
+        }
+
+    def get(self, sha: str, codec: Optional[str] = None) -> Optional[str]:
+        path = self._find(sha, codec)
+        if path is None:
+            return None
+        with open(path, "rb") as f:
+            blob = f.read()
+        return self._decompress(path, blob).decode("utf-8", errors="replace")
+
+    def get_ref(self, ref: Optional[Dict[str, Any]]) -> Optional[str]:
+        if not isinstance(ref, dict) or not ref.get("sha256"):
+            return None
+        return self.get(str(ref["sha256"]), ref.get("codec"))
@@ -5,6 +5,7 @@ import os
 from typing import List, Tuple
 
 from .models import Endpoint, Source
+from .routing import ROUTE_TOR, parse_route
 
 
 def _data_paths(base_dir: str) -> Tuple[str, str, str]:
@@ -45,6 +46,7 @@ def load_sources(base_dir: str) -> List[Source]:
                     url=str(e.get("url", "")).strip(),
                     note=str(e.get("note", "")).strip(),
                     enabled=bool(e.get("enabled", True)),
+                    route=parse_route(e.get("route")),
                 )
             )
         out.append(
@@ -53,6 +55,7 @@ def load_sources(base_dir: str) -> List[Source]:
                 name=str(s.get("name", "")).strip(),
                 enabled=bool(s.get("enabled", True)),
                 endpoints=endpoints,
+                route=parse_route(s.get("route")) or ROUTE_TOR,
             )
         )
     return out
@@ -66,8 +69,9 @@ def save_sources(base_dir: str, sources: List[Source]) -> None:
             "country": s.country,
             "name": s.name,
             "enabled": s.enabled,
+            "route": s.route,
             "endpoints": [
-                {"type": e.type, "url": e.url, "note": e.note, "enabled": e.enabled}
+                {"type": e.type, "url": e.url, "note": e.note, "enabled": e.enabled, "route": e.route}
                 for e in s.endpoints
             ],
         })
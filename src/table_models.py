@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from .models import Article
+
+
+# =============================================================================
+# Model/view table for article lists (Browse + Analysis tabs)
+# =============================================================================
+#
+# - Cells are rendered lazily in data(): only rows Qt actually paints are
+#   formatted, no QTableWidgetItem per cell.
+# - Filtering and sorting operate on a list of row references with Python key
+#   functions (one key per row, C-level sort). A QSortFilterProxyModel would
+#   call back into Python for every comparison / row, which is what froze the
+#   UI at 100k rows.
+# - With sort_handler set, sorting is delegated (the GUI runs it on its view
+#   engine thread) and results come back through set_rows().
+# - refresh_articles() / append_articles() update individual rows without a
+#   model reset.
+# =============================================================================
+
+
+@dataclass
+class ColumnSpec:
+    header: str
+    display: Callable[[Article], str]
+    sort_key: Optional[Callable[[Article], Any]] = None
+
+
+def _none_last_key(fn: Callable[[Article], Any]) -> Callable[[Article], Any]:
+    def key(a: Article):
+        try:
+            v = fn(a)
+        except Exception:
+            v = None
+        if v is None or v == "":
+            return (1, 0)
+        return (0, v)
+    return key
+
+
+def sort_articles(
+    rows: List[Article],
+    columns: List[ColumnSpec],
+    column: int,
+    order: Qt.SortOrder = Qt.SortOrder.AscendingOrder,
+) -> List[Article]:
+    """
+    Returns a new list sorted by the given column. Empty values stay at the
+    bottom in both directions. Pure function: safe to call off the UI thread.
+    """
+    if column < 0 or column >= len(columns):
+        return list(rows)
+    spec = columns[column]
+    key = _none_last_key(spec.sort_key or spec.display)
+    desc = order == Qt.SortOrder.DescendingOrder
+
+    keyed = [(key(a), a) for a in rows]
+    filled = [(k[1], a) for k, a in keyed if k[0] == 0]
+    empty = [a for k, a in keyed if k[0] == 1]
+    try:
+        filled.sort(key=lambda t: t[0], reverse=desc)
+    except TypeError:
+        filled.sort(key=lambda t: str(t[0]), reverse=desc)
+    return [a for _, a in filled] + empty
+
+
+class ArticleTableModel(QAbstractTableModel):
+    ArticleRole = Qt.ItemDataRole.UserRole
+    UrlRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, columns: List[ColumnSpec], parent=None) -> None:
+        super().__init__(parent)
+        self._columns = list(columns)
+        self._all: List[Article] = []
+        self._rows: List[Article] = []
+        self._row_of: Optional[Dict[int, int]] = None
+        self._predicate: Optional[Callable[[Article], bool]] = None
+        self._sort_col = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        # When set, header clicks are forwarded here instead of sorting on the
+        # calling (UI) thread; the owner posts sorted rows back via set_rows().
+        self.sort_handler: Optional[Callable[[int, Qt.SortOrder], None]] = None
+
+    # -----------------------
+    # Qt model API
+    # -----------------------
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            if 0 <= section < len(self._columns):
+                return self._columns[section].header
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if row < 0 or row >= len(self._rows):
+            return None
+        a = self._rows[row]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            try:
+                return self._columns[index.column()].display(a)
+            except Exception:
+                return ""
+        if role == Qt.ItemDataRole.ToolTipRole and index.column() == 0:
+            return a.url or ""
+        if role == self.ArticleRole:
+            return a
+        if role == self.UrlRole:
+            return a.url or ""
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        self._sort_col = column
+        self._sort_order = order
+        if self.sort_handler is not None:
+            self.sort_handler(column, order)
+            return
+        self.layoutAboutToBeChanged.emit()
+        persisted = [(idx, self._rows[idx.row()]) for idx in self.persistentIndexList() if idx.isValid()]
+        self._apply_sort(self._rows)
+        self._row_of = None
+        row_of = self._row_map()
+        self.changePersistentIndexList(
+            [idx for idx, _ in persisted],
+            [self.index(row_of.get(id(a), -1), idx.column()) if id(a) in row_of else QModelIndex()
+             for idx, a in persisted],
+        )
+        self.layoutChanged.emit()
+
+    # -----------------------
+    # Data management
+    # -----------------------
+    def set_articles(self, articles: Iterable[Article]) -> None:
+        self.beginResetModel()
+        self._all = list(articles)
+        self._rows = self._filtered(self._all)
+        self._apply_sort(self._rows)
+        self._row_of = None
+        self.endResetModel()
+
+    def set_rows(self, articles: List[Article], rows: List[Article]) -> None:
+        """
+        Install a row set that was already filtered and sorted elsewhere.
+        """
+        self.beginResetModel()
+        self._all = articles
+        self._rows = rows
+        self._row_of = None
+        self.endResetModel()
+
+    def sort_state(self) -> Tuple[int, Qt.SortOrder]:
+        return self._sort_col, self._sort_order
+
+    def set_filter(self, predicate: Optional[Callable[[Article], bool]]) -> None:
+        self._predicate = predicate
+        self.beginResetModel()
+        self._rows = self._filtered(self._all)
+        self._apply_sort(self._rows)
+        self._row_of = None
+        self.endResetModel()
+
+    def refresh_articles(self, articles: Iterable[Article]) -> None:
+        """
+        Repaint rows for articles whose fields changed in place.
+        """
+        row_of = self._row_map()
+        rows = sorted({row_of[id(a)] for a in articles if id(a) in row_of})
+        if not rows:
+            return
+        last_col = len(self._columns) - 1
+        start = prev = rows[0]
+        for r in rows[1:] + [None]:
+            if r is not None and r == prev + 1:
+                prev = r
+                continue
+            self.dataChanged.emit(self.index(start, 0), self.index(prev, last_col))
+            if r is not None:
+                start = prev = r
+
+    def refresh_all(self) -> None:
+        if self._rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._rows) - 1, len(self._columns) - 1))
+
+    def resort(self) -> None:
+        """
+        Re-apply the current sort after scores changed in place.
+        """
+        if self._sort_col >= 0:
+            self.sort(self._sort_col, self._sort_order)
+
+    def append_articles(self, articles: Iterable[Article]) -> None:
+        new = list(articles)
+        if not new:
+            return
+        self._all.extend(new)
+        visible = self._filtered(new)
+        if not visible:
+            return
+        if self._sort_col >= 0:
+            self._rows.extend(visible)
+            self.sort(self._sort_col, self._sort_order)
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(visible) - 1)
+        self._rows.extend(visible)
+        self._row_of = None
+        self.endInsertRows()
+
+    def article_at(self, row: int) -> Optional[Article]:
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    def visible_articles(self) -> List[Article]:
+        return list(self._rows)
+
+    def all_articles(self) -> List[Article]:
+        return self._all
+
+    # -----------------------
+    # Internals
+    # -----------------------
+    def _filtered(self, items: List[Article]) -> List[Article]:
+        pred = self._predicate
+        if pred is None:
+            return list(items)
+        return [a for a in items if pred(a)]
+
+    def _apply_sort(self, rows: List[Article]) -> None:
+        rows[:] = sort_articles(rows, self._columns, self._sort_col, self._sort_order)
+
+    def _row_map(self) -> Dict[int, int]:
+        if self._row_of is None:
+            self._row_of = {id(a): i for i, a in enumerate(self._rows)}
+        return self._row_of
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence, TextIO
+
+
+# =============================================================================
+# Fetch telemetry (per-run metrics.jsonl + latency percentiles)
+# =============================================================================
+#
+# Every logical fetch (SmartHTTP.get for feeds / listings / sitemaps / date
+# sniffing, _fetch_html for articles) records one FetchEvent while a run is
+# active:
+#   - which path produced the result (requests, curl_cffi, insecure TLS) and
+#     after how many attempts
+#   - time to headers (ttfb_ms) of the final response and total wall time
+#     including retries, backoff and limiter waits (total_ms)
+#   - status / error, wire and decoded bytes, route
+#
+# Events are appended to <run>/metrics.jsonl as they happen. At the end of the
+# run they are aggregated per source and per host (count, errors, p50 / p90 /
+# p99 / max of total_ms, summed wall time) into <run>/metrics_summary.json and
+# [TIMING] log lines, sources ordered by the time they took.
+#
+# DNS and connect times are not separable: requests does not expose them, and
+# with socks5h the name is resolved by Tor inside the connect.
+# =============================================================================
+
+METRICS_FILE = "metrics.jsonl"
+SUMMARY_FILE = "metrics_summary.json"
+
+KIND_DISCOVERY = "discovery"
+KIND_ARTICLE = "article"
+
+
+@dataclass
+class FetchEvent:
+    kind: str                      # discovery / article
+    source: str
+    host: str
+    url: str
+    method: str                    # requests / requests_insecure_tls / curl_cffi
+    ok: bool
+    status: Optional[int] = None
+    error: str = ""
+    attempts: int = 1
+    ttfb_ms: float = 0.0
+    total_ms: float = 0.0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+    route: str = ""
+    ts: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat(timespec="milliseconds"))
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """
+    q in [0, 100], linear interpolation between closest ranks.
+    """
+    if not values:
+        return 0.0
+    xs = sorted(values)
+    pos = (len(xs) - 1) * max(0.0, min(100.0, q)) / 100.0
+    lo, hi = math.floor(pos), math.ceil(pos)
+    return xs[lo] + (xs[hi] - xs[lo]) * (pos - lo)
+
+
+@dataclass
+class LatencyStats:
+    key: str
+    count: int = 0
+    errors: int = 0
+    p50_ms: float = 0.0
+    p90_ms: float = 0.0
+    p99_ms: float = 0.0
+    max_ms: float = 0.0
+    total_s: float = 0.0           # summed wall time (concurrent fetches overlap)
+    wire_bytes: int = 0
+
+    def describe(self) -> str:
+        return (
+            f"{self.key}: n={self.count} err={self.errors} total={self.total_s:.1f}s "
+            f"p50={self.p50_ms:.0f}ms p90={self.p90_ms:.0f}ms p99={self.p99_ms:.0f}ms max={self.max_ms:.0f}ms "
+            f"wire={self.wire_bytes / 1e6:.2f}MB"
+        )
+
+
+def aggregate(events: Sequence[FetchEvent], key: Callable[[FetchEvent], str]) -> List[LatencyStats]:
+    """
+    Per-key latency stats, largest summed wall time first.
+    """
+    groups: Dict[str, List[FetchEvent]] = {}
+    for ev in events:
+        groups.setdefault(key(ev) or "-", []).append(ev)
+
+    out: List[LatencyStats] = []
+    for k, evs in groups.items():
+        ms = [e.total_ms for e in evs]
+        out.append(LatencyStats(
+            key=k,
+            count=len(evs),
+            errors=sum(1 for e in evs if not e.ok),
+            p50_ms=round(percentile(ms, 50), 1),
+            p90_ms=round(percentile(ms, 90), 1),
+            p99_ms=round(percentile(ms, 99), 1),
+            max_ms=max(ms),
+            total_s=round(sum(ms) / 1000.0, 3),
+            wire_bytes=sum(e.wire_bytes for e in evs),
+        ))
+    out.sort(key=lambda s: (-s.total_s, s.key))
+    return out
+
+
+@dataclass
+class TelemetrySummary:
+    events: int
+    by_source: List[LatencyStats]
+    by_host: List[LatencyStats]
+
+    def to_dict(self) -> dict:
+        return {
+            "version": 1,
+            "events": self.events,
+            "by_source": [asdict(s) for s in self.by_source],
+            "by_host": [asdict(s) for s in self.by_host],
+        }
+
+    def log_lines(self, top_hosts: int = 10) -> List[str]:
+        lines = [f"source {s.describe()}" for s in self.by_source]
+        lines.extend(f"host {s.describe()}" for s in self.by_host[:top_hosts])
+        return lines
+
+
+class FetchTelemetry:
+    """
+    Process-wide event sink (thread-safe). record() is a no-op outside
+    begin_run() / end_run().
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._run_dir: Optional[str] = None
+        self._fh: Optional[TextIO] = None
+        self._events: List[FetchEvent] = []
+
+    @property
+    def active(self) -> bool:
+        return self._run_dir is not None
+
+    def begin_run(self, run_dir: str) -> None:
+        with self._lock:
+            self._close_file()
+            self._run_dir = run_dir
+            self._events = []
+            try:
+                self._fh = open(os.path.join(run_dir, METRICS_FILE), "a", encoding="utf-8", buffering=1)
+            except OSError:
+                self._fh = None  # still aggregated in memory
+
+    def record(self, ev: FetchEvent) -> None:
+        if self._run_dir is None:
+            return
+        ev.ttfb_ms = round(ev.ttfb_ms, 1)
+        ev.total_ms = round(ev.total_ms, 1)
+        line = json.dumps(asdict(ev), ensure_ascii=False)
+        with self._lock:
+            if self._run_dir is None:
+                return
+            self._events.append(ev)
+            if self._fh is not None:
+                try:
+                    self._fh.write(line + "\n")
+                except OSError:
+                    self._fh = None
+
+    def end_run(self) -> Optional[TelemetrySummary]:
+        """
+        Stop recording, write the summary next to metrics.jsonl and return it.
+        """
+        with self._lock:
+            run_dir, events = self._run_dir, self._events
+            self._run_dir, self._events = None, []
+            self._close_file()
+        if run_dir is None:
+            return None
+
+        summary = TelemetrySummary(
+            events=len(events),
+            by_source=aggregate(events, lambda e: e.source),
+            by_host=aggregate(events, lambda e: e.host),
+        )
+        path = os.path.join(run_dir, SUMMARY_FILE)
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(summary.to_dict(), f, ensure_ascii=False, indent=2)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+        return summary
+
+    def _close_file(self) -> None:
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except OSError:
+                pass
+            self._fh = None
+
+
+FETCH_TELEMETRY = FetchTelemetry()
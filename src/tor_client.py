@@ -1,14 +1,18 @@
 from __future__ import annotations
 
 import os
+import re
 import socket
 import subprocess
+import threading
 import time
-from dataclasses import dataclass
-from typing import Optional, Tuple
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Optional, Tuple
 
 import requests
 
+from .http_pool import mount_pooled_adapters
+
 try:
     from stem.process import launch_tor_with_config  # type: ignore
     HAS_STEM = True
@@ -165,7 +169,8 @@ class TorHTTPClient:
     def __init__(self, cfg: TorConfig) -> None:
         self.cfg = cfg
         self.tor_mgr = TorManager(cfg)
-        self.session = requests.Session()
+        # keep-alive pools sized for the concurrent workers (see http_pool)
+        self.session = mount_pooled_adapters(requests.Session())
 
         # realistic UA to reduce blocks
         self.session.headers.update({
@@ -189,82 +194,321 @@ class TorHTTPClient:
             self.tor_mgr.stop()
 
 
+# =============================================================================
+# Warm Tor service (one per process, kept alive across runs)
+# =============================================================================
+#
+# Starting Tor per fetch run costs a full bootstrap every time. TorService
+# instead:
+#   - is started once in the background when the app opens (start_async)
+#   - reuses a Tor already listening on 9050 / 9150, else launches tor.exe on
+#     the first preferred port that is actually free (checked by binding, not
+#     by waiting for a failed bootstrap), else on a random free port
+#   - keeps its DataDirectory (data/tor_data) between app sessions, so cached
+#     consensus / descriptors make later bootstraps take seconds
+#   - reports "Bootstrapped N%" progress through status()
+#   - stays up until stop() (app exit); clients from client() only close their
+#     own requests.Session
+#
+# If the Tor process dies, the next start_async() / get_managed_tor_session()
+# launches it again.
+# =============================================================================
+
+BOOTSTRAP_TIMEOUT_S = 120.0
+TOR_DATA_DIRNAME = "tor_data"
+
+STATE_IDLE = "idle"
+STATE_STARTING = "starting"
+STATE_READY = "ready"
+STATE_FAILED = "failed"
+
+_BOOTSTRAP_RE = re.compile(r"Bootstrapped (\d+)%(?: \(([^)]*)\))?:?\s*(.*)")
+
+
+@dataclass
+class TorStatus:
+    state: str = STATE_IDLE
+    progress: int = 0
+    summary: str = ""
+    port: int = 0
+    external: bool = False     # Tor was already running, not launched by us
+    error: str = ""
+
+    @property
+    def ready(self) -> bool:
+        return self.state == STATE_READY
+
+    def describe(self) -> str:
+        if self.state == STATE_READY:
+            return f"ready on {self.port}" + (" (external)" if self.external else "")
+        if self.state == STATE_STARTING:
+            return f"bootstrapping {self.progress}%" + (f" ({self.summary})" if self.summary else "")
+        if self.state == STATE_FAILED:
+            return f"unavailable: {self.error}"
+        return "not started"
+
+
+def _port_is_free(host: str, port: int) -> bool:
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        s.bind((host, port))
+        return True
+    except OSError:
+        return False
+    finally:
+        s.close()
+
+
+class TorService:
+    def __init__(
+        self,
+        app_base_dir: Optional[str] = None,
+        prefer_ports: Tuple[int, ...] = (9050, 9150),
+        data_dir: Optional[str] = None,
+        host: str = "127.0.0.1",
+    ) -> None:
+        self.app_base_dir = app_base_dir
+        self.prefer_ports = tuple(prefer_ports)
+        self.data_dir = data_dir or os.path.join(app_base_dir or os.getcwd(), "data", TOR_DATA_DIRNAME)
+        self.host = host
+        self._proc = None
+        self._thread: Optional[threading.Thread] = None
+        self._status = TorStatus()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    # -----------------------
+    # Status
+    # -----------------------
+    def status(self) -> TorStatus:
+        with self._lock:
+            return replace(self._status)
+
+    def _set(self, **kw) -> None:
+        with self._changed:
+            for k, v in kw.items():
+                setattr(self._status, k, v)
+            self._changed.notify_all()
+
+    def _alive(self) -> bool:
+        st = self._status
+        if st.state != STATE_READY:
+            return st.state == STATE_STARTING
+        if st.external:
+            return _can_connect(self.host, st.port)
+        return self._proc is not None and self._proc.poll() is None
+
+    # -----------------------
+    # Lifecycle
+    # -----------------------
+    def start_async(self) -> None:
+        """
+        Begin bootstrapping in a background thread (no-op while starting or
+        while a healthy Tor is ready).
+        """
+        with self._lock:
+            if self._alive():
+                return
+            self._status = TorStatus(state=STATE_STARTING)
+            self._thread = threading.Thread(target=self._run, name="tor-bootstrap", daemon=True)
+            self._thread.start()
+
+    def wait_ready(
+        self,
+        timeout: float = BOOTSTRAP_TIMEOUT_S,
+        on_progress: Optional[Callable[[TorStatus], None]] = None,
+    ) -> TorStatus:
+        """
+        Block until Tor is ready, failed or timeout expired. on_progress is
+        called (from this thread) whenever the bootstrap percentage moves.
+        """
+        deadline = time.monotonic() + timeout
+        last = -1
+        while True:
+            with self._changed:
+                st = replace(self._status)
+                if st.state == STATE_STARTING and st.progress == last:
+                    left = deadline - time.monotonic()
+                    if left > 0:
+                        self._changed.wait(min(left, 1.0))
+                    st = replace(self._status)
+            if st.state != STATE_STARTING:
+                return st
+            if on_progress is not None and st.progress != last:
+                on_progress(st)
+            last = st.progress
+            if time.monotonic() >= deadline:
+                return st
+
+    def stop(self) -> None:
+        """
+        Terminate a Tor process launched by this service (app exit).
+        """
+        with self._lock:
+            proc, self._proc = self._proc, None
+            self._status = TorStatus()
+        if proc is None:
+            return
+        try:
+            proc.terminate()
+            proc.wait(timeout=5)
+        except Exception:
+            try:
+                proc.kill()
+            except Exception:
+                pass
+
+    def client(self) -> TorHTTPClient:
+        """
+        Tor-proxied session on the ready port; closing it leaves Tor running.
+        """
+        st = self.status()
+        if not st.ready:
+            raise RuntimeError(f"Tor is not ready ({st.describe()}).")
+        cfg = TorConfig(
+            enabled=True,
+            socks_proxy=f"socks5h://{self.host}:{st.port}",
+            socks_port=st.port,
+            start_tor=False,
+            data_dir=self.data_dir,
+        )
+        return TorHTTPClient(cfg)
+
+    # -----------------------
+    # Bootstrap (background thread)
+    # -----------------------
+    def _run(self) -> None:
+        try:
+            for p in self.prefer_ports:
+                if _can_connect(self.host, p):
+                    self._set(state=STATE_READY, progress=100, summary="", port=p, external=True)
+                    return
+
+            tor_exe = _resolve_tor_exe(self.app_base_dir)
+            if not tor_exe:
+                raise RuntimeError(
+                    "Tor is not running and tor.exe could not be found. "
+                    "Set TOR_EXE env var or place tor.exe in ./data/tor/tor.exe (or ./data/tor.exe)."
+                )
+
+            port = next((p for p in self.prefer_ports if _port_is_free(self.host, p)), 0)
+            port = port or _find_free_port(self.host)
+            self._launch(tor_exe, port)
+        except Exception as e:
+            self._set(state=STATE_FAILED, error=str(e) or type(e).__name__)
+
+    def _on_line(self, line: str) -> None:
+        m = _BOOTSTRAP_RE.search(line or "")
+        if m:
+            self._set(progress=int(m.group(1)), summary=(m.group(3) or m.group(2) or "").strip())
+
+    def _launch(self, tor_exe: str, port: int) -> None:
+        os.makedirs(self.data_dir, exist_ok=True)
+        self._set(port=port, external=False)
+
+        # tor.exe is run directly rather than through stem: stem's bootstrap
+        # timeout relies on SIGALRM (main thread only) and its process handle
+        # only exists once bootstrap is done, so a hung bootstrap could neither
+        # time out nor be stopped. Here the process is known from the start and
+        # a timer kills it after BOOTSTRAP_TIMEOUT_S.
+        torrc_path = os.path.join(self.data_dir, "torrc")
+        with open(torrc_path, "w", encoding="utf-8") as f:
+            f.write(f"SocksPort {port}\n")
+            f.write(f"DataDirectory {self.data_dir}\n")
+            f.write("Log notice stdout\n")
+
+        proc = subprocess.Popen(
+            [tor_exe, "-f", torrc_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="ignore",
+        )
+        with self._lock:
+            self._proc = proc
+
+        # readline blocks, so the deadline is enforced by a timer killing Tor
+        timed_out = threading.Event()
+
+        def _expire() -> None:
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(BOOTSTRAP_TIMEOUT_S, _expire)
+        timer.daemon = True
+        timer.start()
+        tail = ""
+        try:
+            for line in proc.stdout or ():
+                tail = line.strip() or tail
+                self._on_line(line)
+                if "Bootstrapped 100%" in line:
+                    break
+        finally:
+            timer.cancel()
+
+        if timed_out.is_set():
+            raise RuntimeError(f"Tor did not bootstrap within {BOOTSTRAP_TIMEOUT_S:.0f}s (last: {tail or 'no output'})")
+        if proc.poll() is not None:
+            raise RuntimeError(f"Tor exited during bootstrap: {tail or 'no output'}")
+        # keep draining stdout so Tor never blocks on a full pipe
+        threading.Thread(target=self._drain, args=(proc,), name="tor-log", daemon=True).start()
+        if not _can_connect(self.host, port, timeout=0.8):
+            raise RuntimeError("Tor failed to start (no SOCKS listener detected).")
+        self._set(state=STATE_READY, progress=100)
+
+    @staticmethod
+    def _drain(proc) -> None:
+        try:
+            for _line in proc.stdout or ():
+                pass
+        except Exception:
+            pass
+
+
+_SERVICES: Dict[str, TorService] = {}
+_SERVICES_LOCK = threading.Lock()
+
+
+def get_tor_service(app_base_dir: Optional[str] = None, tor_data_dir: Optional[str] = None) -> TorService:
+    """
+    Process-wide TorService for this app directory (created on first use,
+    not started).
+    """
+    key = os.path.normpath(app_base_dir or os.getcwd())
+    with _SERVICES_LOCK:
+        svc = _SERVICES.get(key)
+        if svc is None:
+            svc = TorService(app_base_dir=app_base_dir, data_dir=tor_data_dir)
+            _SERVICES[key] = svc
+        return svc
+
+
 # -----------------------
-# NEW: managed Tor session (always Tor, self-managed)
+# Managed Tor session (always Tor, self-managed)
 # -----------------------
 def get_managed_tor_session(
     app_base_dir: Optional[str] = None,
     prefer_ports: Tuple[int, int] = (9050, 9150),
     tor_data_dir: Optional[str] = None,
+    timeout: float = BOOTSTRAP_TIMEOUT_S,
+    on_progress: Optional[Callable[[TorStatus], None]] = None,
 ) -> TorHTTPClient:
     """
-    Always returns a Tor-proxied session.
+    Always returns a Tor-proxied session from the warm TorService.
     - If Tor already running on 9050/9150 -> use it (do not start).
-    - Else -> start tor.exe on an available port (try 9050, else 9150, else random free port).
+    - Else -> tor.exe is started once (9050, else 9150, else a random free
+      port) and kept running after the session is closed.
     GUI is not involved.
     """
-    host = "127.0.0.1"
-
-    # 1) If Tor already running, use it
-    for p in prefer_ports:
-        if _can_connect(host, p):
-            proxy = f"socks5h://{host}:{p}"
-            cfg = TorConfig(
-                enabled=True,
-                socks_proxy=proxy,
-                socks_port=p,
-                start_tor=False,
-                tor_exe=None,
-                data_dir=tor_data_dir,
-            )
-            return TorHTTPClient(cfg).start()
-
-    # 2) Need to start Tor
-    tor_exe = _resolve_tor_exe(app_base_dir)
-    if not tor_exe:
-        raise RuntimeError(
-            "Tor is not running and tor.exe could not be found. "
-            "Set TOR_EXE env var or place tor.exe in ./data/tor/tor.exe (or ./data/tor.exe)."
-        )
-
-    # Pick a port: try 9050, then 9150, else choose free port
-    chosen = None
-    for p in prefer_ports:
-        # If port is free (can't connect, and also not bound by something else)
-        # We'll just attempt start; if it fails due to bind we fallback.
-        chosen = p
-        try:
-            proxy = f"socks5h://{host}:{p}"
-            cfg = TorConfig(
-                enabled=True,
-                socks_proxy=proxy,
-                socks_port=p,
-                start_tor=True,
-                tor_exe=tor_exe,
-                data_dir=tor_data_dir,
-            )
-            client = TorHTTPClient(cfg).start()
-            # Confirm listener
-            if _can_connect(host, p, timeout=0.8):
-                return client
-            client.close()
-        except Exception:
-            # try next port
-            continue
-
-    # Final fallback: random free port
-    p = _find_free_port(host)
-    proxy = f"socks5h://{host}:{p}"
-    cfg = TorConfig(
-        enabled=True,
-        socks_proxy=proxy,
-        socks_port=p,
-        start_tor=True,
-        tor_exe=tor_exe,
-        data_dir=tor_data_dir,
-    )
-    client = TorHTTPClient(cfg).start()
-    if not _can_connect(host, p, timeout=0.8):
-        client.close()
-        raise RuntimeError("Tor failed to start (no SOCKS listener detected).")
-    return client
+    svc = get_tor_service(app_base_dir, tor_data_dir)
+    if tuple(prefer_ports) != svc.prefer_ports and svc.status().state == STATE_IDLE:
+        svc.prefer_ports = tuple(prefer_ports)
+    svc.start_async()
+    st = svc.wait_ready(timeout, on_progress=on_progress)
+    if not st.ready:
+        if st.state == STATE_STARTING:
+            raise RuntimeError(f"Tor did not bootstrap in time ({st.describe()}).")
+        raise RuntimeError(st.error or "Tor failed to start.")
+    return svc.client()
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import calendar
+import json
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Pattern, Tuple
+from urllib.parse import urlparse
+
+
+# =============================================================================
+# Publish dates inferred from article URLs
+# =============================================================================
+#
+# Many publishers put the publish date in the article path (/2026/03/01/...,
+# -2026-03-01-, /20260301/). In date-filtered runs, items whose URL date is
+# clearly outside the window are dropped before any page is requested.
+#
+# Patterns are only trusted per source:
+#   - day patterns with separators (/YYYY/MM/DD/, YYYY-MM-DD) are trusted by
+#     default, unless the source has proven them wrong
+#   - looser patterns (YYYYMMDD, /YYYY/MM/) must be learned first: every known
+#     date (feed date, sniffed page date) is checked against what the URL
+#     suggests, and a pattern is trusted once it agreed LEARN_MIN_HITS times
+#     with at least LEARN_MIN_PRECISION precision
+#
+# Learned counts are kept in data/url_date_patterns.json.
+# =============================================================================
+
+LEARN_MIN_HITS = 3
+LEARN_MIN_PRECISION = 0.9
+# URL dates are often the newsroom's local day: allow one day either way
+MARGIN_DAYS = 1
+
+PATTERNS_FILE = "url_date_patterns.json"
+
+PRECISION_DAY = "day"
+PRECISION_MONTH = "month"
+
+
+@dataclass(frozen=True)
+class UrlDatePattern:
+    id: str
+    regex: Pattern[str]
+    precision: str
+    trusted_by_default: bool
+
+
+_PATTERNS: Tuple[UrlDatePattern, ...] = (
+    UrlDatePattern(
+        "ymd_slash",
+        re.compile(r"/((?:19|20)\d{2})/(0[1-9]|1[0-2])/(0[1-9]|[12]\d|3[01])(?=/|$|[^0-9])"),
+        PRECISION_DAY,
+        True,
+    ),
+    UrlDatePattern(
+        "ymd_dash",
+        re.compile(r"(?<!\d)((?:19|20)\d{2})-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])(?!\d)"),
+        PRECISION_DAY,
+        True,
+    ),
+    UrlDatePattern(
+        "ymd_compact",
+        re.compile(r"(?<!\d)((?:19|20)\d{2})(0[1-9]|1[0-2])(0[1-9]|[12]\d|3[01])(?!\d)"),
+        PRECISION_DAY,
+        False,
+    ),
+    UrlDatePattern(
+        "ym_slash",
+        re.compile(r"/((?:19|20)\d{2})/(0[1-9]|1[0-2])(?=/)"),
+        PRECISION_MONTH,
+        False,
+    ),
+)
+
+
+@dataclass
+class UrlDate:
+    pattern: str
+    start: date
+    end: date
+
+    def overlaps(self, lo: Optional[date], hi: Optional[date], margin_days: int = MARGIN_DAYS) -> bool:
+        m = timedelta(days=margin_days)
+        if lo is not None and self.end + m < lo:
+            return False
+        if hi is not None and self.start - m > hi:
+            return False
+        return True
+
+
+@dataclass
+class PatternStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def precision(self) -> float:
+        n = self.hits + self.misses
+        return self.hits / n if n else 0.0
+
+
+def _url_path(url: str) -> str:
+    try:
+        p = urlparse(url)
+        return p.path + ("?" + p.query if p.query else "")
+    except Exception:
+        return ""
+
+
+def _match(p: UrlDatePattern, path: str) -> Optional[UrlDate]:
+    m = p.regex.search(path)
+    if not m:
+        return None
+    try:
+        y, mo = int(m.group(1)), int(m.group(2))
+        if p.precision == PRECISION_DAY:
+            d = date(y, mo, int(m.group(3)))
+            return UrlDate(p.id, d, d)
+        return UrlDate(p.id, date(y, mo, 1), date(y, mo, calendar.monthrange(y, mo)[1]))
+    except ValueError:
+        return None  # e.g. 2026/02/30
+
+
+def url_date_candidates(url: str) -> List[UrlDate]:
+    """
+    Every built-in pattern that matches the URL, most precise first.
+    """
+    path = _url_path(url)
+    out = [d for d in (_match(p, path) for p in _PATTERNS) if d is not None]
+    out.sort(key=lambda d: (d.end - d.start))
+    return out
+
+
+class UrlDatePatternStore:
+    def __init__(self, path: str = "", stats: Optional[Dict[str, Dict[str, PatternStats]]] = None) -> None:
+        self.path = path
+        self._stats: Dict[str, Dict[str, PatternStats]] = stats or {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, base_dir: str) -> "UrlDatePatternStore":
+        path = os.path.join(base_dir, "data", PATTERNS_FILE)
+        stats: Dict[str, Dict[str, PatternStats]] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for slug, pats in (data.get("sources") or {}).items():
+                stats[slug] = {
+                    pid: PatternStats(hits=int(v.get("hits", 0)), misses=int(v.get("misses", 0)))
+                    for pid, v in (pats or {}).items()
+                }
+        except Exception:
+            stats = {}
+        return cls(path, stats)
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            payload = {
+                "version": 1,
+                "sources": {
+                    slug: {pid: asdict(st) for pid, st in sorted(pats.items())}
+                    for slug, pats in sorted(self._stats.items())
+                },
+            }
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+    # -----------------------
+    # Read
+    # -----------------------
+    def is_trusted(self, source_slug: str, pattern_id: str) -> bool:
+        p = next((x for x in _PATTERNS if x.id == pattern_id), None)
+        if p is None:
+            return False
+        with self._lock:
+            st = (self._stats.get(source_slug) or {}).get(pattern_id)
+        if st is None or st.hits + st.misses < LEARN_MIN_HITS:
+            return p.trusted_by_default
+        return st.hits >= LEARN_MIN_HITS and st.precision >= LEARN_MIN_PRECISION
+
+    def infer(self, source_slug: str, url: str) -> Optional[UrlDate]:
+        """
+        Most precise URL date from a pattern trusted for this source.
+        """
+        for d in url_date_candidates(url):
+            if self.is_trusted(source_slug, d.pattern):
+                return d
+        return None
+
+    def trusted_patterns(self, source_slug: str) -> List[str]:
+        return [p.id for p in _PATTERNS if self.is_trusted(source_slug, p.id)]
+
+    # -----------------------
+    # Learn
+    # -----------------------
+    def observe(self, source_slug: str, url: str, published_iso: Optional[str]) -> None:
+        """
+        Check a known publish date against every pattern matching the URL.
+        """
+        known = _iso_date(published_iso)
+        if known is None:
+            return
+        cands = url_date_candidates(url)
+        if not cands:
+            return
+        with self._lock:
+            pats = self._stats.setdefault(source_slug, {})
+            for d in cands:
+                st = pats.setdefault(d.pattern, PatternStats())
+                if d.overlaps(known, known):
+                    st.hits += 1
+                else:
+                    st.misses += 1
+
+
+def _iso_date(iso: Optional[str]) -> Optional[date]:
+    s = (iso or "").strip()
+    if not s:
+        return None
+    try:
+        return datetime.fromisoformat(s.replace("Z", "+00:00")).date()
+    except ValueError:
+        m = re.match(r"^(\d{4})-(\d{2})-(\d{2})", s)
+        if not m:
+            return None
+        try:
+            return date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        except ValueError:
+            return None